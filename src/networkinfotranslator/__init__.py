@@ -1 +1,2 @@
 from .network_info_translator import *
+from .async_translator import NetworkInfoAsyncTranslator, translate
\ No newline at end of file
@@ -0,0 +1,86 @@
+from .network_info_translator import convert, convert_to_formats
+import asyncio
+import concurrent.futures
+import weakref
+
+
+class NetworkInfoAsyncTranslator:
+    def __init__(self, executor=None, max_concurrent_conversions=4, timeout=None):
+        # the conversions run in the given (thread or process) executor, or in a thread pool of their own
+        self.executor = executor
+        self.max_concurrent_conversions = max_concurrent_conversions
+        self.timeout = timeout
+        self.owns_executor = False
+        self.semaphores = weakref.WeakKeyDictionary()
+
+    def get_executor(self):
+        if not self.executor:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrent_conversions,
+                                                                  thread_name_prefix="networkinfotranslator")
+            self.owns_executor = True
+
+        return self.executor
+
+    def get_semaphore(self, loop):
+        # a semaphore belongs to the event loop it is used in
+        if loop not in self.semaphores:
+            self.semaphores[loop] = asyncio.Semaphore(self.max_concurrent_conversions)
+
+        return self.semaphores[loop]
+
+    async def translate(self, source, target_format, file_name="", timeout=None):
+        return await self.run(convert, source, target_format, file_name, timeout=timeout)
+
+    async def translate_to_formats(self, source, target_formats, timeout=None):
+        return await self.run(convert_to_formats, source, target_formats, timeout=timeout)
+
+    async def run(self, function, *args, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
+        loop = asyncio.get_running_loop()
+        semaphore = self.get_semaphore(loop)
+        await semaphore.acquire()
+        try:
+            future = self.get_executor().submit(function, *args)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        # a conversion already running in a thread cannot be interrupted, so its slot is only released once it ends
+        future.add_done_callback(lambda f: self.release_slot(loop, semaphore))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future, loop=loop), timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            future.cancel()
+            raise
+
+    @staticmethod
+    def release_slot(loop, semaphore):
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            # the event loop is already closed
+            pass
+
+    def shutdown(self, wait=True):
+        if self.executor and self.owns_executor:
+            self.executor.shutdown(wait=wait)
+            self.executor = None
+            self.owns_executor = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.shutdown(wait=False)
+
+
+default_translator = None
+
+
+async def translate(source, target_format, file_name="", timeout=None):
+    global default_translator
+    if not default_translator:
+        default_translator = NetworkInfoAsyncTranslator()
+
+    return await default_translator.translate(source, target_format, file_name, timeout)
@@ -0,0 +1,275 @@
+from .network_info_translator import import_info_from_content, export_info, get_export_formats
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import argparse
+import concurrent.futures
+import concurrent.futures.process
+import json
+import os
+import socketserver
+import threading
+import time
+
+
+warm_up_sbml = ('<?xml version="1.0" encoding="UTF-8"?>'
+                '<sbml xmlns="http://www.sbml.org/sbml/level3/version1/core" level="3" version="1">'
+                '<model id="warm_up">'
+                '<listOfCompartments><compartment id="c" constant="true"/></listOfCompartments>'
+                '<listOfSpecies>'
+                '<species id="s1" compartment="c" hasOnlySubstanceUnits="false" boundaryCondition="false" '
+                'constant="false"/>'
+                '<species id="s2" compartment="c" hasOnlySubstanceUnits="false" boundaryCondition="false" '
+                'constant="false"/>'
+                '</listOfSpecies>'
+                '<listOfReactions>'
+                '<reaction id="r1" reversible="false">'
+                '<listOfReactants><speciesReference species="s1" constant="true"/></listOfReactants>'
+                '<listOfProducts><speciesReference species="s2" constant="true"/></listOfProducts>'
+                '</reaction>'
+                '</listOfReactions>'
+                '</model>'
+                '</sbml>')
+
+
+def initialize_worker():
+    # the backends are loaded, and the fonts and the native libraries initialized, before the first request comes
+    from .exports.export_figure_skia import NetworkInfoExportToSkia
+    from .exports.export_sbml import NetworkInfoExportToSBMLModel
+    model = import_info_from_content(warm_up_sbml)
+    export_to_figure = NetworkInfoExportToSkia()
+    export_to_figure.extract_graph_info(model)
+    export_to_figure.export_as_pil_image()
+    export_to_sbml = NetworkInfoExportToSBMLModel()
+    export_to_sbml.extract_graph_info(model)
+    export_to_sbml.export_as_bytes()
+
+
+def convert_in_worker(source, target_format):
+    start_time = time.time()
+    # the request body is only read as content, so a request can not make the worker read the files of the server
+    graph_info = import_info_from_content(source)
+    import_time = time.time()
+    output = export_info(graph_info, target_format)
+
+    return output, {'start': start_time, 'import': import_time - start_time, 'export': time.time() - import_time}
+
+
+class NetworkInfoConversionServer:
+    def __init__(self, host="127.0.0.1", port=8765, unix_socket="", number_of_workers=None, max_queued_requests=16,
+                 timeout=120.0):
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        if not number_of_workers:
+            number_of_workers = os.cpu_count() or 1
+        self.number_of_workers = number_of_workers
+        # the requests over the number of workers wait in the queue, and the ones over that are turned away
+        self.max_queued_requests = max_queued_requests
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(number_of_workers + max_queued_requests)
+        self.executor = None
+        self.executor_lock = threading.Lock()
+        self.http_server = None
+        self.server_thread = None
+
+    def start_workers(self):
+        if not self.executor:
+            self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.number_of_workers,
+                                                                   initializer=initialize_worker)
+            # the workers are started and warmed up now rather than on the first requests
+            concurrent.futures.wait([self.executor.submit(time.sleep, 0) for w_index in range(self.number_of_workers)])
+
+    def restart_workers(self, executor):
+        # a pool whose worker died is replaced once, by the first of the requests which found it broken
+        with self.executor_lock:
+            if self.executor is executor:
+                executor.shutdown(wait=False)
+                self.executor = None
+                self.start_workers()
+
+    def create_http_server(self):
+        if self.unix_socket:
+            if os.path.exists(self.unix_socket):
+                os.remove(self.unix_socket)
+            http_server = NetworkInfoUnixHTTPServer(self.unix_socket, NetworkInfoConversionRequestHandler)
+        else:
+            http_server = ThreadingHTTPServer((self.host, self.port), NetworkInfoConversionRequestHandler)
+        http_server.conversion_server = self
+        http_server.daemon_threads = True
+
+        return http_server
+
+    def serve_forever(self):
+        self.start_workers()
+        self.http_server = self.create_http_server()
+        try:
+            self.http_server.serve_forever()
+        finally:
+            self.close()
+
+    def start(self):
+        # serve from a background thread
+        self.start_workers()
+        self.http_server = self.create_http_server()
+        self.server_thread = threading.Thread(target=self.http_server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+    def get_address(self):
+        if self.unix_socket:
+            return self.unix_socket
+
+        return self.http_server.server_address
+
+    def shutdown(self):
+        if self.http_server:
+            self.http_server.shutdown()
+        self.close()
+
+    def close(self):
+        if self.http_server:
+            self.http_server.server_close()
+            self.http_server = None
+            if self.unix_socket and os.path.exists(self.unix_socket):
+                os.remove(self.unix_socket)
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def convert(self, source, target_format):
+        # returns the output and the timings of the conversion, or None if the queue is full
+        if not self.slots.acquire(blocking=False):
+            return None, {}
+        submit_time = time.time()
+        executor = self.executor
+        try:
+            future = executor.submit(convert_in_worker, source, target_format)
+        except concurrent.futures.process.BrokenProcessPool:
+            self.slots.release()
+            self.restart_workers(executor)
+            raise
+        except BaseException:
+            self.slots.release()
+            raise
+
+        # a conversion which timed out keeps its worker busy, so its slot is only released once it ends
+        future.add_done_callback(lambda f: self.slots.release())
+        try:
+            output, timings = future.result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+        except concurrent.futures.process.BrokenProcessPool:
+            self.restart_workers(executor)
+            raise
+        timings['queue'] = max(0.0, timings.pop('start') - submit_time)
+        timings['total'] = time.time() - submit_time
+
+        return output, timings
+
+
+class NetworkInfoUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = 0
+
+
+class NetworkInfoConversionRequestHandler(BaseHTTPRequestHandler):
+    content_types = {'png': "image/png", 'jpg': "image/jpeg", 'pdf': "application/pdf",
+                     'cytoscapejs': "application/javascript", 'escher': "application/json",
+                     'network_editor': "application/json", 'sbml': "application/xml"}
+
+    def address_string(self):
+        # the clients of a unix socket have no address
+        if isinstance(self.client_address, tuple) and len(self.client_address):
+            return str(self.client_address[0])
+
+        return "local"
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/health":
+            conversion_server = self.server.conversion_server
+            self.send_json(200, {'status': "ok", 'workers': conversion_server.number_of_workers,
+                                 'maxQueuedRequests': conversion_server.max_queued_requests,
+                                 'formats': list(get_export_formats().keys())})
+        else:
+            self.send_json(404, {'error': "not found"})
+
+    def do_POST(self):
+        # the target format is given as /convert/<format> or /convert?format=<format>
+        url = urlparse(self.path)
+        path = url.path.strip("/").split("/")
+        if not path[0] == "convert":
+            self.send_json(404, {'error': "not found"})
+            return
+        target_format = ""
+        if len(path) > 1:
+            target_format = path[1]
+        elif "format" in list(parse_qs(url.query).keys()):
+            target_format = parse_qs(url.query)["format"][0]
+        if target_format not in list(get_export_formats().keys()):
+            self.send_json(400, {'error': 'unsupported target format "' + target_format + '"'})
+            return
+
+        source = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+        if not source:
+            self.send_json(400, {'error': "empty request body"})
+            return
+        try:
+            output, timings = self.server.conversion_server.convert(source, target_format)
+        except concurrent.futures.TimeoutError:
+            self.send_json(504, {'error': "the conversion timed out"})
+            return
+        except concurrent.futures.process.BrokenProcessPool:
+            self.send_json(503, {'error': "the conversion worker stopped"}, {'Retry-After': "1"})
+            return
+        except Exception as error:
+            self.send_json(422, {'error': type(error).__name__ + ": " + str(error)})
+            return
+        if output is None:
+            self.send_json(503, {'error': "the conversion queue is full"}, {'Retry-After': "1"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", self.content_types[target_format])
+        self.send_header("Content-Length", str(len(output)))
+        self.send_header("Server-Timing", ", ".join(name + ";dur=" + "%.1f" % (1000 * timings[name])
+                                                    for name in ["queue", "import", "export", "total"]))
+        self.end_headers()
+        self.wfile.write(output)
+
+    def send_json(self, status, body, headers=None):
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        if headers:
+            for name, value in headers.items():
+                self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Serve the conversions of NetworkInfoTranslator from a pool of "
+                                                 "warm worker processes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", default="", help="listen on this unix socket instead of a tcp port")
+    parser.add_argument("--workers", type=int, default=0, help="the number of worker processes")
+    parser.add_argument("--max-queued-requests", type=int, default=16,
+                        help="the number of requests waiting for a worker before the new ones are turned away")
+    parser.add_argument("--timeout", type=float, default=120.0, help="the time limit of a conversion in seconds")
+    arguments = parser.parse_args(arguments)
+
+    conversion_server = NetworkInfoConversionServer(arguments.host, arguments.port, arguments.unix_socket,
+                                                    arguments.workers, arguments.max_queued_requests,
+                                                    arguments.timeout)
+    try:
+        conversion_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
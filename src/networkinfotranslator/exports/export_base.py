@@ -1,13 +1,53 @@
+from .export_scene import NetworkInfoExportScene
+from ..profiling.instrumentation import NetworkInfoNoInstrumentation
+import copy
+import io
+import os
+import shutil
+import tempfile
+
+
 class NetworkInfoExportBase:
     def __init__(self):
         self.graph_info = None
+        self.instrumentation = NetworkInfoNoInstrumentation()
+        self.memory_budget = None
+        # the groups of features of the info used by this exporter, or None for all of them
+        self.required_features = None
         self.reset()
 
     def reset(self):
         self.graph_info = None
 
+    def clone(self):
+        # an exporter with the same options and none of the state of the last export
+        exporter = copy.copy(self)
+        exporter.reset()
+        return exporter
+
+    def build(self, graph_info):
+        # the scene is built by a clone, so this exporter is left as it is and can build scenes from several threads
+        self.require_features(graph_info)
+        graph_info.freeze()
+        exporter = self.clone_for_scene()
+        exporter.extract_graph_info(graph_info)
+        return NetworkInfoExportScene(exporter)
+
+    def clone_for_scene(self):
+        return self.clone()
+
+    def render(self, graph_info, file_name=""):
+        return self.build(graph_info).export(file_name)
+
+    def require_features(self, graph_info):
+        if not graph_info.is_frozen:
+            graph_info.require_features(self.required_features)
+        elif not graph_info.has_features(self.required_features):
+            raise ValueError("the info was frozen without some of the features " + type(self).__name__ + " needs")
+
     def extract_graph_info(self, graph_info):
         self.reset()
+        self.require_features(graph_info)
         self.graph_info = graph_info
 
         # update the features of the entities
@@ -17,16 +57,26 @@ class NetworkInfoExportBase:
         self.set_background(graph_info)
 
         # compartments
-        for c in graph_info.compartments:
-            self.add_compartment(c)
+        with self.stage("add_compartments"):
+            self.instrumentation.add_entities(len(graph_info.compartments))
+            for c in graph_info.compartments:
+                self.add_compartment(c)
 
         # species
-        for s in graph_info.species:
-            self.add_species(s)
+        with self.stage("add_species"):
+            self.instrumentation.add_entities(len(graph_info.species))
+            for s in graph_info.species:
+                self.add_species(s)
 
         # reactions
-        for r in graph_info.reactions:
-            self.add_reaction(r)
+        with self.stage("add_reactions"):
+            self.instrumentation.add_entities(len(graph_info.reactions))
+            for r in graph_info.reactions:
+                self.add_reaction(r)
+
+    def stage(self, name):
+        # the stages of the different exporters sharing an instrumentation are kept apart
+        return self.instrumentation.stage(type(self).__name__ + "." + name)
 
     def set_background(self, graph_info):
         pass
@@ -41,4 +91,26 @@ class NetworkInfoExportBase:
         pass
 
     def export(self, file_name):
-        pass
\ No newline at end of file
+        pass
+
+    def export_to_stream(self, stream, file_format=""):
+        # the exporters which cannot write to a stream themselves write a temporary file, which is copied to it
+        output_directory = tempfile.mkdtemp(prefix="networkinfotranslator_")
+        try:
+            output_file_name = os.path.join(output_directory, "network." + file_format)
+            self.export(output_file_name)
+            with open(output_file_name, 'rb') as output_file:
+                self.write_to_stream(stream, output_file.read())
+        finally:
+            shutil.rmtree(output_directory, ignore_errors=True)
+
+    def write_to_stream(self, stream, output):
+        # a text is written to a binary stream encoded as utf-8
+        output_bytes = output
+        if isinstance(output, str):
+            output_bytes = output.encode('utf-8')
+        if isinstance(stream, io.TextIOBase):
+            stream.write(output)
+        else:
+            stream.write(output_bytes)
+        self.instrumentation.add_bytes_written(len(output_bytes))
\ No newline at end of file
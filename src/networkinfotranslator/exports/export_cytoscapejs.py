@@ -7,10 +7,12 @@ class NetworkInfoExportToCytoscapeJs(NetworkInfoExportToJsonBase):
     def __init__(self):
         self.styles = []
         super().__init__()
+        # only the positions, dimensions and the styles of the first shapes and texts are used
+        self.required_features = {"texts", "geometricShapes"}
 
     def reset(self):
         super().reset()
-        self.styles.clear()
+        self.styles = []
 
     def add_node(self, go, category = ""):
         node = self.initialize_entity(go)
@@ -210,12 +212,22 @@ class NetworkInfoExportToCytoscapeJs(NetworkInfoExportToJsonBase):
             return "tee"
         return ""
 
-    def export(self, file_name):
-        graph_info = dict(data={'generated_by': "NetworkInfoTranslator", 'name': pathlib(file_name).stem,
-                                'shared_name': pathlib(file_name).stem, 'selected': True})
+    def get_graph(self, name):
+        graph_info = dict(data={'generated_by': "NetworkInfoTranslator", 'name': name, 'shared_name': name,
+                                'selected': True})
         graph_info['elements'] = {'nodes': self.nodes, 'edges': self.edges}
         graph_info['style'] = self.styles
-        with open(file_name.split('.')[0] + ".js", 'w', encoding='utf8') as js_file:
-            js_file.write("graph_info = ")
-            json.dump(graph_info, js_file, indent=1)
-            js_file.write(";")
+        return graph_info
+
+    def export(self, file_name):
+        graph_info = self.get_graph(pathlib(file_name).stem)
+        with self.stage("export"):
+            with open(file_name.split('.')[0] + ".js", 'w', encoding='utf8') as js_file:
+                js_file.write("graph_info = ")
+                json.dump(graph_info, js_file, indent=1)
+                js_file.write(";")
+            self.instrumentation.add_file_bytes_written(file_name.split('.')[0] + ".js")
+
+    def export_to_stream(self, stream, file_format="js"):
+        with self.stage("export"):
+            self.write_to_stream(stream, "graph_info = " + json.dumps(self.get_graph("network"), indent=1) + ";")
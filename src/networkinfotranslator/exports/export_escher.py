@@ -1,4 +1,3 @@
-import libsbmlnetworkeditor
 from .export_base import NetworkInfoExportBase
 import json
 from pathlib import Path as pathlib
@@ -126,19 +125,20 @@ class NetworkInfoExportToEscher(NetworkInfoExportBase):
             escher_recaction[reaction['id']]['metabolites'] = metabolites
 
     def get_reaction_reversibility(self, reaction):
-        if reaction['SBMLObject']:
+        # the sbml objects are only there when the importer keeps them
+        if reaction.get('SBMLObject'):
             return reaction['SBMLObject'].getReversible()
         return False
 
     def create_metabolite_from_product(self, species_reference):
         coefficient = 1
-        if species_reference['SBMLObject']:
+        if species_reference.get('SBMLObject'):
             coefficient = species_reference['SBMLObject'].getStoichiometry()
         return {'bigg_id': species_reference['species'], 'coefficient': coefficient}
 
     def create_metabolite_from_substrate(self, species_reference):
         coefficient = -1
-        if species_reference['SBMLObject']:
+        if species_reference.get('SBMLObject'):
             coefficient = -1 * species_reference['SBMLObject'].getStoichiometry()
         return {'bigg_id': species_reference['species'], 'coefficient': coefficient}
 
@@ -148,21 +148,22 @@ class NetworkInfoExportToEscher(NetworkInfoExportBase):
         segment_features = {}
         if 'curve' in list(species_reference['features'].keys()):
             segment_features['from_node_id'] = reaction['id']
-            for cs_index in range(libsbmlnetworkeditor.getNumCurveSegments(species_reference['glyphObject']) - 1):
+            for cs_index in range(len(species_reference['features']['curve']) - 1):
                 segment_features['to_node_id'] = reaction['id'] + "." + species_reference['id'] + ".M" + str(cs_index + 1)
                 segment_features.update(self.get_segment_base_point_features(species_reference['features']['curve'], cs_index))
                 segments.update({segment_id: segment_features})
                 segment_id = species_reference['id'] + ".S" + str(cs_index + 1)
                 segment_features['from_node_id'] = reaction['id'] + "." + species_reference['id'] + ".M" + str(cs_index + 1)
             segment_features.update(self.get_segment_base_point_features(species_reference['features']['curve'], -1))
-            segment_features['to_node_id'] = libsbmlnetworkeditor.getSpeciesGlyphId(species_reference['glyphObject'])
+            if 'speciesGlyph' in list(species_reference.keys()):
+                segment_features['to_node_id'] = species_reference['speciesGlyph']
         segments.update({segment_id: segment_features})
         return segments
 
     def get_position(self, features):
         if 'boundingBox' in list(features.keys()):
             return self.get_bb_center_x(features['boundingBox']), self.get_bb_center_y(features['boundingBox'])
-        elif 'curve' in list(go['features'].keys()):
+        elif 'curve' in list(features.keys()):
             return [self.get_curve_center_x(features['curve']), self.get_curve_center_y(features['curve'])]
         return 0.0, 0.0
 
@@ -201,20 +202,31 @@ class NetworkInfoExportToEscher(NetworkInfoExportBase):
             return {'b1': {'x': curve[cs_index]['startX'], 'y': curve[cs_index]['startY']},
                     'b2': {'x': curve[cs_index]['endX'], 'y': curve[cs_index]['endY']}}
 
-    def export(self, file_name="file"):
+    def get_graph(self, name):
         horizontal_margin = 75
         vertical_margin = 75
         position_x = self.graph_info.extents['minX'] - horizontal_margin
         position_y = self.graph_info.extents['minY'] - vertical_margin
         dimensions_width = self.graph_info.extents['maxX'] - self.graph_info.extents['minX'] + 2 * horizontal_margin
         dimensions_height = self.graph_info.extents['maxY'] - self.graph_info.extents['minY'] + 2 * vertical_margin
-        graph_info = [{'map_name': pathlib(file_name).stem + "_graph",
+        graph_info = [{'map_name': name,
                        'map_id': "",
                        'map_description': "",
                        'homepage': ""},
                       {'canvas': {'x': position_x, 'y': position_y, 'width': dimensions_width, 'height': dimensions_height},
                       'nodes': self.nodes,
                       'reactions': self.reactions}]
-        with open(file_name.split('.')[0] + ".json", 'w', encoding='utf8') as js_file:
-            json.dump(graph_info, js_file, indent=1)
-        return graph_info
\ No newline at end of file
+
+        return graph_info
+
+    def export(self, file_name="file"):
+        graph_info = self.get_graph(pathlib(file_name).stem + "_graph")
+        with self.stage("export"):
+            with open(file_name.split('.')[0] + ".json", 'w', encoding='utf8') as js_file:
+                json.dump(graph_info, js_file, indent=1)
+            self.instrumentation.add_file_bytes_written(file_name.split('.')[0] + ".json")
+        return graph_info
+
+    def export_to_stream(self, stream, file_format="json"):
+        with self.stage("export"):
+            self.write_to_stream(stream, json.dumps(self.get_graph("network_graph"), indent=1))
\ No newline at end of file
@@ -10,6 +10,7 @@ class NetworkInfoExportToFigureBase(NetworkInfoExportBase):
 
     def reset(self):
         super().reset()
+        self.compiled_line_endings = {}
 
     def set_background(self, graph_info):
         self.draw_background_canvas(graph_info.background_color)
@@ -112,8 +113,9 @@ class NetworkInfoExportToFigureBase(NetworkInfoExportBase):
                                 image_height = features['graphicalShape']['geometricShapes'][gs_index]['height']['abs'] + \
                                                0.01 * features['graphicalShape']['geometricShapes'][gs_index]['height']['rel'] * image_height
                             if 'href' in list(features['graphicalShape']['geometricShapes'][gs_index].keys()):
-                                self.draw_image(href, image_x, image_y, image_width, image_height,
-                                            offset_x, offset_y, slope, z_order)
+                                self.draw_image(features['graphicalShape']['geometricShapes'][gs_index]['href'],
+                                                image_x, image_y, image_width, image_height,
+                                                offset_x, offset_y, slope, z_order)
 
                         # draw a render curve
                         elif features['graphicalShape']['geometricShapes'][gs_index]['shape'] == 'renderCurve':
@@ -371,36 +373,45 @@ class NetworkInfoExportToFigureBase(NetworkInfoExportBase):
             if 'start' in list(features['graphicalCurve']['heads'].keys()):
                 line_ending = self.graph_info.find_line_ending(features['graphicalCurve']['heads']['start'])
                 if line_ending and 'features' in list(line_ending.keys()):
-                    if 'enableRotation' in list(line_ending['features'].keys()) \
-                            and not line_ending['features']['enableRotation']:
-                        self.add_graphical_shape_to_scene(line_ending['features'],
-                                                          offset_x=features['startPoint']['x'],
-                                                          offset_y=features['startPoint']['y'], z_order=3)
-                    else:
-                        self.add_graphical_shape_to_scene(line_ending['features'],
-                                                          offset_x=features['startPoint']['x'],
-                                                          offset_y=features['startPoint']['y'],
-                                                          slope=features['startSlope'], z_order=3)
+                    self.add_line_ending_to_scene(line_ending, features['startPoint']['x'], features['startPoint']['y'],
+                                                  features['startSlope'], z_order=3)
 
             # draw end head
             if 'end' in list(features['graphicalCurve']['heads'].keys()):
                 line_ending = self.graph_info.find_line_ending(features['graphicalCurve']['heads']['end'])
                 if line_ending and 'features' in list(line_ending.keys()):
-                    if 'enableRotation' in list(line_ending['features'].keys()) \
-                            and not line_ending['features']['enableRotation']:
-                        self.add_graphical_shape_to_scene(ax, line_ending['features'],
-                                                          offset_x=features['endPoint']['x'],
-                                                          offset_y=features['endPoint']['y'], z_order=3)
-                    else:
-                        self.add_graphical_shape_to_scene(line_ending['features'],
-                                                          offset_x=features['endPoint']['x'],
-                                                          offset_y=features['endPoint']['y'],
-                                                          slope=features['endSlope'], z_order=3)
+                    self.add_line_ending_to_scene(line_ending, features['endPoint']['x'], features['endPoint']['y'],
+                                                  features['endSlope'], z_order=3)
+
+    def add_line_ending_to_scene(self, line_ending, position_x, position_y, slope, z_order=3):
+        if 'enableRotation' in list(line_ending['features'].keys()) \
+                and not line_ending['features']['enableRotation']:
+            slope = 0.0
+
+        # each line ending is compiled once and then stamped at the position of each of its instances
+        if line_ending['id'] not in self.compiled_line_endings:
+            self.compiled_line_endings[line_ending['id']] = self.compile_line_ending(line_ending)
+        self.draw_line_ending(self.compiled_line_endings[line_ending['id']], position_x, position_y, slope, z_order)
+
+    def compile_line_ending(self, line_ending):
+        return line_ending['features']
+
+    def draw_line_ending(self, compiled_line_ending, position_x, position_y, slope, z_order):
+        self.add_graphical_shape_to_scene(compiled_line_ending, offset_x=position_x, offset_y=position_y,
+                                          slope=slope, z_order=z_order)
+
+    @staticmethod
+    def get_line_ending_position(position_x, position_y, slope):
+        if slope:
+            position_x += 1.5 * math.cos(slope)
+            position_y += 1.5 * math.sin(slope)
+
+        return position_x, position_y
 
     def draw_background_canvas(self, background_color):
         pass
 
-    def draw_image(self, x, y, width, height,
+    def draw_image(self, href, x, y, width, height,
                    offset_x, offset_y, slope, z_order):
         pass
 
@@ -1,29 +1,78 @@
 from .export_figure_base import NetworkInfoExportToFigureBase
-import matplotlib
-import matplotlib.pyplot as plt
-from matplotlib.patches import FancyBboxPatch, Rectangle, Ellipse, Polygon, Path, PathPatch
+from ..profiling.memory_budget import NetworkInfoMemoryBudget
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.image import imread
+from matplotlib.patches import FancyBboxPatch, Rectangle, Ellipse, Polygon, Path
+from matplotlib.collections import PathCollection, LineCollection
 import matplotlib.transforms as plttransform
 import matplotlib.cbook as cbook
 import numpy as np
+import copy
+import io
 
 class NetworkInfoExportToMatPlotLib(NetworkInfoExportToFigureBase):
     def __init__(self):
-        self.sbml_figure, self.sbml_axes = plt.subplots()
-        self.sbml_axes.invert_yaxis()
+        self.sbml_figure = None
+        self.sbml_axes = None
+        self.batches = {}
+        self.rasterized_collection_size = 0
+        self.recycle_figure = False
         super().__init__()
 
     def reset(self):
         super().reset()
-        self.sbml_axes.clear()
-        self.sbml_figure.set_size_inches(1.0, 1.0)
+        self.batches = {}
+        if self.sbml_figure:
+            if self.recycle_figure:
+                self.sbml_figure.clear()
+                self.sbml_axes = None
+            else:
+                self.close()
+
+    def clone(self):
+        # the figure is not shared with the clones
+        exporter = copy.copy(self)
+        exporter.sbml_figure = None
+        exporter.sbml_axes = None
+        exporter.reset()
+        return exporter
+
+    def clone_for_scene(self):
+        exporter = self.clone()
+        # the figure of a scene is kept after an export, so the scene can be exported again
+        exporter.recycle_figure = True
+        return exporter
+
+    def close(self):
+        if self.sbml_figure:
+            self.sbml_figure.clear()
+        self.sbml_figure = None
+        self.sbml_axes = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-    def draw_image(self, x, y, width, height,
+    def _get_axes(self):
+        # the figure is created on the first draw and is not registered with pyplot
+        if not self.sbml_figure:
+            self.sbml_figure = Figure()
+            FigureCanvasAgg(self.sbml_figure)
+        if not self.sbml_axes:
+            self.sbml_axes = self.sbml_figure.add_subplot()
+
+        return self.sbml_axes
+
+    def draw_image(self, href, x, y, width, height,
                    offset_x, offset_y, slope, z_order):
         y = self.graph_info.extents['maxY'] - (y + height)
         offset_y = self.graph_info.extents['maxY'] - offset_y
         with cbook.get_sample_data(href) as image_file:
-            image = plt.imread(image_file)
-            image_axes = self.sbml_axes.imshow(image)
+            image = imread(image_file)
+            image_axes = self._get_axes().imshow(image)
             image_axes.set_extent([x, x + width, y + height, y])
             image_axes.set_zorder(z_order)
             if offset_x or offset_y:
@@ -42,23 +91,13 @@ class NetworkInfoExportToMatPlotLib(NetworkInfoExportToFigureBase):
         y = self.graph_info.extents['maxY'] - (y + height)
         offset_y = self.graph_info.extents['maxY'] - offset_y
         slope = -1 * slope
-        fancy_box = FancyBboxPatch((x, y), width, height,
-                                   edgecolor=self.graph_info.find_color_value(stroke_color, False),
-                                   facecolor=self.graph_info.find_color_value(fill_color),
-                                   fill=True,
-                                   linewidth=stroke_width,
-                                   zorder=z_order, antialiased=True)
+        fancy_box = FancyBboxPatch((x, y), width, height)
         fancy_box.set_boxstyle("round", rounding_size=0.5 * (corner_radius_x + corner_radius_y))
         if offset_x or offset_y:
-            fancy_box.set_transform(plttransform.Affine2D().
-                                    rotate_around(offset_x, offset_y,
-                                                  slope) + self.sbml_axes.transData)
+            rotation = plttransform.Affine2D().rotate_around(offset_x, offset_y, slope)
         else:
-            fancy_box.set_transform(plttransform.Affine2D().
-                                    rotate_around(position_x + 0.5 * width,
-                                                  position_y + 0.5 * height,
-                                                  slope) + self.sbml_axes.transData)
-        self.sbml_axes.add_patch(fancy_box)
+            rotation = plttransform.Affine2D().rotate_around(x + 0.5 * width, y + 0.5 * height, slope)
+        self._add_patch(fancy_box, rotation, stroke_color, stroke_width, stroke_dash_array, fill_color, z_order)
 
     def draw_simple_rectangle(self, x, y, width, height,
                               stroke_color, stroke_width, stroke_dash_array, fill_color,
@@ -66,21 +105,12 @@ class NetworkInfoExportToMatPlotLib(NetworkInfoExportToFigureBase):
         y = self.graph_info.extents['maxY'] - (y + height)
         offset_y = self.graph_info.extents['maxY'] - offset_y
         slope = -1 * slope
-        rectangle = Rectangle((x, y), width, height,
-                              edgecolor=self.graph_info.find_color_value(stroke_color, False),
-                              facecolor=self.graph_info.find_color_value(fill_color), fill=True,
-                              linewidth=stroke_width,
-                              zorder=z_order, antialiased=True)
+        rectangle = Rectangle((x, y), width, height)
         if offset_x or offset_y:
-            rectangle.set_transform(plttransform.Affine2D().
-                                    rotate_around(offset_x, offset_y,
-                                                  slope) + self.sbml_axes.transData)
+            rotation = plttransform.Affine2D().rotate_around(offset_x, offset_y, slope)
         else:
-            rectangle.set_transform(plttransform.Affine2D().
-                                    rotate_around(position_x + 0.5 * width,
-                                                  position_y + 0.5 * height,
-                                                  slope) + self.sbml_axes.transData)
-        self.sbml_axes.add_patch(rectangle)
+            rotation = plttransform.Affine2D().rotate_around(x + 0.5 * width, y + 0.5 * height, slope)
+        self._add_patch(rectangle, rotation, stroke_color, stroke_width, stroke_dash_array, fill_color, z_order)
 
     def draw_ellipse(self, cx, cy, rx, ry,
                      stroke_color, stroke_width, stroke_dash_array, fill_color,
@@ -89,89 +119,160 @@ class NetworkInfoExportToMatPlotLib(NetworkInfoExportToFigureBase):
         offset_y = self.graph_info.extents['maxY'] - offset_y
         slope = -1 * slope
         # add an ellipse to plot
-        ellipse = Ellipse((cx, cy), 2 * rx, 2 * ry,
-                          edgecolor=self.graph_info.find_color_value(stroke_color, False),
-                          facecolor=self.graph_info.find_color_value(fill_color), fill=True,
-                          linewidth=stroke_width,
-                          zorder=z_order, antialiased=True)
+        ellipse = Ellipse((cx, cy), 2 * rx, 2 * ry)
         if offset_x or offset_y:
-            ellipse.set_transform(plttransform.Affine2D().rotate_around(offset_x,
-                                                                        offset_y,
-                                                                        slope) + self.sbml_axes.transData)
+            rotation = plttransform.Affine2D().rotate_around(offset_x, offset_y, slope)
         else:
-            ellipse.set_transform(plttransform.Affine2D().
-                                  rotate_around(cx, cy,
-                                                slope) + self.sbml_axes.transData)
-        self.sbml_axes.add_patch(ellipse)
+            rotation = plttransform.Affine2D().rotate_around(cx, cy, slope)
+        self._add_patch(ellipse, rotation, stroke_color, stroke_width, stroke_dash_array, fill_color, z_order)
 
     def draw_polygon(self, vertices, width, height,
                      stroke_color, stroke_width, stroke_dash_array, fill_color,
                      offset_x, offset_y, slope, z_order):
-        vertices[:, 1] = np.amax(vertices, axis=0)[1] - vertices[:, 1]
+        is_translated = offset_x or offset_y
+        if is_translated:
+            vertices[:, 1] = np.amax(vertices, axis=0)[1] - vertices[:, 1]
+        else:
+            vertices[:, 1] = self.graph_info.extents['maxY'] - vertices[:, 1]
         offset_y = self.graph_info.extents['maxY'] - offset_y
         slope = -1 * slope
-        if offset_x or offset_y:
+        if is_translated:
             vertices[:, 0] += offset_x - width
             vertices[:, 1] += offset_y - 0.5 * height
-            polygon = Polygon(vertices, closed=True,
-                              edgecolor=self.graph_info.find_color_value(stroke_color, False),
-                              facecolor=self.graph_info.find_color_value(fill_color),
-                              fill=True, linewidth=stroke_width,
-                              antialiased=True)
-            polygon.set_transform(
-                plttransform.Affine2D().rotate_around(offset_x, offset_y,
-                                                      slope) + self.sbml_axes.transData)
+            rotation = plttransform.Affine2D().rotate_around(offset_x, offset_y, slope)
         else:
-            polygon = Polygon(vertices, closed=True,
-                              edgecolor=self.graph_info.find_color_value(stroke_color, False),
-                              facecolor=self.graph_info.find_color_value(fill_color),
-                              fill=True, linewidth=stroke_width,
-                              zorder=z_order, antialiased=True)
-        self.sbml_axes.add_patch(polygon)
-
+            rotation = plttransform.Affine2D()
+        self._add_patch(Polygon(vertices, closed=True), rotation, stroke_color, stroke_width, stroke_dash_array,
+                        fill_color, z_order)
 
     def draw_curve(self, curve, stroke_color, stroke_width, stroke_dash_array,
                    z_order):
+        edge_color = self.graph_info.find_color_value(stroke_color, False)
+        dashes = self._get_dashes(stroke_dash_array)
         for v_index in range(len(curve)):
-            vertices = [(curve[v_index]['startX'], self.graph_info.extents['maxY'] - curve[v_index]['startY'])]
-            codes = [Path.MOVETO]
+            start = (curve[v_index]['startX'], self.graph_info.extents['maxY'] - curve[v_index]['startY'])
+            end = (curve[v_index]['endX'], self.graph_info.extents['maxY'] - curve[v_index]['endY'])
             if 'basePoint1X' in list(curve[v_index].keys()):
-                vertices.append(
-                    (curve[v_index]['basePoint1X'], self.graph_info.extents['maxY'] - curve[v_index]['basePoint1Y']))
-                vertices.append(
-                    (curve[v_index]['basePoint2X'], self.graph_info.extents['maxY']- curve[v_index]['basePoint2Y']))
-                codes.append(Path.CURVE4)
-                codes.append(Path.CURVE4)
-                codes.append(Path.CURVE4)
+                vertices = [start,
+                            (curve[v_index]['basePoint1X'], self.graph_info.extents['maxY'] - curve[v_index]['basePoint1Y']),
+                            (curve[v_index]['basePoint2X'], self.graph_info.extents['maxY'] - curve[v_index]['basePoint2Y']),
+                            end]
+                self._get_batch('paths', z_order, edge_color, 'none', stroke_width, dashes).append(
+                    Path(vertices, [Path.MOVETO, Path.CURVE4, Path.CURVE4, Path.CURVE4]))
             else:
-                codes.append(Path.LINETO)
-            vertices.append((curve[v_index]['endX'], self.graph_info.extents['maxY'] - curve[v_index]['endY']))
+                self._get_batch('lines', z_order, edge_color, 'none', stroke_width, dashes).append([start, end])
+
+    def compile_line_ending(self, line_ending):
+        # draw the line ending at the origin and keep its shapes as paths
+        batches = self.batches
+        self.batches = {}
+        self.add_graphical_shape_to_scene(line_ending['features'], z_order=0)
+        compiled_line_ending = []
+        for (kind, z_order, edge_color, face_color, line_width, dashes), items in self.batches.items():
+            for item in items:
+                if kind == 'lines':
+                    item = Path(item)
+                compiled_line_ending.append({'path': item, 'edgecolor': edge_color, 'facecolor': face_color,
+                                             'linewidth': line_width, 'dashes': dashes})
+        self.batches = batches
 
-            # draw a curve
-            curve = PathPatch(Path(vertices, codes),
-                              edgecolor=self.graph_info.find_color_value(stroke_color, False),
-                              facecolor='none', linewidth=stroke_width,
-                              capstyle='butt', zorder=z_order, antialiased=True)
-            self.sbml_axes.add_patch(curve)
+        return compiled_line_ending
+
+    def draw_line_ending(self, compiled_line_ending, position_x, position_y, slope, z_order):
+        position_x, position_y = self.get_line_ending_position(position_x, position_y, slope)
+        transform = plttransform.Affine2D().translate(0.0, -self.graph_info.extents['maxY']).rotate(-slope).\
+            translate(position_x, self.graph_info.extents['maxY'] - position_y)
+        for shape in compiled_line_ending:
+            self._get_batch('paths', z_order, shape['edgecolor'], shape['facecolor'], shape['linewidth'],
+                            shape['dashes']).append(transform.transform_path(shape['path']))
 
     def draw_text(self, x, y, width, height,
                    plain_text, font_color, font_family, font_size, font_style, font_weight,
                    v_text_anchor, h_text_anchor, zorder):
         y = self.graph_info.extents['maxY'] - (y + height)
-        self.sbml_axes.text(x + 0.5 * width, y + 0.5 * height, plain_text,
+        self._get_axes().text(x + 0.5 * width, y + 0.5 * height, plain_text,
                      color=font_color, fontfamily=font_family, fontsize=font_size,
                      fontstyle=font_style, fontweight=font_weight,
                      va=v_text_anchor, ha=h_text_anchor, zorder=zorder)
 
+    def _add_patch(self, patch, rotation, stroke_color, stroke_width, stroke_dash_array, fill_color, z_order):
+        self._get_batch('paths', z_order, self.graph_info.find_color_value(stroke_color, False),
+                        self.graph_info.find_color_value(fill_color), stroke_width,
+                        self._get_dashes(stroke_dash_array)).append(
+            (patch.get_patch_transform() + rotation).transform_path(patch.get_path()))
+
+    @staticmethod
+    def _get_dashes(stroke_dash_array):
+        # the dash array is only used when it has pairs of dash and gap lengths
+        if isinstance(stroke_dash_array, str) or not len(stroke_dash_array) or len(stroke_dash_array) % 2:
+            return None
+
+        return tuple(stroke_dash_array)
+
+    def _get_batch(self, kind, z_order, edge_color, face_color, line_width, dashes):
+        # the primitives sharing the same z-order and style are drawn as one collection
+        return self.batches.setdefault((kind, z_order, edge_color, face_color, line_width, dashes), [])
+
+    def _add_batches_to_axes(self):
+        for (kind, z_order, edge_color, face_color, line_width, dashes), items in self.batches.items():
+            rasterized = bool(self.rasterized_collection_size) and len(items) >= self.rasterized_collection_size
+            line_style = 'solid'
+            if dashes:
+                line_style = (0, dashes)
+            if kind == 'lines':
+                collection = LineCollection(items, colors=edge_color, linewidths=line_width, linestyles=line_style,
+                                            capstyle='butt', zorder=z_order, antialiaseds=True, rasterized=rasterized)
+            else:
+                collection = PathCollection(items, edgecolors=edge_color, facecolors=face_color,
+                                            linewidths=line_width, linestyles=line_style, capstyle='butt',
+                                            zorder=z_order, antialiaseds=True, rasterized=rasterized)
+            self._get_axes().add_collection(collection)
+        self.batches = {}
+
+    def _get_dpi(self, file_name):
+        dpi = 300
+        # the vector formats are not rasterized as a whole
+        if file_name.split(".")[-1] in ["pdf", "svg"]:
+            return dpi
+        width, height = self.sbml_figure.get_size_inches()
+        canvas_bytes = NetworkInfoMemoryBudget.get_surface_bytes(width * dpi, height * dpi)
+        self.instrumentation.add_estimated_memory(canvas_bytes)
+        if self.memory_budget:
+            dpi *= self.memory_budget.get_scale(canvas_bytes, "a " + str(int(width * dpi)) + "x" +
+                                                str(int(height * dpi)) + " raster canvas")
+
+        return dpi
+
     def export(self, file_name=""):
-        if len(self.sbml_axes.patches):
-            self.sbml_axes.set_aspect('equal')
-            self.sbml_figure.set_size_inches(
-                (self.graph_info.extents['maxX'] - self.graph_info.extents['minX']) / 72.0,
-                (self.graph_info.extents['maxY'] - self.graph_info.extents['minY']) / 72.0)
-            plt.axis('equal')
-            plt.axis('off')
-            plt.tight_layout()
-
-            self.sbml_figure.savefig(file_name, transparent=True, dpi=300)
-            plt.close('all')
+        self._save_figure(file_name)
+
+    def export_to_stream(self, stream, file_format="png"):
+        figure_buffer = io.BytesIO()
+        self._save_figure(figure_buffer, file_format)
+        self.write_to_stream(stream, figure_buffer.getvalue())
+
+    def _save_figure(self, output, file_format=None):
+        # the figure is saved to a file, or to a buffer in the given format
+        if len(self.batches) or self.sbml_axes:
+            with self.stage("export"):
+                with self.instrumentation.stage("add_batches_to_axes"):
+                    self._add_batches_to_axes()
+                self.sbml_axes.autoscale_view()
+                self.sbml_axes.set_aspect('equal')
+                self.sbml_figure.set_size_inches(
+                    (self.graph_info.extents['maxX'] - self.graph_info.extents['minX']) / 72.0,
+                    (self.graph_info.extents['maxY'] - self.graph_info.extents['minY']) / 72.0)
+                self.sbml_axes.axis('equal')
+                self.sbml_axes.axis('off')
+                self.sbml_figure.tight_layout()
+
+                if file_format:
+                    dpi = self._get_dpi("network." + file_format)
+                else:
+                    dpi = self._get_dpi(output)
+                with self.instrumentation.stage("encode"):
+                    self.sbml_figure.savefig(output, format=file_format, transparent=True, dpi=dpi)
+                if not file_format:
+                    self.instrumentation.add_file_bytes_written(output)
+                if not self.recycle_figure:
+                    self.close()
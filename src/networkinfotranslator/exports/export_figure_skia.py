@@ -1,5 +1,8 @@
 from .export_figure_base import NetworkInfoExportToFigureBase
+from ..profiling.memory_budget import NetworkInfoMemoryBudget
+from ..text_metrics import NetworkInfoTextBlobCache, default_text_metrics
 import skia
+import math
 from PIL import Image as PIL_Image
 from PIL import ImageColor
 
@@ -8,6 +11,8 @@ class NetworkInfoExportToSkia(NetworkInfoExportToFigureBase):
     def __init__(self):
         super().__init__()
         self.padding = 25
+        # the blobs of the labels are kept across the renders of this exporter and of its clones
+        self.text_blob_cache = NetworkInfoTextBlobCache()
         self.background_canvas = {}
         self.layers = []
 
@@ -153,24 +158,17 @@ class NetworkInfoExportToSkia(NetworkInfoExportToFigureBase):
                    plain_text, font_color, font_family, font_size, font_style, font_weight,
                    v_text_anchor, h_text_anchor, z_order):
         text = {}
-        text_font = skia.Font(None, font_size)
-        if font_weight == "bold":
-            if font_style == "italic":
-                text_font = skia.Font(skia.Typeface(font_family, skia.FontStyle().BoldItalic()), font_size)
-            else:
-                text_font = skia.Font(skia.Typeface(font_family, skia.FontStyle().Bold()), font_size)
-        else:
-            if font_style == "italic":
-                text_font = skia.Font(skia.Typeface(font_family, skia.FontStyle.Italic()), font_size)
-            else:
-                text_font = skia.Font(skia.Typeface(font_family, skia.FontStyle.Normal()), font_size)
-        while text_font.measureText(plain_text) > width:
-            font_size = font_size - 1
-            text_font = skia.Font(None, font_size)
-        text_width = text_font.measureText(plain_text)
-        text_height = text_font.getSize()
+        # the width grows linearly with the font size, so the font is made smaller at once, to the largest whole
+        # point size at which the text fits in the width
+        text_width = default_text_metrics.measure_text(plain_text, font_family, font_size, font_weight, font_style)
+        if text_width > width:
+            font_size = max(0, font_size - math.ceil(font_size - width * font_size / text_width))
+        text_entry, is_cached = self.text_blob_cache.get(plain_text, font_family, font_size, font_weight, font_style)
+        self.instrumentation.add_cache_lookup(is_cached)
+        text_width = text_entry['width']
+        text_height = font_size
         text['text-paint'] = self._create_text_paint(font_color)
-        text['text'] = skia.TextBlob(plain_text, text_font)
+        text['text'] = text_entry['blob']
         text['x'] = (abs(self.graph_info.extents['minX']) + self.padding + x +
                      self._text_horizontal_adjustment_padding(h_text_anchor, text_width, width))
         text['y'] = abs(self.graph_info.extents['minY']) + self.padding + y + self._text_vertical_adjustment_padding(v_text_anchor, text_height, height)
@@ -197,13 +195,30 @@ class NetworkInfoExportToSkia(NetworkInfoExportToFigureBase):
         return 0.0
 
     def export(self, file_name=""):
-        if file_name.split(".")[-1] == "pdf":
-            self._export_as_pdf(file_name)
-        else:
-            self._export_as(file_name)
+        with self.stage("export"):
+            if file_name.split(".")[-1] == "pdf":
+                self._export_as_pdf(file_name)
+            else:
+                self._export_as(file_name)
+            self.instrumentation.add_file_bytes_written(file_name)
+
+    def export_to_stream(self, stream, file_format="png"):
+        with self.stage("export"):
+            if file_format == "pdf":
+                pdf_stream = skia.DynamicMemoryWStream()
+                self._write_pdf(pdf_stream)
+                self.write_to_stream(stream, bytes(pdf_stream.detachAsData()))
+            else:
+                image = self._get_image()
+                with self.instrumentation.stage("encode"):
+                    if file_format == "jpg":
+                        self.write_to_stream(stream, bytes(image.encodeToData(skia.kJPEG, 100)))
+                    else:
+                        self.write_to_stream(stream, bytes(image.encodeToData(skia.kPNG, 100)))
 
     def export_as_pil_image(self):
-        return PIL_Image.fromarray(self._get_image().convert(alphaType=skia.kUnpremul_AlphaType, colorType=skia.kRGB_888x_ColorType))
+        with self.stage("export_as_pil_image"):
+            return PIL_Image.fromarray(self._get_image().convert(alphaType=skia.kUnpremul_AlphaType, colorType=skia.kRGB_888x_ColorType))
 
     def _create_fill_paint(self, fill_color, x=0.0, y=0.0, width=0.0, height=0.0):
         gradient = self.graph_info.find_gradient(fill_color)
@@ -255,144 +270,139 @@ class NetworkInfoExportToSkia(NetworkInfoExportToFigureBase):
         return skia.Color(rgb_color[0], rgb_color[1], rgb_color[2])
 
     def _export_as_pdf(self, file_name):
-        stream = skia.FILEWStream(file_name)
+        self._write_pdf(skia.FILEWStream(file_name))
+
+    def _write_pdf(self, stream):
         with skia.PDF.MakeDocument(stream) as document:
             with document.page(int(self.graph_info.extents['maxX'] - self.graph_info.extents['minX']) + + 2 * self.padding,
                                int(self.graph_info.extents['maxY'] - self.graph_info.extents['minY']) + + 2 * self.padding) as canvas:
                 canvas.drawRect(self.background_canvas['rectangle'], self.background_canvas['fill'])
-                self.sort_layers(self.layers)
-                for layer in self.layers:
-                    for simple_rectangle in layer.simple_rectangles:
-                        if 'translate' in list(simple_rectangle.keys()):
-                            canvas.translate(simple_rectangle['translate']['x'], simple_rectangle['translate']['y'])
-                            canvas.rotate(simple_rectangle['rotate'])
-                        canvas.drawRect(simple_rectangle["rectangle"], simple_rectangle["border"])
-                        canvas.drawRect(simple_rectangle["rectangle"], simple_rectangle["fill"])
-                        if 'translate' in list(simple_rectangle.keys()):
-                            canvas.rotate(-simple_rectangle['rotate'])
-                            canvas.translate(-simple_rectangle['translate']['x'], -simple_rectangle['translate']['y'])
-                    for rounded_rectangle in layer.rounded_rectangles:
-                        if 'translate' in list(rounded_rectangle.keys()):
-                            canvas.translate(rounded_rectangle['translate']['x'], rounded_rectangle['translate']['y'])
-                            canvas.rotate(rounded_rectangle['rotate'])
-                        canvas.drawRoundRect(rounded_rectangle["rectangle"], rounded_rectangle["border-radius"],
-                                             rounded_rectangle["border-radius"], rounded_rectangle["border"])
-                        canvas.drawRoundRect(rounded_rectangle["rectangle"], rounded_rectangle["border-radius"],
-                                             rounded_rectangle["border-radius"], rounded_rectangle["fill"])
-                        if 'translate' in list(rounded_rectangle.keys()):
-                            canvas.rotate(-rounded_rectangle['rotate'])
-                            canvas.translate(-rounded_rectangle['translate']['x'], -rounded_rectangle['translate']['y'])
-                    for ellipse in layer.ellipses:
-                        if 'translate' in list(ellipse.keys()):
-                            canvas.translate(ellipse['translate']['x'], ellipse['translate']['y'])
-                            canvas.rotate(ellipse['rotate'])
-                        canvas.drawOval(ellipse["rectangle"], ellipse["border"])
-                        canvas.drawOval(ellipse["rectangle"], ellipse["fill"])
-                        if 'translate' in list(ellipse.keys()):
-                            canvas.rotate(-ellipse['rotate'])
-                            canvas.translate(-ellipse['translate']['x'], -ellipse['translate']['y'])
-                    for polygon in layer.polygons:
-                        if 'translate' in list(polygon.keys()):
-                            canvas.translate(polygon['translate']['x'], polygon['translate']['y'])
-                            canvas.rotate(polygon['rotate'])
-                        path = skia.Path()
-                        path.moveTo(polygon['move-to-vertex']['x'], polygon['move-to-vertex']['y'])
-                        for vertex in polygon['line-to-vertices']:
-                            path.lineTo(vertex['x'], vertex['y'])
-                        path.close()
-                        canvas.drawPath(path, polygon["border"])
-                        canvas.drawPath(path, polygon["fill"])
-                        if 'translate' in list(polygon.keys()):
-                            canvas.rotate(-polygon['rotate'])
-                            canvas.translate(-polygon['translate']['x'], -polygon['translate']['y'])
-                    for curve in layer.curves:
-                        for vertex in curve['vertices']:
-                            path = skia.Path()
-                            path.moveTo(vertex['move-to']['x'], vertex['move-to']['y'])
-                            if 'cubic-to' in list(vertex.keys()):
-                                path.cubicTo(vertex['cubic-to']['b1x'], vertex['cubic-to']['b1y'],
-                                             vertex['cubic-to']['b2x'], vertex['cubic-to']['b2y'],
-                                             vertex['cubic-to']['x'], vertex['cubic-to']['y'])
-                            else:
-                                path.lineTo(vertex['line-to']['x'], vertex['line-to']['y'])
-                            canvas.drawPath(path, curve["border"])
-                    for text in layer.texts:
-                        canvas.drawTextBlob(text['text'], text['x'], text['y'], text['text-paint'])
+                with self.instrumentation.stage("draw_layers"):
+                    self._draw_layers(canvas, self.layers)
 
     def _export_as(self, file_name):
         image = self._get_image()
-        if file_name.split(".")[-1] == "jpg":
-            image.save(file_name, skia.kJPEG)
-        else:
-            image.save(file_name, skia.kPNG)
+        with self.instrumentation.stage("encode"):
+            if file_name.split(".")[-1] == "jpg":
+                image.save(file_name, skia.kJPEG)
+            else:
+                image.save(file_name, skia.kPNG)
 
     def _get_image(self):
-        surface = skia.Surface(
-            int(self.graph_info.extents['maxX'] - self.graph_info.extents['minX'] + 2 * self.padding),
-            int(self.graph_info.extents['maxY'] - self.graph_info.extents['minY'] + 2 * self.padding))
+        width = int(self.graph_info.extents['maxX'] - self.graph_info.extents['minX'] + 2 * self.padding)
+        height = int(self.graph_info.extents['maxY'] - self.graph_info.extents['minY'] + 2 * self.padding)
+        scale = self._get_surface_scale(width, height)
+        surface = skia.Surface(max(1, int(scale * width)), max(1, int(scale * height)))
         with surface as canvas:
+            if scale < 1.0:
+                canvas.scale(scale, scale)
             canvas.drawRect(self.background_canvas['rectangle'], self.background_canvas['fill'])
-            self.sort_layers(self.layers)
-            for layer in self.layers:
-                for simple_rectangle in layer.simple_rectangles:
-                    if 'translate' in list(simple_rectangle.keys()):
-                        canvas.translate(simple_rectangle['translate']['x'], simple_rectangle['translate']['y'])
-                        canvas.rotate(simple_rectangle['rotate'])
-                    canvas.drawRect(simple_rectangle["rectangle"], simple_rectangle["border"])
-                    canvas.drawRect(simple_rectangle["rectangle"], simple_rectangle["fill"])
-                    if 'translate' in list(simple_rectangle.keys()):
-                        canvas.rotate(-simple_rectangle['rotate'])
-                        canvas.translate(-simple_rectangle['translate']['x'], -simple_rectangle['translate']['y'])
-                for rounded_rectangle in layer.rounded_rectangles:
-                    if 'translate' in list(rounded_rectangle.keys()):
-                        canvas.translate(rounded_rectangle['translate']['x'], rounded_rectangle['translate']['y'])
-                        canvas.rotate(rounded_rectangle['rotate'])
-                    canvas.drawRoundRect(rounded_rectangle["rectangle"], rounded_rectangle["border-radius"],
-                                         rounded_rectangle["border-radius"], rounded_rectangle["border"])
-                    canvas.drawRoundRect(rounded_rectangle["rectangle"], rounded_rectangle["border-radius"],
-                                         rounded_rectangle["border-radius"], rounded_rectangle["fill"])
-                    if 'translate' in list(rounded_rectangle.keys()):
-                        canvas.rotate(-rounded_rectangle['rotate'])
-                        canvas.translate(-rounded_rectangle['translate']['x'], -rounded_rectangle['translate']['y'])
-                for ellipse in layer.ellipses:
-                    if 'translate' in list(ellipse.keys()):
-                        canvas.translate(ellipse['translate']['x'], ellipse['translate']['y'])
-                        canvas.rotate(ellipse['rotate'])
-                    canvas.drawOval(ellipse["rectangle"], ellipse["border"])
-                    canvas.drawOval(ellipse["rectangle"], ellipse["fill"])
-                    if 'translate' in list(ellipse.keys()):
-                        canvas.rotate(-ellipse['rotate'])
-                        canvas.translate(-ellipse['translate']['x'], -ellipse['translate']['y'])
-                for polygon in layer.polygons:
-                    if 'translate' in list(polygon.keys()):
-                        canvas.translate(polygon['translate']['x'], polygon['translate']['y'])
-                        canvas.rotate(polygon['rotate'])
-                    path = skia.Path()
-                    path.moveTo(polygon['move-to-vertex']['x'], polygon['move-to-vertex']['y'])
-                    for vertex in polygon['line-to-vertices']:
-                        path.lineTo(vertex['x'], vertex['y'])
-                    path.close()
-                    canvas.drawPath(path, polygon["border"])
-                    canvas.drawPath(path, polygon["fill"])
-                    if 'translate' in list(polygon.keys()):
-                        canvas.rotate(-polygon['rotate'])
-                        canvas.translate(-polygon['translate']['x'], -polygon['translate']['y'])
-                for curve in layer.curves:
-                    for vertex in curve['vertices']:
-                        path = skia.Path()
-                        path.moveTo(vertex['move-to']['x'], vertex['move-to']['y'])
-                        if 'cubic-to' in list(vertex.keys()):
-                            path.cubicTo(vertex['cubic-to']['b1x'], vertex['cubic-to']['b1y'],
-                                         vertex['cubic-to']['b2x'], vertex['cubic-to']['b2y'],
-                                         vertex['cubic-to']['x'], vertex['cubic-to']['y'])
-                        else:
-                            path.lineTo(vertex['line-to']['x'], vertex['line-to']['y'])
-                        canvas.drawPath(path, curve["border"])
-                for text in layer.texts:
-                    canvas.drawTextBlob(text['text'], text['x'], text['y'], text['text-paint'])
+            with self.instrumentation.stage("draw_layers"):
+                self._draw_layers(canvas, self.layers)
 
         return surface.makeImageSnapshot()
 
+    def _get_surface_scale(self, width, height):
+        # the size of the surface is checked against the memory budget before it is allocated
+        surface_bytes = NetworkInfoMemoryBudget.get_surface_bytes(width, height)
+        self.instrumentation.add_estimated_memory(surface_bytes)
+        if self.memory_budget:
+            return self.memory_budget.get_scale(surface_bytes, "a " + str(width) + "x" + str(height) +
+                                                " raster surface")
+
+        return 1.0
+
+    def compile_line_ending(self, line_ending):
+        # record the shapes of the line ending, drawn at the origin, into a picture
+        layers = self.layers
+        self.layers = []
+        self.add_graphical_shape_to_scene(line_ending['features'], z_order=0)
+        recorder = skia.PictureRecorder()
+        canvas = recorder.beginRecording(skia.Rect.MakeWH(
+            self.graph_info.extents['maxX'] - self.graph_info.extents['minX'] + 2 * self.padding,
+            self.graph_info.extents['maxY'] - self.graph_info.extents['minY'] + 2 * self.padding))
+        self._draw_layers(canvas, self.layers)
+        self.layers = layers
+
+        return recorder.finishRecordingAsPicture()
+
+    def draw_line_ending(self, compiled_line_ending, position_x, position_y, slope, z_order):
+        position_x, position_y = self.get_line_ending_position(position_x, position_y, slope)
+        self._get_layer(z_order).line_endings.append(
+            {'picture': compiled_line_ending,
+             'translate': {'x': abs(self.graph_info.extents['minX']) + self.padding + position_x,
+                           'y': abs(self.graph_info.extents['minY']) + self.padding + position_y},
+             'rotate': slope * 180.0 / 3.141592653589793,
+             'origin': {'x': abs(self.graph_info.extents['minX']) + self.padding,
+                        'y': abs(self.graph_info.extents['minY']) + self.padding}})
+
+    def _draw_layers(self, canvas, layers):
+        self.sort_layers(layers)
+        for layer in layers:
+            for simple_rectangle in layer.simple_rectangles:
+                if 'translate' in list(simple_rectangle.keys()):
+                    canvas.translate(simple_rectangle['translate']['x'], simple_rectangle['translate']['y'])
+                    canvas.rotate(simple_rectangle['rotate'])
+                canvas.drawRect(simple_rectangle["rectangle"], simple_rectangle["border"])
+                canvas.drawRect(simple_rectangle["rectangle"], simple_rectangle["fill"])
+                if 'translate' in list(simple_rectangle.keys()):
+                    canvas.rotate(-simple_rectangle['rotate'])
+                    canvas.translate(-simple_rectangle['translate']['x'], -simple_rectangle['translate']['y'])
+            for rounded_rectangle in layer.rounded_rectangles:
+                if 'translate' in list(rounded_rectangle.keys()):
+                    canvas.translate(rounded_rectangle['translate']['x'], rounded_rectangle['translate']['y'])
+                    canvas.rotate(rounded_rectangle['rotate'])
+                canvas.drawRoundRect(rounded_rectangle["rectangle"], rounded_rectangle["border-radius"],
+                                     rounded_rectangle["border-radius"], rounded_rectangle["border"])
+                canvas.drawRoundRect(rounded_rectangle["rectangle"], rounded_rectangle["border-radius"],
+                                     rounded_rectangle["border-radius"], rounded_rectangle["fill"])
+                if 'translate' in list(rounded_rectangle.keys()):
+                    canvas.rotate(-rounded_rectangle['rotate'])
+                    canvas.translate(-rounded_rectangle['translate']['x'], -rounded_rectangle['translate']['y'])
+            for ellipse in layer.ellipses:
+                if 'translate' in list(ellipse.keys()):
+                    canvas.translate(ellipse['translate']['x'], ellipse['translate']['y'])
+                    canvas.rotate(ellipse['rotate'])
+                canvas.drawOval(ellipse["rectangle"], ellipse["border"])
+                canvas.drawOval(ellipse["rectangle"], ellipse["fill"])
+                if 'translate' in list(ellipse.keys()):
+                    canvas.rotate(-ellipse['rotate'])
+                    canvas.translate(-ellipse['translate']['x'], -ellipse['translate']['y'])
+            for polygon in layer.polygons:
+                if 'translate' in list(polygon.keys()):
+                    canvas.translate(polygon['translate']['x'], polygon['translate']['y'])
+                    canvas.rotate(polygon['rotate'])
+                path = skia.Path()
+                path.moveTo(polygon['move-to-vertex']['x'], polygon['move-to-vertex']['y'])
+                for vertex in polygon['line-to-vertices']:
+                    path.lineTo(vertex['x'], vertex['y'])
+                path.close()
+                canvas.drawPath(path, polygon["border"])
+                canvas.drawPath(path, polygon["fill"])
+                if 'translate' in list(polygon.keys()):
+                    canvas.rotate(-polygon['rotate'])
+                    canvas.translate(-polygon['translate']['x'], -polygon['translate']['y'])
+            for line_ending in layer.line_endings:
+                canvas.save()
+                canvas.translate(line_ending['translate']['x'], line_ending['translate']['y'])
+                canvas.rotate(line_ending['rotate'])
+                canvas.translate(-line_ending['origin']['x'], -line_ending['origin']['y'])
+                canvas.drawPicture(line_ending['picture'])
+                canvas.restore()
+            for curve in layer.curves:
+                for vertex in curve['vertices']:
+                    path = skia.Path()
+                    path.moveTo(vertex['move-to']['x'], vertex['move-to']['y'])
+                    if 'cubic-to' in list(vertex.keys()):
+                        path.cubicTo(vertex['cubic-to']['b1x'], vertex['cubic-to']['b1y'],
+                                     vertex['cubic-to']['b2x'], vertex['cubic-to']['b2y'],
+                                     vertex['cubic-to']['x'], vertex['cubic-to']['y'])
+                    else:
+                        path.lineTo(vertex['line-to']['x'], vertex['line-to']['y'])
+                    canvas.drawPath(path, curve["border"])
+            for text in layer.texts:
+                canvas.drawTextBlob(text['text'], text['x'], text['y'], text['text-paint'])
+
 
 class Layer:
     def __init__(self, layer_index):
@@ -401,5 +411,6 @@ class Layer:
         self.rounded_rectangles = []
         self.ellipses = []
         self.polygons = []
+        self.line_endings = []
         self.curves = []
         self.texts = []
\ No newline at end of file
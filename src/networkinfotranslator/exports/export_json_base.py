@@ -9,8 +9,8 @@ class NetworkInfoExportToJsonBase(NetworkInfoExportBase):
 
     def reset(self):
         super().reset()
-        self.nodes.clear()
-        self.edges.clear()
+        self.nodes = []
+        self.edges = []
 
     def add_compartment(self, compartment):
         if 'id' in list(compartment.keys()) and 'referenceId' in list(compartment.keys()):
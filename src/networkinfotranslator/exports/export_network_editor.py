@@ -1,15 +1,29 @@
 from .export_json_base import NetworkInfoExportToJsonBase
 import json
-import math
+import hashlib
+import numpy as np
 from pathlib import Path as pathlib
 
 
 class NetworkInfoExportToNetworkEditor(NetworkInfoExportToJsonBase):
     def __init__(self):
+        self.species_glyphs = {}
+        self.node_geometries = {}
+        self.edge_nodes = []
+        self.use_style_catalog = False
+        self.styles = {}
         super().__init__()
 
     def reset(self):
         super().reset()
+        self.species_glyphs = {}
+        self.node_geometries = {}
+        self.edge_nodes = []
+        self.styles = {}
+
+    def extract_graph_info(self, graph_info):
+        super().extract_graph_info(graph_info)
+        self.set_edge_nodes_positions()
 
     def add_node(self, go, category = ""):
         node_ = self.initialize_entity(go)
@@ -17,7 +31,7 @@ class NetworkInfoExportToNetworkEditor(NetworkInfoExportToJsonBase):
         style_ = self.initialize_node_style(go, category)
         self.set_entity_compartment(node_, go)
         self.extract_node_features(go, node_, style_)
-        node_['style'] = style_
+        node_['style'] = self.get_entity_style(node_, style_)
         self.nodes.append(node_)
 
     def add_edge(self, species_reference, reaction):
@@ -26,9 +40,32 @@ class NetworkInfoExportToNetworkEditor(NetworkInfoExportToJsonBase):
         style_ = self.initialize_edge_style(species_reference)
         self.set_edge_nodes(edge_, species_reference, reaction)
         self.extract_edge_features(species_reference, style_)
-        edge_['style'] = style_
+        edge_['style'] = self.get_entity_style(edge_, style_)
         self.edges.append(edge_)
 
+    def get_entity_style(self, item, style):
+        if not self.use_style_catalog:
+            return style
+
+        # the texts differ from one node to another, so they are kept in the node and out of the shared style
+        texts = []
+        for shape in style['shapes']:
+            if 'shape' in list(shape.keys()) and shape['shape'] == "text":
+                texts.append({'plain-text': shape.pop('plain-text', ""),
+                              'plain-text-alternatives': shape.pop('plain-text-alternatives', [])})
+        if texts:
+            item['texts'] = texts
+
+        # the identical styles are written once in the catalog and referred to by their name, while the name of
+        # the style of the entity is kept in the entity
+        item['style-name'] = style.pop('name')
+        style_name = "style_" + hashlib.sha1(json.dumps(style, sort_keys=True).encode()).hexdigest()[:16]
+        if style_name not in self.styles:
+            style['name'] = style_name
+            self.styles[style_name] = style
+
+        return style_name
+
     @staticmethod
     def initialize_entity(go):
         return {'id': go['id']}
@@ -86,16 +123,15 @@ class NetworkInfoExportToNetworkEditor(NetworkInfoExportToJsonBase):
                 'name-title': "Id", 'is-name-editable': True, 'shapes': []}
 
     def set_edge_nodes(self, edge, species_reference, reaction):
-        species = {}
-        for s in self.graph_info.species:
-            if s['referenceId'] == species_reference['species'] and s['id'] == species_reference['speciesGlyph']:
-                species = s
-                break
+        if not self.species_glyphs:
+            for s in self.graph_info.species:
+                self.species_glyphs.setdefault((s['referenceId'], s['id']), s)
+        species = self.species_glyphs.get((species_reference['species'], species_reference['speciesGlyph']), {})
         if 'role' in list(species_reference.keys()):
             if species_reference['role'].lower() == "product" or species_reference['role'].lower() == "side product":
-                edge['source'], edge['target'] = self.get_edge_nodes_features(reaction, species)
+                self.add_edge_nodes(edge, reaction, species)
             else:
-                edge['source'], edge['target'] = self.get_edge_nodes_features(species, reaction)
+                self.add_edge_nodes(edge, species, reaction)
 
     def extract_node_features(self, go, node, style):
         if 'features' in list(go.keys()):
@@ -124,6 +160,9 @@ class NetworkInfoExportToNetworkEditor(NetworkInfoExportToJsonBase):
                     and 'end' in list(go['features']['graphicalCurve']['heads'].keys()):
                 style['arrow-head'] =\
                     self.get_arrow_heads(go['features']['graphicalCurve']['heads'], style['name'])
+                # the arrow heads of the shared styles are named after their line endings
+                if self.use_style_catalog:
+                    style['arrow-head']['name'] = go['features']['graphicalCurve']['heads']['end']
 
     @staticmethod
     def get_curve_style_shape_type(style):
@@ -156,23 +195,40 @@ class NetworkInfoExportToNetworkEditor(NetworkInfoExportToJsonBase):
                 return {'width': go['features']['boundingBox']['width'],
                         'height': go['features']['boundingBox']['height']}
 
-    def get_edge_nodes_features(self, source_go, target_go):
-        source_node_features = {'node': source_go['id']}
-        target_node_features = {'node': target_go['id']}
-        source_node_position = self.get_node_position(source_go)
-        source_node_dimensions = self.get_node_dimensions(source_go)
-        target_node_position = self.get_node_position(target_go)
-        target_node_dimensions = self.get_node_dimensions(target_go)
-        source_node_radius = 0.5 * max(source_node_dimensions['width'], source_node_dimensions['height'])
-        target_node_radius = 0.5 * max(target_node_dimensions['width'], target_node_dimensions['height'])
-        slope = math.atan2(target_node_position['y'] - source_node_position['y'],
-                           target_node_position['x'] - source_node_position['x'])
-        source_node_features['position'] = {'x': source_node_position['x'] + source_node_radius * math.cos(slope),
-                                           'y': source_node_position['y'] + source_node_radius * math.sin(slope)}
-        target_node_features['position'] = {'x': target_node_position['x'] - target_node_radius * math.cos(slope),
-                                         'y': target_node_position['y'] + target_node_radius * math.sin(slope)}
-
-        return source_node_features, target_node_features
+    def add_edge_nodes(self, edge, source_go, target_go):
+        # the positions of the edge ends are computed for all the edges at once after they are all added
+        edge['source'] = {'node': source_go['id']}
+        edge['target'] = {'node': target_go['id']}
+        self.edge_nodes.append((edge, self.get_node_geometry(source_go), self.get_node_geometry(target_go)))
+
+    def get_node_geometry(self, go):
+        if go['id'] not in self.node_geometries:
+            position = self.get_node_position(go)
+            dimensions = self.get_node_dimensions(go)
+            self.node_geometries[go['id']] = \
+                (position['x'], position['y'], 0.5 * max(dimensions['width'], dimensions['height']))
+
+        return self.node_geometries[go['id']]
+
+    def set_edge_nodes_positions(self):
+        if not self.edge_nodes:
+            return
+
+        source_geometries = np.array([edge_nodes[1] for edge_nodes in self.edge_nodes], dtype=float)
+        target_geometries = np.array([edge_nodes[2] for edge_nodes in self.edge_nodes], dtype=float)
+        slopes = np.arctan2(target_geometries[:, 1] - source_geometries[:, 1],
+                            target_geometries[:, 0] - source_geometries[:, 0])
+        cos_slopes = np.cos(slopes)
+        sin_slopes = np.sin(slopes)
+        source_positions_x = (source_geometries[:, 0] + source_geometries[:, 2] * cos_slopes).tolist()
+        source_positions_y = (source_geometries[:, 1] + source_geometries[:, 2] * sin_slopes).tolist()
+        target_positions_x = (target_geometries[:, 0] - target_geometries[:, 2] * cos_slopes).tolist()
+        target_positions_y = (target_geometries[:, 1] - target_geometries[:, 2] * sin_slopes).tolist()
+        for e_index in range(len(self.edge_nodes)):
+            edge = self.edge_nodes[e_index][0]
+            edge['source']['position'] = {'x': source_positions_x[e_index], 'y': source_positions_y[e_index]}
+            edge['target']['position'] = {'x': target_positions_x[e_index], 'y': target_positions_y[e_index]}
+        self.edge_nodes = []
 
     def get_shape_style(self, go, offset_x=0.0, offset_y=0.0):
         geometric_shapes = []
@@ -410,18 +466,31 @@ class NetworkInfoExportToNetworkEditor(NetworkInfoExportToJsonBase):
                                      offset_y=line_ending['features']['boundingBox']['y'])
         return line_ending_style
 
-    def export(self, file_name="file"):
+    def get_graph(self, name):
         position = {'x': self.graph_info.extents['minX'] + 0.5 * (self.graph_info.extents['maxX'] - self.graph_info.extents['minX']),
                     'y': self.graph_info.extents['minY'] + 0.5 * (self.graph_info.extents['maxY'] - self.graph_info.extents['minY'])}
         dimensions = {'width': self.graph_info.extents['maxX'] - self.graph_info.extents['minX'],
                       'height': self.graph_info.extents['maxY'] - self.graph_info.extents['minY']}
         graph_info = {'generated_by': "NetworkInfoTranslator",
-                      'name': pathlib(file_name).stem + "_graph",
+                      'name': name,
                       'background-color': self.graph_info.background_color,
                       'position': position,
                       'dimensions': dimensions,
                       'nodes': self.nodes,
                       'edges': self.edges}
-        with open(file_name.split('.')[0] + ".json", 'w', encoding='utf8') as js_file:
-            json.dump(graph_info, js_file, indent=1)
+        if self.use_style_catalog:
+            graph_info['styles'] = self.styles
+
         return graph_info
+
+    def export(self, file_name="file"):
+        graph_info = self.get_graph(pathlib(file_name).stem + "_graph")
+        with self.stage("export"):
+            with open(file_name.split('.')[0] + ".json", 'w', encoding='utf8') as js_file:
+                json.dump(graph_info, js_file, indent=1)
+            self.instrumentation.add_file_bytes_written(file_name.split('.')[0] + ".json")
+        return graph_info
+
+    def export_to_stream(self, stream, file_format="json"):
+        with self.stage("export"):
+            self.write_to_stream(stream, json.dumps(self.get_graph("network_graph"), indent=1))
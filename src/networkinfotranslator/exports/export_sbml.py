@@ -1,5 +1,13 @@
 from .export_base import NetworkInfoExportBase
 import libsbml
+import hashlib
+import json
+import sys
+import os
+import io
+import gzip
+import bz2
+import zipfile
 
 
 class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
@@ -11,24 +19,169 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
         self.local_render = None
         self.layoutns = None
         self.renderns = None
+        self.deduplicate_styles = False
+        self.pass_through = False
+        self.sbml_source = None
+        self.compression = None
+        self.layout_glyphs = {}
+        self.shared_styles = {}
+        self.styled_glyphs = []
 
     def reset(self):
         super().reset()
+        self.sbml_source = None
+        self.shared_styles = {}
+        self.styled_glyphs = []
 
     def extract_graph_info(self, graph_info):
+        if self.pass_through:
+            with self.stage("pass_through"):
+                if self.extract_sbml_document(graph_info):
+                    return
+
         self.create_model()
         super().extract_graph_info(graph_info)
-        self.set_layout_dimensions()
-        self.set_render_background_color()
+        with self.stage("add_render_info"):
+            self.set_layout_dimensions()
+            self.set_render_background_color()
+
+            for color in self.graph_info.colors:
+                self.add_color(color)
+
+            for gradient in self.graph_info.gradients:
+                self.add_gradient(gradient)
+
+            for line_ending in self.graph_info.line_endings:
+                self.add_line_ending(line_ending)
+
+            if self.deduplicate_styles:
+                self.add_shared_styles()
+
+    def require_features(self, graph_info):
+        super().require_features(graph_info)
+        # only the pass-through writes the edits back to the source, so only its info is fingerprinted
+        if self.pass_through and not graph_info.has_entity_features:
+            graph_info.track_changes = True
+
+    def extract_sbml_document(self, graph_info):
+        # an SBML source with its own layout is copied as is instead of being rebuilt from the extracted info
+        if graph_info.is_layout_modified:
+            return False
+        layout_changes, render_changes = graph_info.get_changes()
+        if render_changes:
+            raise ValueError("the render features of " +
+                             ", ".join(sorted(str(go_id) for go_id in render_changes if go_id)) +
+                             (" and of the global render information" if None in render_changes else "") +
+                             " were edited, which the SBML pass-through cannot write back")
+
+        # without anything to write back, the source is not even parsed
+        if not layout_changes:
+            sbml_source = graph_info.get_sbml_source()
+            if sbml_source:
+                self.reset()
+                self.graph_info = graph_info
+                self.document = None
+                self.sbml_source = sbml_source
+                return True
+
+        document = graph_info.get_sbml_document()
+        if not document or not document.getModel():
+            return False
+        layout_plugin = document.getModel().getPlugin("layout")
+        if not layout_plugin or not layout_plugin.getNumLayouts():
+            return False
+
+        self.reset()
+        self.graph_info = graph_info
+        self.document = document.clone()
+        self.layout = self.document.getModel().getPlugin("layout").getLayout(0)
+        self.layoutns = libsbml.LayoutPkgNamespaces(self.document.getLevel(), self.document.getVersion(), 1)
+
+        # the features edited since their extraction are written back
+        if layout_changes:
+            self.update_layout(layout_changes)
+
+        return True
+
+    def update_layout(self, layout_changes):
+        self.layout_glyphs = self.get_layout_glyphs()
+        for go in self.graph_info.get_entities():
+            if go.get('id') in layout_changes:
+                self.update_glyph(go)
+        self.layout_glyphs = {}
+
+    def get_layout_glyphs(self):
+        layout_glyphs = {}
+        for go_glyph in self.layout.getListOfCompartmentGlyphs():
+            layout_glyphs[go_glyph.getId()] = go_glyph
+        for go_glyph in self.layout.getListOfSpeciesGlyphs():
+            layout_glyphs[go_glyph.getId()] = go_glyph
+        for go_glyph in self.layout.getListOfReactionGlyphs():
+            layout_glyphs[go_glyph.getId()] = go_glyph
+            for species_reference_glyph in go_glyph.getListOfSpeciesReferenceGlyphs():
+                layout_glyphs[species_reference_glyph.getId()] = species_reference_glyph
+        for go_glyph in self.layout.getListOfTextGlyphs():
+            layout_glyphs[go_glyph.getId()] = go_glyph
+
+        return layout_glyphs
+
+    def update_glyph(self, go):
+        if 'id' not in list(go.keys()) or 'features' not in list(go.keys()):
+            return
+        go_glyph = self.layout_glyphs.get(go['id'])
+        if not go_glyph:
+            return
 
-        for color in self.graph_info.colors:
-            self.add_color(color)
+        if 'boundingBox' in list(go['features'].keys()):
+            self.update_glyph_bounding_box(go['features']['boundingBox'], go_glyph)
+        if 'curve' in list(go['features'].keys()) and \
+                go['features']['curve'] != self.get_glyph_curve(go_glyph.getCurve()):
+            go_glyph.getCurve().getListOfCurveSegments().clear()
+            self.set_glyph_curve(go, go_glyph)
+
+        # text
+        if 'texts' in list(go.keys()):
+            for text in go['texts']:
+                if 'id' in list(text.keys()) and 'features' in list(text.keys()):
+                    text_glyph = self.layout_glyphs.get(text['id'])
+                    if text_glyph:
+                        if 'boundingBox' in list(text['features'].keys()):
+                            self.update_glyph_bounding_box(text['features']['boundingBox'], text_glyph)
+                        if 'plainText' in list(text['features'].keys()) and \
+                                text['features']['plainText'] != text_glyph.getText():
+                            text_glyph.setText(text['features']['plainText'])
 
-        for gradient in self.graph_info.gradients:
-            self.add_gradient(gradient)
+    @staticmethod
+    def update_glyph_bounding_box(bounding_box, go_glyph):
+        go_bounding_box = go_glyph.getBoundingBox()
+        if bounding_box['x'] == go_bounding_box.getX() and bounding_box['y'] == go_bounding_box.getY() and \
+                bounding_box['width'] == go_bounding_box.getWidth() and \
+                bounding_box['height'] == go_bounding_box.getHeight():
+            return
+        go_bounding_box.setX(bounding_box['x'])
+        go_bounding_box.setY(bounding_box['y'])
+        go_bounding_box.setWidth(bounding_box['width'])
+        go_bounding_box.setHeight(bounding_box['height'])
+        # a bounding box edited in place is not written next to a curve unless it is set on the glyph again
+        go_glyph.setBoundingBox(go_bounding_box)
 
-        for line_ending in self.graph_info.line_endings:
-            self.add_line_ending(line_ending)
+    @staticmethod
+    def get_glyph_curve(go_glyph_curve):
+        curve = []
+        for cs_index in range(go_glyph_curve.getNumCurveSegments()):
+            go_curve_element = go_glyph_curve.getCurveSegment(cs_index)
+            curve_segment = {'startX': go_curve_element.getStart().getXOffset(),
+                             'startY': go_curve_element.getStart().getYOffset(),
+                             'endX': go_curve_element.getEnd().getXOffset(),
+                             'endY': go_curve_element.getEnd().getYOffset()}
+            if go_curve_element.getTypeCode() == libsbml.SBML_LAYOUT_CUBICBEZIER:
+                curve_segment['basePoint1X'] = go_curve_element.getBasePoint1().getXOffset()
+                curve_segment['basePoint1Y'] = go_curve_element.getBasePoint1().getYOffset()
+                curve_segment['basePoint2X'] = go_curve_element.getBasePoint2().getXOffset()
+                curve_segment['basePoint2Y'] = go_curve_element.getBasePoint2().getYOffset()
+            curve.append(curve_segment)
+
+        return curve
 
     def set_layout_dimensions(self):
         self.layout.setDimensions(libsbml.Dimensions(self.layoutns,
@@ -39,19 +192,15 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
         self.global_render.setBackgroundColor(self.graph_info.background_color)
 
     @staticmethod
-    def check(value, message):
-        if value == None:
-            raise SystemExit('LibSBML returned a null value trying to ' + message + '.')
-        elif type(value) is int:
-            if value == libsbml.LIBSBML_OPERATION_SUCCESS:
-                return
-            else:
-                err_msg = 'Error encountered trying to ' + message + '.' \
-                          + 'LibSBML returned error code ' + str(value) + ': "' \
-                          + OperationReturnValue_toString(value).strip() + '"'
-                raise SystemExit(err_msg)
-        else:
-            return
+    def check(value, message, *message_args):
+        # the error message is only formatted when the operation has failed
+        if value is None:
+            raise SystemExit('LibSBML returned a null value trying to ' + (message % message_args) + '.')
+        elif type(value) is int and value != libsbml.LIBSBML_OPERATION_SUCCESS:
+            err_msg = 'Error encountered trying to ' + (message % message_args) + '.' \
+                      + 'LibSBML returned error code ' + str(value) + ': "' \
+                      + libsbml.OperationReturnValue_toString(value).strip() + '"'
+            raise SystemExit(err_msg)
 
     def create_model(self):
         # document
@@ -109,7 +258,7 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
     def add_compartment(self, compartment):
         if 'referenceId' in list(compartment.keys()):
             c = self.document.model.createCompartment()
-            self.check(c, 'create compartment ' + compartment['referenceId'])
+            self.check(c, 'create compartment %s', compartment['referenceId'])
             self.check(c.setId(compartment['referenceId']), 'set compartment id')
             self.check(c.setConstant(True), 'set compartment "constant"')
             self.check(c.setSize(1), 'set compartment "size"')
@@ -119,24 +268,24 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
     def add_species(self, species):
         if 'referenceId' in list(species.keys()):
             s = self.document.model.createSpecies()
-            self.check(s, 'create species ' + species['referenceId'])
-            self.check(s.setId(species['referenceId']), 'set species ' + species['referenceId'] + ' id')
+            self.check(s, 'create species %s', species['referenceId'])
+            self.check(s.setId(species['referenceId']), 'set species %s id', species['referenceId'])
             if 'compartment' in list(species.keys()):
                 self.check(s.setCompartment(species['compartment']),
-                           'set species' + species['referenceId'] + ' compartment')
-            self.check(s.setConstant(False), 'set "constant" attribute on ' + species['referenceId'])
-            self.check(s.setInitialAmount(0), 'set initial amount for ' + species['id'])
-            self.check(s.setBoundaryCondition(False), 'set "boundaryCondition" on ' + species['id'])
-            self.check(s.setHasOnlySubstanceUnits(False), 'set "hasOnlySubstanceUnits" on ' + species['id'])
+                           'set species %s compartment', species['referenceId'])
+            self.check(s.setConstant(False), 'set "constant" attribute on %s', species['referenceId'])
+            self.check(s.setInitialAmount(0), 'set initial amount for %s', species['id'])
+            self.check(s.setBoundaryCondition(False), 'set "boundaryCondition" on %s', species['id'])
+            self.check(s.setHasOnlySubstanceUnits(False), 'set "hasOnlySubstanceUnits" on %s', species['id'])
             self.add_species_glyph(species)
 
     def add_reaction(self, reaction):
         if 'referenceId' in list(reaction.keys()):
             r = self.document.model.createReaction()
-            self.check(r, 'create reaction ' + reaction['referenceId'])
-            self.check(r.setId(reaction['referenceId']), 'set reaction ' + reaction['referenceId'] + ' id')
-            self.check(r.setReversible(False), 'set reaction ' + reaction['referenceId'] + ' reversibility flag')
-            self.check(r.setFast(False), 'set reaction ' + reaction['referenceId'] + ' "fast" attribute')
+            self.check(r, 'create reaction %s', reaction['referenceId'])
+            self.check(r.setId(reaction['referenceId']), 'set reaction %s id', reaction['referenceId'])
+            self.check(r.setReversible(False), 'set reaction %s reversibility flag', reaction['referenceId'])
+            self.check(r.setFast(False), 'set reaction %s "fast" attribute', reaction['referenceId'])
 
             # species references
             if 'speciesReferences' in list(reaction.keys()):
@@ -155,22 +304,22 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
                     or species_reference['role'].lower() == "reactant":
                 sr = reaction.createReactant()
                 self.check(sr.setConstant(True),
-                           'set species_reference ' + species_reference['referenceId'] + ' "constant" attribute')
+                           'set species_reference %s "constant" attribute', species_reference['referenceId'])
             elif species_reference['role'].lower() == "product" or species_reference[
                     'role'].lower() == "sideproduct" \
                      or species_reference['role'].lower() == "side product":
                 sr = reaction.createProduct()
                 self.check(sr.setConstant(True),
-                           'set species_reference ' + species_reference['referenceId'] + ' "constant" attribute')
+                           'set species_reference %s "constant" attribute', species_reference['referenceId'])
             else:
                 sr = reaction.createModifier()
 
             if sr:
-                self.check(sr, 'create species_reference ' + species_reference['referenceId'])
+                self.check(sr, 'create species_reference %s', species_reference['referenceId'])
                 self.check(sr.setId(species_reference['referenceId']),
-                           'set species_reference ' + species_reference['referenceId'] + ' id')
+                           'set species_reference %s id', species_reference['referenceId'])
                 self.check(sr.setSpecies(species_reference['species']),
-                           'assign species_reference ' + species_reference['referenceId'] + ' species')
+                           'assign species_reference %s species', species_reference['referenceId'])
 
     def add_compartment_glyph(self, compartment):
         if 'id' in list(compartment.keys()):
@@ -178,7 +327,7 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
             compartment_glyph.setId(compartment['id'])
             compartment_glyph.setCompartmentId(compartment['referenceId'])
             self.set_glyph_bounding_box(compartment, compartment_glyph)
-            self.add_local_style(compartment)
+            self.add_local_style(compartment, compartment_glyph)
 
             # text
             if 'texts' in list(compartment.keys()):
@@ -191,7 +340,7 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
             species_glyph.setId(species['id'])
             species_glyph.setSpeciesId(species['referenceId'])
             self.set_glyph_bounding_box(species, species_glyph)
-            self.add_local_style(species)
+            self.add_local_style(species, species_glyph)
 
             # text
             for text in species['texts']:
@@ -204,7 +353,7 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
             reaction_glyph.setReactionId(reaction['referenceId'])
             self.set_glyph_bounding_box(reaction, reaction_glyph)
             self.set_glyph_curve(reaction, reaction_glyph)
-            self.add_local_style(reaction)
+            self.add_local_style(reaction, reaction_glyph)
 
             # text
             for text in reaction['texts']:
@@ -234,7 +383,7 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
                 'role'].lower() == "side product":
                 species_reference_glyph.setRole(libsbml.SPECIES_ROLE_SIDEPRODUCT)
             self.set_glyph_curve(species_reference, species_reference_glyph)
-            self.add_local_style(species_reference)
+            self.add_local_style(species_reference, species_reference_glyph)
 
     def add_text_glyph(self, text, go_glyph):
         if 'id' in list(text.keys()):
@@ -244,10 +393,12 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
             text_glyph.setGraphicalObjectId(go_glyph.getId())
             self.set_glyph_bounding_box(text, text_glyph)
             self.set_text_glyph_plain_text(text, text_glyph)
-            self.add_local_style(text)
+            self.add_local_style(text, text_glyph)
 
-    def add_local_style(self, go):
-        if 'features' in list(go.keys()):
+    def add_local_style(self, go, go_glyph):
+        if self.deduplicate_styles:
+            self.add_shared_style_glyph(go, go_glyph)
+        elif 'features' in list(go.keys()):
             style = self.local_render.createLocalStyle()
             if 'styleName' in list(go['features'].keys()):
                 style.setId(go['features']['styleName'])
@@ -257,38 +408,116 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
             render_group = style.createGroup()
             self.set_render_group_features(render_group, go['features'])
 
+    def add_shared_style_glyph(self, go, go_glyph):
+        style_key = None
+        if 'features' in list(go.keys()):
+            render_features = {}
+            for feature_name in ['graphicalShape', 'graphicalCurve', 'graphicalText']:
+                if feature_name in list(go['features'].keys()):
+                    render_features[feature_name] = go['features'][feature_name]
+            style_key = hashlib.sha1(json.dumps(render_features, sort_keys=True, default=str).encode()).hexdigest()
+            if style_key not in list(self.shared_styles.keys()):
+                self.shared_styles[style_key] = {'features': render_features, 'idList': [], 'roleList': [],
+                                                 'typeList': []}
+                if 'styleName' in list(go['features'].keys()):
+                    self.shared_styles[style_key]['styleName'] = go['features']['styleName']
+        role = ""
+        if go_glyph.getTypeCode() == libsbml.SBML_LAYOUT_SPECIESREFERENCEGLYPH and go_glyph.isSetRole():
+            role = go_glyph.getRoleString()
+        self.styled_glyphs.append({'id': go_glyph.getId(), 'type': go_glyph.getElementName().upper(),
+                                   'role': role, 'style': style_key})
+
+    def add_shared_styles(self):
+        # a glyph type (or species reference role) whose glyphs all look alike is bound through typeList (roleList)
+        # and only the remaining glyphs are listed one by one in idList
+        type_styles = {}
+        role_styles = {}
+        for glyph in self.styled_glyphs:
+            type_styles.setdefault(glyph['type'], set()).add(glyph['style'])
+            if glyph['role']:
+                role_styles.setdefault(glyph['role'], set()).add(glyph['style'])
+        for glyph_type, style_keys in type_styles.items():
+            if len(style_keys) == 1 and None not in style_keys:
+                self.shared_styles[next(iter(style_keys))]['typeList'].append(glyph_type)
+            else:
+                type_styles[glyph_type] = None
+        for role, style_keys in role_styles.items():
+            if len(style_keys) == 1 and None not in style_keys:
+                self.shared_styles[next(iter(style_keys))]['roleList'].append(role)
+            else:
+                role_styles[role] = None
+        for glyph in self.styled_glyphs:
+            if glyph['style'] and not type_styles[glyph['type']] and \
+                    not (glyph['role'] and role_styles[glyph['role']]):
+                self.shared_styles[glyph['style']]['idList'].append(glyph['id'])
+
+        style_index = 0
+        style_ids = set()
+        for shared_style in self.shared_styles.values():
+            if shared_style['idList'] or shared_style['roleList'] or shared_style['typeList']:
+                style = self.local_render.createLocalStyle()
+                if 'styleName' in list(shared_style.keys()) and shared_style['styleName'] not in style_ids:
+                    style.setId(shared_style['styleName'])
+                else:
+                    style.setId("NetworkInfoTranslator_Style_" + str(style_index))
+                style_ids.add(style.getId())
+                style_index += 1
+                for go_id in shared_style['idList']:
+                    style.addId(go_id)
+                for role in shared_style['roleList']:
+                    style.addRole(role)
+                for glyph_type in shared_style['typeList']:
+                    style.addType(glyph_type)
+                render_group = style.createGroup()
+                self.set_render_group_features(render_group, shared_style['features'])
+
     def set_glyph_bounding_box(self, go, go_glyph):
         if 'features' in list(go.keys()) and 'boundingBox' in list(go['features'].keys()):
-            go_glyph.setBoundingBox(libsbml.BoundingBox(self.layoutns,
-                                                        go_glyph.getId() + "_bb",
-                                                        go['features']['boundingBox']['x'],
-                                                        go['features']['boundingBox']['y'],
-                                                        go['features']['boundingBox']['width'],
-                                                        go['features']['boundingBox']['height']))
+            # the bounding box the glyph already has is filled in place instead of copying a new one into it
+            go_glyph.getBoundingBox().setId(go_glyph.getId() + "_bb")
+            self.update_glyph_bounding_box(go['features']['boundingBox'], go_glyph)
 
     def set_glyph_curve(self, go, go_glyph):
         if 'features' in list(go.keys()) and 'curve' in list(go['features'].keys()):
-            for go_curve_element in go['features']['curve']:
-                if all(k in go_curve_element.keys() for k in ('startX', 'startY', 'endX', 'endY')):
-                    go_glyph_curve = go_glyph.getCurve()
-                    element = None
-                    if all(k in go_curve_element.keys() for k in
-                           ('basePoint1X', 'basePoint1Y', 'basePoint2X', 'basePoint2Y')):
-                        element = go_glyph_curve.createCubicBezier()
-                        element.setBasePoint1(libsbml.Point(self.layoutns,
-                                                            go_curve_element['basePoint1X'],
-                                                            go_curve_element['basePoint1Y']))
-                        element.setBasePoint2(libsbml.Point(self.layoutns,
-                                                            go_curve_element['basePoint2X'],
-                                                            go_curve_element['basePoint2Y']))
+            curve_coordinates = self.get_curve_coordinates(go['features']['curve'])
+            if curve_coordinates:
+                go_glyph_curve = go_glyph.getCurve()
+                create_line_segment = go_glyph_curve.createLineSegment
+                create_cubic_bezier = go_glyph_curve.createCubicBezier
+                # the points of the created elements are filled in place instead of copying new points into them
+                for coordinates in curve_coordinates:
+                    if len(coordinates) == 8:
+                        element = create_cubic_bezier()
+                        point = element.getBasePoint1()
+                        point.setX(coordinates[4])
+                        point.setY(coordinates[5])
+                        point = element.getBasePoint2()
+                        point.setX(coordinates[6])
+                        point.setY(coordinates[7])
                     else:
-                        element = go_glyph_curve.createLineSegment()
-                    element.setStart(libsbml.Point(self.layoutns,
-                                                   go_curve_element['startX'],
-                                                   go_curve_element['startY']))
-                    element.setEnd(libsbml.Point(self.layoutns,
-                                                 go_curve_element['endX'],
-                                                 go_curve_element['endY']))
+                        element = create_line_segment()
+                    point = element.getStart()
+                    point.setX(coordinates[0])
+                    point.setY(coordinates[1])
+                    point = element.getEnd()
+                    point.setX(coordinates[2])
+                    point.setY(coordinates[3])
+
+    @staticmethod
+    def get_curve_coordinates(curve):
+        curve_coordinates = []
+        for go_curve_element in curve:
+            if 'startX' in go_curve_element and 'startY' in go_curve_element and \
+                    'endX' in go_curve_element and 'endY' in go_curve_element:
+                coordinates = (go_curve_element['startX'], go_curve_element['startY'],
+                               go_curve_element['endX'], go_curve_element['endY'])
+                if 'basePoint1X' in go_curve_element and 'basePoint1Y' in go_curve_element and \
+                        'basePoint2X' in go_curve_element and 'basePoint2Y' in go_curve_element:
+                    coordinates += (go_curve_element['basePoint1X'], go_curve_element['basePoint1Y'],
+                                    go_curve_element['basePoint2X'], go_curve_element['basePoint2Y'])
+                curve_coordinates.append(coordinates)
+
+        return curve_coordinates
 
     @staticmethod
     def set_text_glyph_plain_text(text, text_glyph):
@@ -642,8 +871,8 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
                                                                gradient['features']['end']['y']['rel']))
             # radial gradient
             elif 'center' in list(gradient['features'].keys()) and \
-                    'focalPoint' in list(gradient['features'].keys() and \
-                                         'radius' in list(gradient['features'].keys())):
+                    'focalPoint' in list(gradient['features'].keys()) and \
+                    'radius' in list(gradient['features'].keys()):
                 gradient_definition = self.global_render.createRadialGradientDefinition()
                 gradient_definition.setCx(libsbml.RelAbsVector(gradient['features']['center']['x']['abs'],
                                                                gradient['features']['center']['x']['rel']))
@@ -657,6 +886,8 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
                                                               gradient['features']['radius']['rel']))
 
             if gradient_definition:
+                gradient_definition.setId(gradient['id'])
+
                 # spread method
                 if 'spreadMethod' in list(gradient['features'].keys()):
                     gradient_definition.setSpreadMethod(gradient['features']['spreadMethod'])
@@ -680,4 +911,102 @@ class NetworkInfoExportToSBMLModel(NetworkInfoExportBase):
                 line_ending_definition.setEnableRotationalMapping(line_ending['features']['enableRotation'])
 
     def export(self, file_name):
-        libsbml.writeSBMLToFile(self.document, file_name.split('.')[0] + ".xml")
+        with self.stage("export"):
+            # a file object (e.g. an open file or an io.BytesIO buffer) is written to directly
+            if hasattr(file_name, 'write'):
+                self.export_to_stream(file_name)
+                return
+
+            file_name = self.get_file_name(file_name)
+            compression = self.get_compression(file_name)
+            if compression:
+                with open(file_name, 'wb') as sbml_file:
+                    sbml_file.write(self.export_as_bytes(compression, self.get_archive_member_name(file_name)))
+            elif self.sbml_source:
+                with open(file_name, 'w', encoding='utf-8') as sbml_file:
+                    sbml_file.write(self.sbml_source)
+            else:
+                libsbml.writeSBMLToFile(self.document, file_name)
+            self.instrumentation.add_file_bytes_written(file_name)
+
+    def export_to_stream(self, stream, file_format="xml"):
+        if isinstance(stream, io.TextIOBase):
+            if self.compression:
+                raise ValueError('compressed SBML can only be written to a binary stream')
+            sbml_string = self.get_sbml_string()
+            stream.write(sbml_string)
+            self.instrumentation.add_bytes_written(len(sbml_string.encode('utf-8')))
+        else:
+            member_name = "model.xml"
+            if hasattr(stream, 'name') and isinstance(stream.name, str):
+                member_name = self.get_archive_member_name(stream.name)
+            sbml_bytes = self.export_as_bytes(self.compression, member_name)
+            stream.write(sbml_bytes)
+            self.instrumentation.add_bytes_written(len(sbml_bytes))
+
+    def export_as_bytes(self, compression=None, member_name="model.xml"):
+        sbml_bytes = self.get_sbml_string().encode('utf-8')
+        if compression == "gzip":
+            return gzip.compress(sbml_bytes)
+        elif compression == "bz2":
+            return bz2.compress(sbml_bytes)
+        elif compression == "zip":
+            zip_buffer = io.BytesIO()
+            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+                zip_file.writestr(member_name, sbml_bytes)
+            return zip_buffer.getvalue()
+        elif compression:
+            raise ValueError('unsupported compression "' + str(compression) + '"')
+
+        return sbml_bytes
+
+    def get_sbml_string(self):
+        # a source passed through without changes is written as it is
+        if self.sbml_source:
+            return self.sbml_source
+
+        return libsbml.writeSBMLToString(self.document)
+
+    def get_file_name(self, file_name):
+        # the extension given by the caller is kept, and only missing ones are added
+        if not file_name:
+            file_name = "model"
+        if not self.get_compression(file_name):
+            if not os.path.splitext(file_name)[1]:
+                file_name += ".xml"
+            if self.compression:
+                file_name += self.get_compression_extension(self.compression)
+
+        return file_name
+
+    @staticmethod
+    def get_compression(file_name):
+        extension = os.path.splitext(file_name)[1].lower()
+        if extension == ".gz":
+            return "gzip"
+        elif extension == ".bz2":
+            return "bz2"
+        elif extension == ".zip":
+            return "zip"
+
+        return None
+
+    @staticmethod
+    def get_compression_extension(compression):
+        if compression == "gzip":
+            return ".gz"
+        elif compression == "bz2":
+            return ".bz2"
+        elif compression == "zip":
+            return ".zip"
+
+        raise ValueError('unsupported compression "' + str(compression) + '"')
+
+    def get_archive_member_name(self, file_name):
+        member_name = os.path.basename(file_name)
+        if self.get_compression(member_name):
+            member_name = os.path.splitext(member_name)[0]
+        if not os.path.splitext(member_name)[1]:
+            member_name += ".xml"
+
+        return member_name
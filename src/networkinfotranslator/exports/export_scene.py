@@ -0,0 +1,19 @@
+import threading
+
+
+class NetworkInfoExportScene:
+    def __init__(self, exporter):
+        # a scene is a private clone of the exporter which built it. the clone keeps the state of its exports (e.g. the
+        # figure of matplotlib) and goes on changing with them, so the exports of the same scene are run one at a time
+        self.exporter = exporter
+        self.graph_info = exporter.graph_info
+        self.lock = threading.Lock()
+
+    def export(self, file_name=""):
+        # the scenes are exported side by side, but the exports of the same scene one at a time
+        with self.lock:
+            return self.exporter.export(file_name)
+
+    def export_to_stream(self, stream, file_format=""):
+        with self.lock:
+            return self.exporter.export_to_stream(stream, file_format)
@@ -1,3 +1,10 @@
+from .import_lazy_entity import NetworkInfoLazyEntity
+from .import_viewport import NetworkInfoViewport
+from ..profiling.instrumentation import NetworkInfoNoInstrumentation
+import threading
+import json
+
+
 class NetworkInfoImportBase:
     def __init__(self):
         self.compartments = []
@@ -8,6 +15,31 @@ class NetworkInfoImportBase:
         self.line_endings = []
         self.extents = {}
         self.background_color = ""
+        self.is_layout_modified = False
+        self.auto_layout = None
+        self.layout_cache = None
+        self.layout_cache_key = ""
+        # the features were restored from the layout cache instead of being extracted
+        self.is_restored_from_cache = False
+        # the features are there, so they may have been edited since (see NetworkInfoExportToSBMLModel.pass_through)
+        self.has_entity_features = False
+        # the features are extracted once and shared as they are by the exporters (see freeze)
+        self.is_frozen = False
+        # the backend of this importer is not thread-safe, so its info is frozen, and its entities extracted, one at a
+        # time. the other importers have backends of their own and are not held up by it
+        self.lock = threading.RLock()
+        # the groups of features (see get_feature_groups) to extract, or None for all of them
+        self.required_features = None
+        self.extracted_features = None
+        # the features of the compartments, species and reactions are extracted once they are first looked at
+        self.lazy_features = False
+        self.is_closed = False
+        # the extracted features are fingerprinted, so the changes made to them since can be found (see get_changes).
+        # the SBML pass-through turns it on for the info it is given before its features are extracted
+        self.track_changes = False
+        self.fingerprints = {}
+        self.instrumentation = NetworkInfoNoInstrumentation()
+        self.backend_profiler = None
 
     def reset_info(self):
         self.compartments.clear()
@@ -18,6 +50,173 @@ class NetworkInfoImportBase:
         self.line_endings.clear()
         self.extents = {'minX': 0, 'maxX': 0, 'minY': 0, 'maxY': 0}
         self.background_color = "white"
+        self.is_layout_modified = False
+        self.layout_cache_key = ""
+        self.is_restored_from_cache = False
+        self.has_entity_features = False
+        self.is_frozen = False
+        self.extracted_features = None
+        self.is_closed = False
+        self.fingerprints = {}
+
+    @staticmethod
+    def get_feature_groups():
+        # the groups of features which are only extracted when they are required
+        return ["texts", "geometricShapes", "vertices", "gradients", "lineEndings"]
+
+    def is_feature_required(self, feature_group):
+        return self.required_features is None or feature_group in self.required_features
+
+    def require_features(self, required_features):
+        # the features needed by an exporter are added to the ones to extract
+        if self.required_features is not None:
+            if required_features is None:
+                self.required_features = None
+            else:
+                self.required_features = set(self.required_features) | set(required_features)
+
+    def has_features(self, required_features):
+        # whether the extracted features include the required ones
+        if self.extracted_features is None:
+            return True
+        if required_features is None:
+            return False
+
+        return set(required_features) <= self.extracted_features
+
+    def supports_lazy_features(self):
+        # the importers which can find the extents without extracting all the features
+        return False
+
+    def can_extract_features_lazily(self):
+        # the auto layout and the layout cache need all the features
+        return self.supports_lazy_features() and not (self.auto_layout and self.is_layout_modified) \
+            and not self.layout_cache_key
+
+    def extract_entity_features_lazily(self):
+        # the extents are found now, and the other features once an exporter looks at the entity
+        self.extract_entity_extents()
+        extract_compartment_features = self.get_feature_extractor(self.extract_compartment_features)
+        self.compartments = [NetworkInfoLazyEntity(compartment, extract_compartment_features, self.lock)
+                             for compartment in self.compartments]
+        extract_species_features = self.get_feature_extractor(self.extract_species_features)
+        self.species = [NetworkInfoLazyEntity(species, extract_species_features, self.lock) for species in self.species]
+        extract_reaction_features = self.get_feature_extractor(self.extract_reaction_features)
+        extract_species_reference_features = self.get_feature_extractor(self.extract_species_reference_features)
+        reactions = []
+        for reaction in self.reactions:
+            reaction = NetworkInfoLazyEntity(reaction, extract_reaction_features, self.lock)
+            if 'speciesReferences' in list(dict.keys(reaction)):
+                dict.__setitem__(reaction, 'speciesReferences',
+                                 [NetworkInfoLazyEntity(species_reference, extract_species_reference_features,
+                                                        self.lock)
+                                  for species_reference in dict.__getitem__(reaction, 'speciesReferences')])
+            reactions.append(reaction)
+        self.reactions = reactions
+
+    def extract_entity_extents(self):
+        pass
+
+    def get_entity_bounding_box(self, go):
+        # the bounding box of an entity yet to be extracted is read from the backend where the importer can
+        if not self.is_extracted(go):
+            bounding_box = self.extract_entity_bounding_box(go)
+            if bounding_box:
+                return bounding_box
+        if 'boundingBox' in list(go['features'].keys()):
+            return go['features']['boundingBox']
+
+        return None
+
+    def extract_entity_bounding_box(self, go):
+        return None
+
+    def get_viewport(self, x, y, width, height):
+        # the exporters given the viewport export only the entities in the region (see NetworkInfoViewport)
+        return NetworkInfoViewport(self, x, y, width, height)
+
+    def get_feature_extractor(self, extract_features):
+        # a lazy entity is fingerprinted once its features are extracted
+        if not self.track_changes:
+            return extract_features
+
+        def extract_and_fingerprint_features(go):
+            extract_features(go)
+            self.fingerprints[go['id']] = self.get_fingerprints(go)
+
+        return extract_and_fingerprint_features
+
+    def get_entities(self):
+        # the compartments, species, reactions and species references, without extracting the lazy ones
+        entities = self.compartments + self.species + self.reactions
+        for reaction in self.reactions:
+            entities.extend(reaction.get('speciesReferences', []))
+
+        return entities
+
+    @staticmethod
+    def is_extracted(go):
+        return not isinstance(go, NetworkInfoLazyEntity) or go.is_extracted
+
+    def record_fingerprints(self):
+        for go in self.get_entities():
+            if 'id' in dict.keys(go) and self.is_extracted(go):
+                self.fingerprints[go['id']] = self.get_fingerprints(go)
+        self.fingerprints[None] = self.get_global_render_fingerprint()
+
+    @staticmethod
+    def get_fingerprints(go):
+        # the layout (the geometry and the plain texts) and the render features of an entity are fingerprinted apart
+        layout = {}
+        render = {}
+        if 'features' in list(go.keys()):
+            for key, value in go['features'].items():
+                if key in ["boundingBox", "curve"]:
+                    layout[key] = value
+                else:
+                    render[key] = value
+        if 'texts' in list(go.keys()):
+            layout['texts'] = []
+            render['texts'] = []
+            for text in go['texts']:
+                text_layout = {}
+                text_render = {}
+                for key, value in text.get('features', {}).items():
+                    if key in ["boundingBox", "plainText"]:
+                        text_layout[key] = value
+                    else:
+                        text_render[key] = value
+                layout['texts'].append(text_layout)
+                render['texts'].append(text_render)
+
+        return json.dumps(layout, sort_keys=True, default=str), json.dumps(render, sort_keys=True, default=str)
+
+    def get_global_render_fingerprint(self):
+        return json.dumps([self.background_color, self.colors, self.gradients, self.line_endings], sort_keys=True,
+                          default=str)
+
+    def get_changes(self):
+        # the ids of the entities whose layout or render features were edited since they were extracted
+        layout_changes = set()
+        render_changes = set()
+        if not self.has_entity_features:
+            return layout_changes, render_changes
+        for go in self.get_entities():
+            if 'id' not in dict.keys(go) or not self.is_extracted(go):
+                continue
+            if go['id'] not in self.fingerprints:
+                # the entities extracted without a fingerprint may have any layout
+                layout_changes.add(go['id'])
+                continue
+            layout_fingerprint, render_fingerprint = self.get_fingerprints(go)
+            if layout_fingerprint != self.fingerprints[go['id']][0]:
+                layout_changes.add(go['id'])
+            if render_fingerprint != self.fingerprints[go['id']][1]:
+                render_changes.add(go['id'])
+        if None in self.fingerprints and self.get_global_render_fingerprint() != self.fingerprints[None]:
+            render_changes.add(None)
+
+        return layout_changes, render_changes
 
     def find_compartment(self, compartment_reference_id):
         for compartment in self.compartments:
@@ -105,33 +304,132 @@ class NetworkInfoImportBase:
     def extract_info(self, graph):
         self.reset_info()
 
+    def stage(self, name):
+        return self.instrumentation.stage(type(self).__name__ + "." + name)
+
+    def wrap_backend(self, backend):
+        if self.backend_profiler:
+            backend = self.backend_profiler.wrap(backend)
+
+        return self.instrumentation.wrap_backend(backend)
+
+    def get_sbml_source(self):
+        return None
+
+    def get_sbml_document(self):
+        return None
+
+    def get_info_snapshot(self):
+        return {'compartments': self.compartments, 'species': self.species, 'reactions': self.reactions,
+                'colors': self.colors, 'gradients': self.gradients, 'line_endings': self.line_endings,
+                'extents': self.extents, 'background_color': self.background_color}
+
+    def set_info_snapshot(self, snapshot):
+        self.compartments = snapshot['compartments']
+        self.species = snapshot['species']
+        self.reactions = snapshot['reactions']
+        self.colors = snapshot['colors']
+        self.gradients = snapshot['gradients']
+        self.line_endings = snapshot['line_endings']
+        self.extents = snapshot['extents']
+        self.background_color = snapshot['background_color']
+
+    def freeze(self):
+        # the features are extracted once, and the exporters given this info use them as they are
+        with self.lock:
+            if not self.is_frozen:
+                self.extract_entity_features()
+                self.is_frozen = True
+
+    def detach(self):
+        # the features are extracted into plain data, so the native document of the backend can be dropped
+        self.freeze()
+        for go in self.get_lazy_entities():
+            go.extract()
+        self.close()
+
+    def close(self):
+        # the features not extracted yet can no longer be extracted (see detach)
+        for go in self.get_lazy_entities():
+            go.close()
+        self.release_native_objects()
+        self.is_closed = True
+
+    def get_lazy_entities(self):
+        return [go for go in self.get_entities() if isinstance(go, NetworkInfoLazyEntity)]
+
+    def release_native_objects(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def extract_entity_features(self):
-        # compartments
-        for compartment in self.compartments:
-            self.extract_compartment_features(compartment)
+        # the features are already there, and may have been edited since
+        if self.is_frozen or self.is_restored_from_cache:
+            return
+        if self.is_closed:
+            raise ValueError("the features cannot be extracted once the importer is closed")
 
-        # species
-        for species in self.species:
-            self.extract_species_features(species)
+        if self.required_features is None:
+            self.extracted_features = None
+        else:
+            self.extracted_features = set(self.required_features)
+        with self.stage("extract_entity_features"):
+            self.instrumentation.add_entities(len(self.compartments) + len(self.species) + len(self.reactions))
 
-        # reactions
-        for reaction in self.reactions:
-            self.extract_reaction_features(reaction)
+            if self.lazy_features and self.can_extract_features_lazily():
+                self.extract_entity_features_lazily()
+            else:
+                # compartments
+                for compartment in self.compartments:
+                    self.extract_compartment_features(compartment)
 
-            # species references
-            if 'speciesReferences' in list(reaction.keys()):
-                species_references = reaction['speciesReferences']
-                for species_reference in species_references:
-                    self.extract_species_reference_features(species_reference)
+                # species
+                for species in self.species:
+                    self.extract_species_features(species)
 
-        # line endings
-        for line_ending in self.line_endings:
-            self.extract_line_ending_features(line_ending)
+                # reactions
+                for reaction in self.reactions:
+                    self.extract_reaction_features(reaction)
 
-        # colors
-        for color in self.colors:
-            self.extract_color_features(color)
+                    # species references
+                    if 'speciesReferences' in list(reaction.keys()):
+                        species_references = reaction['speciesReferences']
+                        for species_reference in species_references:
+                            self.extract_species_reference_features(species_reference)
 
-        # gradients
-        for gradient in self.gradients:
-            self.extract_gradient_features(gradient)
\ No newline at end of file
+            # line endings
+            for line_ending in self.line_endings:
+                if self.is_feature_required("lineEndings"):
+                    self.extract_line_ending_features(line_ending)
+                else:
+                    line_ending['features'] = {}
+
+            # colors
+            for color in self.colors:
+                self.extract_color_features(color)
+
+            # gradients
+            for gradient in self.gradients:
+                if self.is_feature_required("gradients"):
+                    self.extract_gradient_features(gradient)
+                else:
+                    gradient['features'] = {}
+        self.has_entity_features = True
+
+        # auto layout
+        if self.auto_layout and self.is_layout_modified:
+            with self.stage("auto_layout"):
+                self.auto_layout.apply(self)
+
+        if self.track_changes:
+            self.record_fingerprints()
+
+        # store the generated layout once, unless some of its features were left out
+        if self.layout_cache and self.layout_cache_key and self.extracted_features is None:
+            self.layout_cache.put(self.layout_cache_key, self.get_info_snapshot())
+            self.layout_cache_key = ""
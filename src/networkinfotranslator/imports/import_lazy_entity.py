@@ -0,0 +1,74 @@
+class NetworkInfoLazyEntity(dict):
+    # the keys which are only filled in once the features of the entity are extracted
+    lazy_keys = ["features", "texts"]
+
+    def __init__(self, entity, extract_features, lock):
+        super().__init__()
+        for key, value in dict.items(entity):
+            dict.__setitem__(self, key, value)
+        self.extract_features = extract_features
+        # the lock of the importer, whose backend extracts the entities one at a time
+        self.lock = lock
+        self.is_extracted = False
+        self.is_extracting = False
+
+    def extract(self):
+        if self.is_extracted:
+            return
+        with self.lock:
+            # the extraction itself reads the entity
+            if self.is_extracted or self.is_extracting:
+                return
+            if not self.extract_features:
+                raise ValueError("the features of " + str(dict.get(self, 'id')) +
+                                 " cannot be extracted once its importer is closed")
+            self.is_extracting = True
+            try:
+                self.extract_features(self)
+                self.extract_features = None
+                self.is_extracted = True
+            finally:
+                self.is_extracting = False
+
+    def close(self):
+        # the importer drops its native document, so the features are not extracted any more
+        with self.lock:
+            self.extract_features = None
+
+    def __getitem__(self, key):
+        if key in self.lazy_keys:
+            self.extract()
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        if key in self.lazy_keys:
+            self.extract()
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        if key in self.lazy_keys:
+            self.extract()
+        return super().__contains__(key)
+
+    def keys(self):
+        self.extract()
+        return super().keys()
+
+    def values(self):
+        self.extract()
+        return super().values()
+
+    def items(self):
+        self.extract()
+        return super().items()
+
+    def __iter__(self):
+        self.extract()
+        return super().__iter__()
+
+    def copy(self):
+        return dict(self.items())
+
+    def __reduce__(self):
+        # it is copied and pickled as a plain dict, without the importer it is extracted from
+        return dict, (dict(self.items()),)
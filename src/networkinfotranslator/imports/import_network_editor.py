@@ -7,11 +7,21 @@ import webcolors
 class NetworkInfoImportFromNetworkEditor(NetworkInfoImportBase):
     def __init__(self):
         super().__init__()
+        self.styles = {}
+        self.node_edges = {}
+        # the ids looked up for each edge, so finding them does not go through all the entities
+        self.species_ids = set()
+        self.reaction_ids = set()
+        self.line_ending_ids = set()
 
     def extract_info(self, graph):
         super().extract_info(graph)
 
         self.graph_info = graph
+        self.styles = {}
+        self.line_ending_ids = set()
+        if 'styles' in list(self.graph_info.keys()):
+            self.styles = self.graph_info['styles']
         self.extract_extents(self.graph_info)
         self.extract_background_color(self.graph_info)
         self.extract_entities(self.graph_info)
@@ -35,8 +45,10 @@ class NetworkInfoImportFromNetworkEditor(NetworkInfoImportBase):
             self.background_color = graph_info['background-color']
 
     def extract_entities(self, graph_info):
+        self.node_edges = self.get_node_edges(graph_info)
         if 'nodes' in list(graph_info.keys()):
             for node in graph_info['nodes']:
+                node = self.resolve_style(node)
                 if 'style' in list(node.keys()) and 'category' in list(node['style'].keys()):
                     if node['style']['category'].lower() == "compartment":
                         self.add_compartment(node)
@@ -44,6 +56,25 @@ class NetworkInfoImportFromNetworkEditor(NetworkInfoImportBase):
                         self.add_species(node)
                     elif node['style']['category'].lower() == "reaction":
                         self.add_reaction(node, graph_info)
+        self.node_edges = {}
+        self.species_ids = set(species['referenceId'] for species in self.species)
+        self.reaction_ids = set(reaction['referenceId'] for reaction in self.reactions)
+
+    @staticmethod
+    def get_node_edges(graph_info):
+        # the edges connected to each node, in the order they are listed in the graph
+        node_edges = {}
+        if 'edges' in list(graph_info.keys()):
+            for edge in graph_info['edges']:
+                node_ids = []
+                for end in ['source', 'target']:
+                    if end in list(edge.keys()) and 'node' in list(edge[end].keys()) and \
+                            edge[end]['node'] not in node_ids:
+                        node_ids.append(edge[end]['node'])
+                for node_id in node_ids:
+                    node_edges.setdefault(node_id, []).append(edge)
+
+        return node_edges
 
     def add_compartment(self, compartment_info):
         compartment_ = {}
@@ -69,17 +100,36 @@ class NetworkInfoImportFromNetworkEditor(NetworkInfoImportBase):
             reaction_['referenceId'] = reaction_info['id']
 
             reaction_['speciesReferences'] = []
-            if 'edges' in list(graph_info.keys()):
-                for edge in graph_info['edges']:
-                    if ('source' in list(edge.keys()) and
-                        'node' in list(edge['source'].keys()) and
-                        edge['source']['node'] == reaction_['referenceId']) or \
-                            ('target' in list(edge.keys()) and
-                             'node' in list(edge['target'].keys()) and
-                             edge['target']['node'] == reaction_['referenceId']):
-                        self.add_species_reference(reaction_['speciesReferences'], edge)
+            for edge in self.node_edges.get(reaction_['referenceId'], []):
+                self.add_species_reference(reaction_['speciesReferences'], self.resolve_style(edge))
             self.reactions.append(reaction_)
 
+    def resolve_style(self, info):
+        # an entity may refer to a style in the style catalog of the graph by its name
+        if 'style' in list(info.keys()) and isinstance(info['style'], str):
+            info = dict(info)
+            style = {}
+            if info['style'] in list(self.styles.keys()):
+                style = dict(self.styles[info['style']])
+            # the name of a shared style is not the name of the style of this entity, which is kept in the entity
+            style.pop('name', None)
+            if 'style-name' in list(info.keys()):
+                style['name'] = info.pop('style-name')
+            if 'shapes' in list(style.keys()):
+                texts = []
+                if 'texts' in list(info.keys()):
+                    texts = list(info['texts'])
+                shapes = []
+                for shape in style['shapes']:
+                    if 'shape' in list(shape.keys()) and shape['shape'].lower() == "text" and len(texts):
+                        shape = dict(shape)
+                        shape.update(texts.pop(0))
+                    shapes.append(shape)
+                style['shapes'] = shapes
+            info['style'] = style
+
+        return info
+
     @staticmethod
     def add_species_reference(species_references, species_reference_info):
         species_reference_ = {}
@@ -100,9 +150,10 @@ class NetworkInfoImportFromNetworkEditor(NetworkInfoImportBase):
             self.colors.append({'id': color})
 
     def add_line_ending(self, line_ending):
-        if 'name' in list(line_ending.keys()) and not self.find_line_ending(line_ending['name']) and \
+        if 'name' in list(line_ending.keys()) and line_ending['name'] not in self.line_ending_ids and \
                 'shapes' in list(line_ending.keys()) and len(line_ending['shapes']):
             self.line_endings.append({'id': line_ending['name'], 'info': line_ending})
+            self.line_ending_ids.add(line_ending['name'])
 
     def extract_compartment_features(self, compartment):
         self.extract_node_features(compartment)
@@ -218,20 +269,20 @@ class NetworkInfoImportFromNetworkEditor(NetworkInfoImportBase):
         edge['features'] = {}
         if 'source' in list(edge['info'].keys()):
             if 'node' in list(edge['info']['source'].keys()):
-                if self.find_species(edge['info']['source']['node']):
+                if edge['info']['source']['node'] in self.species_ids:
                     edge['species'] = edge['info']['source']['node']
                     edge['speciesGlyph'] = edge['info']['source']['node'] + "_glyph"
-                elif self.find_reaction(edge['info']['source']['node']):
+                elif edge['info']['source']['node'] in self.reaction_ids:
                     edge['reaction'] = edge['info']['source']['node']
                     edge['reactionGlyph'] = edge['info']['source']['node'] + "_glyph"
             if 'position' in list(edge['info']['source'].keys()):
                 edge['features']['startPoint'] = edge['info']['source']['position']
         if 'target' in list(edge['info'].keys()):
             if 'node' in list(edge['info']['target'].keys()):
-                if self.find_species(edge['info']['target']['node']):
+                if edge['info']['target']['node'] in self.species_ids:
                     edge['species'] = edge['info']['target']['node']
                     edge['speciesGlyph'] = edge['info']['target']['node'] + "_glyph"
-                elif self.find_reaction(edge['info']['target']['node']):
+                elif edge['info']['target']['node'] in self.reaction_ids:
                     edge['reaction'] = edge['info']['target']['node']
                     edge['reaction'] = edge['info']['target']['node'] + "_glyph"
             if 'position' in list(edge['info']['target'].keys()):
@@ -1,22 +1,142 @@
 from .import_base import NetworkInfoImportBase
 import libsbmlnetworkeditor
+import libsbml
+import hashlib
+import json
 import math
+import os
+import tempfile
 
 
 class NetworkInfoImportFromSBMLModel(NetworkInfoImportBase):
     def __init__(self):
         super().__init__()
         self.sbml_network_editor = None
+        self.sbml_graph = None
+        self.sbml_document = None
+        # the source is only read as SBML content, and never looked up as the path of a file
+        self.read_only_content = False
 
     def extract_info(self, graph):
         super().extract_info(graph)
-        self.sbml_network_editor = libsbmlnetworkeditor.LibSBMLNetworkEditor(graph)
-        self.extract_layout_info()
-        self.extract_render_info()
+        if self.layout_cache:
+            # the source is read once, and the document parsed to look the layout up is kept for the exporters
+            graph = self.read_sbml_source(graph)
+        self.sbml_graph = graph
+        self.sbml_document = None
+        if self.layout_cache and self.extract_cached_info(graph):
+            return
+        with self.stage("read_sbml"):
+            self.sbml_network_editor = self.wrap_backend(self.create_network_editor(graph))
+        with self.stage("extract_layout_info"):
+            self.extract_layout_info()
+        with self.stage("extract_render_info"):
+            self.extract_render_info()
+
+    def release_native_objects(self):
+        # the source is kept, so it can still be passed through
+        self.sbml_network_editor = None
+        self.sbml_document = None
+
+    def get_sbml_source(self):
+        if self.sbml_graph:
+            return self.read_sbml_source(self.sbml_graph)
+
+        return None
+
+    def get_sbml_document(self):
+        # the source document is only parsed when it is needed, and then only once
+        if not self.sbml_document and self.sbml_graph:
+            self.sbml_document = self.read_sbml_document(self.sbml_graph)
+
+        return self.sbml_document
+
+    def extract_cached_info(self, graph):
+        document = self.get_sbml_document()
+        if not document.getModel():
+            return False
+
+        # only the layouts generated for the models without layout are cached
+        layout_plugin = document.getModel().getPlugin("layout")
+        if layout_plugin and layout_plugin.getNumLayouts():
+            return False
+
+        self.layout_cache_key = self.get_topology_key(document.getModel())
+        snapshot = self.layout_cache.get(self.layout_cache_key)
+        if not snapshot:
+            return False
+
+        self.set_info_snapshot(snapshot)
+        self.layout_cache_key = ""
+        self.is_layout_modified = True
+        self.is_restored_from_cache = True
+        self.has_entity_features = True
+        return True
+
+    def create_network_editor(self, graph):
+        if not self.read_only_content:
+            return libsbmlnetworkeditor.LibSBMLNetworkEditor(graph)
+
+        # the network editor looks a string up as a file first, so the content is given to it in a file of its own
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "source.xml")
+            with open(file_name, "w", encoding="utf-8") as sbml_file:
+                sbml_file.write(graph)
+            return libsbmlnetworkeditor.LibSBMLNetworkEditor(file_name)
+
+    def read_sbml_source(self, graph):
+        if not self.read_only_content and os.path.isfile(graph):
+            with open(graph, encoding="utf-8") as sbml_file:
+                return sbml_file.read()
+
+        return graph
+
+    def read_sbml_document(self, graph):
+        if not self.read_only_content and os.path.isfile(graph):
+            return libsbml.readSBMLFromFile(graph)
+
+        return libsbml.readSBMLFromString(graph)
+
+    def get_topology_key(self, model):
+        # the labels are made from the names, and the styles from the global render information
+        topology = {'compartments': sorted([[compartment.getId(), compartment.getName()]
+                                            for compartment in model.getListOfCompartments()]),
+                    'species': sorted([[species.getId(), species.getName(), species.getCompartment()]
+                                       for species in model.getListOfSpecies()]),
+                    'reactions': sorted([self.get_reaction_topology(reaction)
+                                         for reaction in model.getListOfReactions()]),
+                    'texts': [], 'globalRender': ""}
+        layout_plugin = model.getPlugin("layout")
+        if layout_plugin:
+            for layout in layout_plugin.getListOfLayouts():
+                topology['texts'].extend(sorted([[text_glyph.getId(), text_glyph.getText(),
+                                                  text_glyph.getOriginOfTextId()]
+                                                 for text_glyph in layout.getListOfTextGlyphs()]))
+            render_plugin = layout_plugin.getListOfLayouts().getPlugin("render")
+            if render_plugin:
+                topology['globalRender'] = render_plugin.getListOfGlobalRenderInformation().toSBML()
+        # the positions depend on the layout algorithm and its parameters as well
+        if self.auto_layout:
+            topology['autoLayout'] = [type(self.auto_layout).__name__, sorted(vars(self.auto_layout).items())]
+
+        return hashlib.sha256(json.dumps(topology, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def get_reaction_topology(reaction):
+        roles = []
+        for species_reference in reaction.getListOfReactants():
+            roles.append([species_reference.getSpecies(), "reactant"])
+        for species_reference in reaction.getListOfProducts():
+            roles.append([species_reference.getSpecies(), "product"])
+        for species_reference in reaction.getListOfModifiers():
+            roles.append([species_reference.getSpecies(), "modifier"])
+
+        return [reaction.getId(), reaction.getName(), reaction.getCompartment(), sorted(roles)]
 
     def extract_layout_info(self):
         if not self.sbml_network_editor.getNumLayouts():
             self.sbml_network_editor.createDefaultLayout()
+            self.is_layout_modified = True
         self.extract_layout_features()
 
     def extract_render_info(self):
@@ -79,6 +199,25 @@ class NetworkInfoImportFromSBMLModel(NetworkInfoImportBase):
         self.extents['minY'] = min(self.extents['minY'], bounding_box_y)
         self.extents['maxY'] = max(self.extents['maxY'], bounding_box_y + bounding_box_height)
 
+    def supports_lazy_features(self):
+        return True
+
+    def extract_entity_extents(self):
+        for go in self.compartments + self.species + self.reactions:
+            bounding_box = self.extract_entity_bounding_box(go)
+            if bounding_box:
+                self.extract_extents(bounding_box['x'], bounding_box['y'], bounding_box['width'],
+                                     bounding_box['height'])
+
+    def extract_entity_bounding_box(self, go):
+        if go['referenceId']:
+            return {'x': self.sbml_network_editor.getX(go['referenceId'], go['index']),
+                    'y': self.sbml_network_editor.getY(go['referenceId'], go['index']),
+                    'width': self.sbml_network_editor.getWidth(go['referenceId'], go['index']),
+                    'height': self.sbml_network_editor.getHeight(go['referenceId'], go['index'])}
+
+        return None
+
     def add_compartment(self, compartment_id):
         for cg_index in range(self.sbml_network_editor.getNumCompartmentGlyphs(compartment_id)):
             compartment = self.extract_go_object_features(compartment_id, cg_index)
@@ -126,7 +265,9 @@ class NetworkInfoImportFromSBMLModel(NetworkInfoImportBase):
     def extract_compartment_features(self, compartment):
         if compartment['referenceId']:
             compartment['features'] = self.extract_go_general_features(compartment['referenceId'], compartment['index'])
-            compartment['texts'] = self.extract_go_text_features(compartment['referenceId'], compartment['index'])
+            compartment['texts'] = []
+            if self.is_feature_required("texts"):
+                compartment['texts'] = self.extract_go_text_features(compartment['referenceId'], compartment['index'])
             self.extract_extents(self.sbml_network_editor.getX(compartment['referenceId'], compartment['index']),
                                  self.sbml_network_editor.getY(compartment['referenceId'], compartment['index']),
                                  self.sbml_network_editor.getWidth(compartment['referenceId'], compartment['index']),
@@ -135,7 +276,9 @@ class NetworkInfoImportFromSBMLModel(NetworkInfoImportBase):
     def extract_species_features(self, species):
         if species['referenceId']:
             species['features'] = self.extract_go_general_features(species['referenceId'], species['index'])
-            species['texts'] = self.extract_go_text_features(species['referenceId'], species['index'])
+            species['texts'] = []
+            if self.is_feature_required("texts"):
+                species['texts'] = self.extract_go_text_features(species['referenceId'], species['index'])
             self.extract_extents(self.sbml_network_editor.getX(species['referenceId'], species['index']),
                                  self.sbml_network_editor.getY(species['referenceId'], species['index']),
                                  self.sbml_network_editor.getWidth(species['referenceId'], species['index']),
@@ -316,7 +459,8 @@ class NetworkInfoImportFromSBMLModel(NetworkInfoImportBase):
     def extract_graphical_shape_features(self, entity_id, graphical_object_index):
         graphical_shape_info = {}
         graphical_shape_info = self.extract_render_group_general_features(entity_id, graphical_object_index)
-        graphical_shape_info['geometricShapes'] = self.extract_render_group_geometric_shapes(entity_id, graphical_object_index)
+        if self.is_feature_required("geometricShapes"):
+            graphical_shape_info['geometricShapes'] = self.extract_render_group_geometric_shapes(entity_id, graphical_object_index)
 
         return graphical_shape_info
 
@@ -579,6 +723,9 @@ class NetworkInfoImportFromSBMLModel(NetworkInfoImportBase):
         # set shape
         curve_shape_info = {'shape': "renderCurve"}
 
+        if not self.is_feature_required("vertices"):
+            return curve_shape_info
+
         vertices_ = []
         for v_index in range(self.sbml_network_editor.getNumCurveSegments(entity_id, graphical_object_index)):
             vertex_ = {}
@@ -604,6 +751,9 @@ class NetworkInfoImportFromSBMLModel(NetworkInfoImportBase):
         # set shape
         curve_shape_info = {'shape': "renderCurve"}
 
+        if not self.is_feature_required("vertices"):
+            return curve_shape_info
+
         vertices_ = []
         for v_index in range(self.sbml_network_editor.getNumLineEndingCurveSegments(line_ending_id)):
             vertex_ = {}
@@ -875,6 +1025,9 @@ class NetworkInfoImportFromSBMLModel(NetworkInfoImportBase):
         if self.sbml_network_editor.isSetFillRule(entity_id, graphical_object_index):
             polygon_shape_info['fillRule'] = self.sbml_network_editor.getFillRule(entity_id, graphical_object_index)
 
+        if not self.is_feature_required("vertices"):
+            return polygon_shape_info
+
         vertices_ = []
         for v_index in range(self.sbml_network_editor.getGeometricShapeNumSegments(entity_id, graphical_object_index)):
             vertex_ = {}
@@ -907,6 +1060,9 @@ class NetworkInfoImportFromSBMLModel(NetworkInfoImportBase):
         if self.sbml_network_editor.isSetLineEndingFillRule(line_ending_id):
             polygon_shape_info['fillRule'] = self.sbml_network_editor.getLineEndingFillRule(line_ending_id)
 
+        if not self.is_feature_required("vertices"):
+            return polygon_shape_info
+
         vertices_ = []
         for v_index in range(self.sbml_network_editor.getLineEndingGeometricShapeNumSegments(line_ending_id)):
             vertex_ = {}
@@ -1,71 +1,107 @@
 from .import_base import NetworkInfoImportBase
+from ..native_objects import get_native_object_key
+from ..text_metrics import default_text_metrics
+import libsbne as sbne
+import math
 
 
 class NetworkInfoImportFromSBMLModelUsingLibSBNE(NetworkInfoImportBase):
     def __init__(self):
         super().__init__()
-        self.is_layout_modified = False
+        self.sbne = sbne
+        self.style_features = {}
 
     def extract_info(self, graph):
         super().extract_info(graph)
+        self.style_features = {}
 
-        sbml_document = sbne.ne_doc_readSBML(graph)
+        # the bindings are reached through self.sbne, so they can be wrapped for profiling
+        self.sbne = self.wrap_backend(sbne)
+        sbml_document = self.sbne.ne_doc_readSBML(graph)
         if sbml_document:
-            li = sbne.ne_doc_processLayoutInfo(sbml_document)
-            network = sbne.ne_li_getNetwork(li)
+            li = self.sbne.ne_doc_processLayoutInfo(sbml_document)
+            network = self.sbne.ne_li_getNetwork(li)
             if network:
                 # if layout is not specified
-                if not sbne.ne_net_isLayoutSpecified(network):
+                if not self.sbne.ne_net_isLayoutSpecified(network):
                     # implement layout algorithm
-                    sbne.ne_li_addLayoutFeaturesToNetowrk(li)
+                    self.sbne.ne_li_addLayoutFeaturesToNetowrk(li)
                     # set its flag to modified
                     self.is_layout_modified = True
                 # extract layout package info
-                self.extract_layout_package_info(network)
+                with self.stage("extract_layout_info"):
+                    self.extract_layout_package_info(network)
 
                 # render package info
-                ri = sbne.ne_doc_processRenderInfo(sbml_document)
-                veneer = sbne.ne_ri_getVeneer(ri)
+                ri = self.sbne.ne_doc_processRenderInfo(sbml_document)
+                veneer = self.sbne.ne_ri_getVeneer(ri)
                 # if render package is not specified
-                if not sbne.ne_ven_isRenderSpecified(veneer):
+                if not self.sbne.ne_ven_isRenderSpecified(veneer):
                     # implement render algorithm
-                    sbne.ne_ri_addDefaultRenderFeaturesToVeneer(ri)
+                    self.sbne.ne_ri_addDefaultRenderFeaturesToVeneer(ri)
                 # extract render package info
-                self.extract_render_package_info(veneer)
+                with self.stage("extract_render_info"):
+                    self.extract_render_package_info(veneer)
+
+                    # assign the render styles to each entity
+                    self.assign_entity_styles(veneer)
+
+    def release_native_objects(self):
+        # the handles into the libsbne document are dropped from the entities
+        for go in self.compartments + self.species + self.reactions:
+            self.release_go_native_objects(go)
+            for species_reference in go.get('speciesReferences', []):
+                self.release_go_native_objects(species_reference)
+        for color in self.colors:
+            color.pop('colorDefinition', None)
+        for gradient in self.gradients:
+            gradient.pop('gradientBase', None)
+            for stop in gradient.get('features', {}).get('stops', []):
+                stop.pop('gradientStop', None)
+        for line_ending in self.line_endings:
+            line_ending.pop('lineEnding', None)
+        self.style_features = {}
+        self.sbne = sbne
 
-                # assign the render styles to each entity
-                self.assign_entity_styles(veneer)
+    @staticmethod
+    def release_go_native_objects(go):
+        go.pop('glyphObject', None)
+        go.pop('style', None)
+        for text in go.get('texts', []):
+            text.pop('glyphObject', None)
+            text.pop('style', None)
+            text.pop('graphicalObject', None)
 
     def extract_layout_package_info(self, network):
-        if sbne.ne_net_isLayoutSpecified(network):
+        if self.sbne.ne_net_isLayoutSpecified(network):
             # get compartments info
-            for c_index in range(sbne.ne_net_getNumCompartments(network)):
-                self.add_compartment(network, sbne.ne_net_getCompartment(network, c_index))
+            for c_index in range(self.sbne.ne_net_getNumCompartments(network)):
+                self.add_compartment(network, self.sbne.ne_net_getCompartment(network, c_index))
 
             # get species info
-            for s_index in range(sbne.ne_net_getNumSpecies(network)):
-                self.add_species(network, sbne.ne_net_getSpecies(network, s_index))
+            for s_index in range(self.sbne.ne_net_getNumSpecies(network)):
+                self.add_species(network, self.sbne.ne_net_getSpecies(network, s_index))
 
             # get reactions info
-            for r_index in range(sbne.ne_net_getNumReactions(network)):
-                self.add_reaction(network, sbne.ne_net_getReaction(network, r_index))
+            for r_index in range(self.sbne.ne_net_getNumReactions(network)):
+                self.add_reaction(network, self.sbne.ne_net_getReaction(network, r_index))
 
     def extract_render_package_info(self, veneer):
-        if sbne.ne_ven_isRenderSpecified(veneer):
-            if sbne.ne_ven_isSetBackgroundColor(veneer):
-                self.background_color = sbne.ne_ven_getBackgroundColor(veneer)
+        if self.sbne.ne_ven_isRenderSpecified(veneer):
+            if self.sbne.ne_ven_isSetBackgroundColor(veneer):
+                self.background_color = self.sbne.ne_ven_getBackgroundColor(veneer)
 
             # get colors info
-            for c_index in range(sbne.ne_ven_getNumColors(veneer)):
-                self.add_color(sbne.ne_ven_getColor(veneer, c_index))
+            for c_index in range(self.sbne.ne_ven_getNumColors(veneer)):
+                self.add_color(self.sbne.ne_ven_getColor(veneer, c_index))
 
             # get gradients info
-            for g_index in range(sbne.ne_ven_getNumGradients(veneer)):
-                self.add_gradient(sbne.ne_ven_getGradient(veneer, g_index))
+            for g_index in range(self.sbne.ne_ven_getNumGradients(veneer)):
+                self.add_gradient(self.sbne.ne_ven_getGradient(veneer, g_index))
 
             # get line ending info
-            for le_index in range(sbne.ne_ven_getNumLineEndings(veneer)):
-                self.add_line_ending(sbne.ne_ven_getLineEnding(veneer, le_index))
+            for le_index in range(self.sbne.ne_ven_getNumLineEndings(veneer)):
+                self.add_line_ending(self.sbne.ne_ven_getLineEnding(veneer, le_index))
 
     def extract_extents(self, bounding_box):
         self.extents['minX'] = 0.0
@@ -73,17 +109,33 @@ class NetworkInfoImportFromSBMLModelUsingLibSBNE(NetworkInfoImportBase):
         self.extents['minY'] = 0.0
         self.extents['maxY'] = max(self.extents['maxY'], bounding_box['y'] + bounding_box['height'])
 
+    def supports_lazy_features(self):
+        return True
+
+    def extract_entity_extents(self):
+        # the extents are those of the compartments
+        for compartment in self.compartments:
+            bounding_box = self.extract_entity_bounding_box(compartment)
+            if bounding_box:
+                self.extract_extents(bounding_box)
+
+    def extract_entity_bounding_box(self, go):
+        if go.get('glyphObject') and self.sbne.ne_go_isSetBoundingBox(go['glyphObject']):
+            return self.extract_bounding_box_features(go['glyphObject'])
+
+        return None
+
     def add_compartment(self, network, compartment_object):
-        if sbne.ne_go_isSetGlyphId(compartment_object):
+        if self.sbne.ne_go_isSetGlyphId(compartment_object):
             compartment = self.extract_go_object_features(network, compartment_object)
             self.compartments.append(compartment)
 
     def add_species(self, network, species_object):
-        if sbne.ne_go_isSetGlyphId(species_object):
+        if self.sbne.ne_go_isSetGlyphId(species_object):
             species = self.extract_go_object_features(network, species_object)
 
             # set the compartment
-            s_compartment = sbne.ne_spc_getCompartment(species_object)
+            s_compartment = self.sbne.ne_spc_getCompartment(species_object)
             if s_compartment:
                 for c in self.compartments:
                     if s_compartment == c['referenceId']:
@@ -93,11 +145,11 @@ class NetworkInfoImportFromSBMLModelUsingLibSBNE(NetworkInfoImportBase):
             self.species.append(species)
 
     def add_reaction(self, network, reaction_object):
-        if sbne.ne_go_isSetGlyphId(reaction_object):
+        if self.sbne.ne_go_isSetGlyphId(reaction_object):
             reaction = self.extract_go_object_features(network, reaction_object)
 
             # set the compartment
-            r_compartment = sbne.ne_rxn_findCompartment(reaction_object)
+            r_compartment = self.sbne.ne_rxn_findCompartment(reaction_object)
             if r_compartment:
                 for c in self.compartments:
                     if r_compartment == c['referenceId']:
@@ -106,184 +158,185 @@ class NetworkInfoImportFromSBMLModelUsingLibSBNE(NetworkInfoImportBase):
 
             # species references
             reaction['speciesReferences'] = []
-            for sr_index in range(sbne.ne_rxn_getNumSpeciesReferences(reaction_object)):
-                species_reference_object = sbne.ne_rxn_getSpeciesReference(reaction_object, sr_index)
-                if sbne.ne_go_isSetGlyphId(species_reference_object):
+            for sr_index in range(self.sbne.ne_rxn_getNumSpeciesReferences(reaction_object)):
+                species_reference_object = self.sbne.ne_rxn_getSpeciesReference(reaction_object, sr_index)
+                if self.sbne.ne_go_isSetGlyphId(species_reference_object):
                     species_reference = self.extract_go_object_features(network, species_reference_object)
-                    if sbne.ne_sr_isSetSpecies(species_reference_object):
-                        species_reference['species'] = sbne.ne_ne_getId(sbne.ne_sr_getSpecies(species_reference_object))
+                    if self.sbne.ne_sr_isSetSpecies(species_reference_object):
+                        species_reference['species'] = self.sbne.ne_ne_getId(self.sbne.ne_sr_getSpecies(species_reference_object))
                         species_reference['speciesGlyph'] = \
-                            sbne.ne_go_getGlyphId(sbne.ne_sr_getSpecies(species_reference_object))
-                    if sbne.ne_sr_isSetRole(species_reference_object):
-                        species_reference['role'] = sbne.ne_sr_getRoleAsString(species_reference_object)
+                            self.sbne.ne_go_getGlyphId(self.sbne.ne_sr_getSpecies(species_reference_object))
+                    if self.sbne.ne_sr_isSetRole(species_reference_object):
+                        species_reference['role'] = self.sbne.ne_sr_getRoleAsString(species_reference_object)
                     reaction['speciesReferences'].append(species_reference)
 
             self.reactions.append(reaction)
 
     def add_color(self, color_object):
         color_ = {}
-        if sbne.ne_ve_isSetId(color_object):
+        if self.sbne.ne_ve_isSetId(color_object):
             color_['colorDefinition'] = color_object
-            color_['id'] = sbne.ne_ve_getId(color_object)
+            color_['id'] = self.sbne.ne_ve_getId(color_object)
             self.colors.append(color_)
 
     def add_gradient(self, gradient_object):
         gradient_ = {}
-        if sbne.ne_ve_isSetId(gradient_object):
+        if self.sbne.ne_ve_isSetId(gradient_object):
             gradient_['gradientBase'] = gradient_object
-            gradient_['id'] = sbne.ne_ve_getId(gradient_object)
+            gradient_['id'] = self.sbne.ne_ve_getId(gradient_object)
             self.gradients.append(gradient_)
 
     def add_line_ending(self, line_ending_object):
         line_ending_ = {}
-        if sbne.ne_ve_isSetId(line_ending_object):
+        if self.sbne.ne_ve_isSetId(line_ending_object):
             line_ending_['lineEnding'] = line_ending_object
-            line_ending_['id'] = sbne.ne_ve_getId(line_ending_object)
+            line_ending_['id'] = self.sbne.ne_ve_getId(line_ending_object)
             self.line_endings.append(line_ending_)
 
     def assign_entity_styles(self, veneer):
         # get compartments style from veneer
         for compartment in self.compartments:
-            compartment['style'] = sbne.ne_ven_findStyle(veneer, compartment['glyphObject'])
+            compartment['style'] = self.sbne.ne_ven_findStyle(veneer, compartment['glyphObject'])
 
             # get compartment text style from veneer
             if 'texts' in list(compartment.keys()):
                 for text in compartment['texts']:
                     if 'glyphObject' in list(text.keys()):
-                        text['style'] = sbne.ne_ven_findStyle(veneer, text['glyphObject'], sbne.ST_TYPE_COMP)
+                        text['style'] = self.sbne.ne_ven_findStyle(veneer, text['glyphObject'], self.sbne.ST_TYPE_COMP)
 
         # get species style from veneer
         for species in self.species:
-            species['style'] = sbne.ne_ven_findStyle(veneer, species['glyphObject'])
+            species['style'] = self.sbne.ne_ven_findStyle(veneer, species['glyphObject'])
 
             # get species text style from veneer
             if 'texts' in list(species.keys()):
                 for text in species['texts']:
                     if 'glyphObject' in list(text.keys()):
-                        text['style'] = sbne.ne_ven_findStyle(veneer, text['glyphObject'], sbne.ST_TYPE_TXT)
+                        text['style'] = self.sbne.ne_ven_findStyle(veneer, text['glyphObject'], self.sbne.ST_TYPE_TXT)
 
         # get reactions style from veneer
         for reaction in self.reactions:
-            reaction['style'] = sbne.ne_ven_findStyle(veneer, reaction['glyphObject'])
+            reaction['style'] = self.sbne.ne_ven_findStyle(veneer, reaction['glyphObject'])
 
             # get reaction text style from veneer
             if 'texts' in list(reaction.keys()):
                 for text in reaction['texts']:
                     if 'glyphObject' in list(text.keys()):
-                        text['style'] = sbne.ne_ven_findStyle(veneer, text['glyphObject'], sbne.ST_TYPE_TXT)
+                        text['style'] = self.sbne.ne_ven_findStyle(veneer, text['glyphObject'], self.sbne.ST_TYPE_TXT)
 
             # get species references style from veneer
             if 'speciesReferences' in list(reaction.keys()):
                 for species_reference in reaction['speciesReferences']:
-                    species_reference['style'] = sbne.ne_ven_findStyle(veneer,
+                    species_reference['style'] = self.sbne.ne_ven_findStyle(veneer,
                                                                        species_reference['glyphObject'])
 
     def extract_go_object_features(self, network, go_object):
-        features = {'glyphObject': go_object, 'referenceId': sbne.ne_ne_getId(go_object),
-                    'id': sbne.ne_go_getGlyphId(go_object)}
-        if sbne.ne_ne_isSetMetaId(go_object):
-            features['metaId'] = sbne.ne_ne_getMetaId(go_object)
+        features = {'glyphObject': go_object, 'referenceId': self.sbne.ne_ne_getId(go_object),
+                    'id': self.sbne.ne_go_getGlyphId(go_object)}
+        if self.sbne.ne_ne_isSetMetaId(go_object):
+            features['metaId'] = self.sbne.ne_ne_getMetaId(go_object)
         # text
         features['texts'] = []
-        for text_index in range(sbne.ne_go_getNumTexts(go_object)):
-            text_object = sbne.ne_go_getText(go_object, text_index)
-            if sbne.ne_go_isSetGlyphId(text_object):
+        for text_index in range(self.sbne.ne_go_getNumTexts(go_object)):
+            text_object = self.sbne.ne_go_getText(go_object, text_index)
+            if self.sbne.ne_go_isSetGlyphId(text_object):
                 features['texts'].append(self.extract_text_object_features(network, text_object))
         return features
 
-    @staticmethod
-    def extract_text_object_features(network, text_object):
-        text = {'glyphObject': text_object, 'id': sbne.ne_go_getGlyphId(text_object)}
-        if sbne.ne_gtxt_isSetGraphicalObjectId(text_object):
+    def extract_text_object_features(self, network, text_object):
+        text = {'glyphObject': text_object, 'id': self.sbne.ne_go_getGlyphId(text_object)}
+        if self.sbne.ne_gtxt_isSetGraphicalObjectId(text_object):
             text['graphicalObject'] = \
-                sbne.ne_net_getNetworkElement(network,
-                                              sbne.ne_gtxt_getGraphicalObjectId(text_object))
-        elif sbne.ne_gtxt_isSetOriginOfTextId(text_object):
+                self.sbne.ne_net_getNetworkElement(network,
+                                              self.sbne.ne_gtxt_getGraphicalObjectId(text_object))
+        elif self.sbne.ne_gtxt_isSetOriginOfTextId(text_object):
             text['graphicalObject'] = \
-                sbne.ne_net_getNetworkElement(network,
-                                              sbne.ne_gtxt_getOriginOfTextId(text_object))
+                self.sbne.ne_net_getNetworkElement(network,
+                                              self.sbne.ne_gtxt_getOriginOfTextId(text_object))
         return text
 
     def extract_compartment_features(self, compartment):
         compartment['features'] = self.extract_go_general_features(compartment)
-        if compartment['glyphObject'] and sbne.ne_go_isSetBoundingBox(compartment['glyphObject']):
+        if compartment['glyphObject'] and self.sbne.ne_go_isSetBoundingBox(compartment['glyphObject']):
             self.extract_extents(compartment['features']['boundingBox'])
 
     def extract_species_features(self, species):
         species['features'] = self.extract_go_general_features(species)
-        if species['glyphObject'] and 'text' in list(species.keys()) and self.is_layout_modified:
-            self.fit_text_to_bbox(species['text']['features'])
+        if species['glyphObject'] and 'texts' in list(species.keys()) and self.is_layout_modified:
+            for text in species['texts']:
+                if 'features' in list(text.keys()):
+                    self.fit_text_to_bbox(text['features'])
 
     def extract_reaction_features(self, reaction):
         reaction['features'] = self.extract_go_general_features(reaction)
         if reaction['glyphObject']:
             # get curve features
-            if sbne.ne_rxn_isSetCurve(reaction['glyphObject']):
-                crv = sbne.ne_rxn_getCurve(reaction['glyphObject'])
+            if self.sbne.ne_rxn_isSetCurve(reaction['glyphObject']):
+                crv = self.sbne.ne_rxn_getCurve(reaction['glyphObject'])
 
-                if sbne.ne_crv_getNumElements(crv):
+                if self.sbne.ne_crv_getNumElements(crv):
                     curve_ = []
-                    for e_index in range(sbne.ne_crv_getNumElements(crv)):
-                        element = sbne.ne_crv_getElement(crv, e_index)
-                        start_point = sbne.ne_ls_getStart(element)
-                        end_point = sbne.ne_ls_getEnd(element)
+                    for e_index in range(self.sbne.ne_crv_getNumElements(crv)):
+                        element = self.sbne.ne_crv_getElement(crv, e_index)
+                        start_point = self.sbne.ne_ls_getStart(element)
+                        end_point = self.sbne.ne_ls_getEnd(element)
                         if start_point and end_point:
-                            element_ = {'startX': sbne.ne_point_getX(start_point),
-                                        'startY': sbne.ne_point_getY(start_point),
-                                        'endX': sbne.ne_point_getX(end_point),
-                                        'endY': sbne.ne_point_getY(end_point)}
-                            if sbne.ne_ls_isCubicBezier(element):
-                                base_point1 = sbne.ne_cb_getBasePoint1(element)
-                                base_point2 = sbne.ne_cb_getBasePoint2(element)
+                            element_ = {'startX': self.sbne.ne_point_getX(start_point),
+                                        'startY': self.sbne.ne_point_getY(start_point),
+                                        'endX': self.sbne.ne_point_getX(end_point),
+                                        'endY': self.sbne.ne_point_getY(end_point)}
+                            if self.sbne.ne_ls_isCubicBezier(element):
+                                base_point1 = self.sbne.ne_cb_getBasePoint1(element)
+                                base_point2 = self.sbne.ne_cb_getBasePoint2(element)
                                 if base_point1 and base_point2:
-                                    element_["basePoint1X"] = sbne.ne_point_getX(base_point1)
-                                    element_["basePoint1Y"] = sbne.ne_point_getY(base_point1)
-                                    element_["basePoint2X"] = sbne.ne_point_getX(base_point2)
-                                    element_["basePoint1Y"] = sbne.ne_point_getY(base_point2)
+                                    element_["basePoint1X"] = self.sbne.ne_point_getX(base_point1)
+                                    element_["basePoint1Y"] = self.sbne.ne_point_getY(base_point1)
+                                    element_["basePoint2X"] = self.sbne.ne_point_getX(base_point2)
+                                    element_["basePoint1Y"] = self.sbne.ne_point_getY(base_point2)
                             curve_.append(element_)
                     reaction['features']['curve'] = curve_
 
                     # get extent box
-                    bbox = sbne.ne_rxn_getExtentBox(reaction['glyphObject'])
+                    bbox = self.sbne.ne_rxn_getExtentBox(reaction['glyphObject'])
                     if bbox:
                         reaction['features']['boundingBox'] = {
-                            'x': sbne.ne_bb_getX(bbox) + 0.5 * sbne.ne_bb_getWidth(bbox),
-                            'y': sbne.ne_bb_getY(bbox) + 0.5 * sbne.ne_bb_getHeight(bbox),
+                            'x': self.sbne.ne_bb_getX(bbox) + 0.5 * self.sbne.ne_bb_getWidth(bbox),
+                            'y': self.sbne.ne_bb_getY(bbox) + 0.5 * self.sbne.ne_bb_getHeight(bbox),
                             'width': 15.0,
                             'height': 15.0}
 
             # get group features
-            if 'style' in list(reaction.keys()) and sbne.ne_stl_isSetGroup(reaction['style']):
-                if 'curve' in list(reaction['features'].keys()):
-                    reaction['features']['graphicalCurve'] = \
-                        self.extract_curve_features(sbne.ne_stl_getGroup(reaction['style']))
+            if 'style' in list(reaction.keys()) and 'curve' in list(reaction['features'].keys()):
+                curve_features = self.extract_style_features(reaction['style'], self.extract_curve_features)
+                if curve_features is not None:
+                    reaction['features']['graphicalCurve'] = curve_features
 
     def extract_species_reference_features(self, species_reference):
         species_reference['features'] = {}
         if species_reference['glyphObject']:
             # get curve features
-            if sbne.ne_sr_isSetCurve(species_reference['glyphObject']):
-                crv = sbne.ne_sr_getCurve(species_reference['glyphObject'])
+            if self.sbne.ne_sr_isSetCurve(species_reference['glyphObject']):
+                crv = self.sbne.ne_sr_getCurve(species_reference['glyphObject'])
 
-                if sbne.ne_crv_getNumElements(crv):
+                if self.sbne.ne_crv_getNumElements(crv):
                     curve_ = []
-                    for e_index in range(sbne.ne_crv_getNumElements(crv)):
-                        element = sbne.ne_crv_getElement(crv, e_index)
-                        start_point = sbne.ne_ls_getStart(element)
-                        end_point = sbne.ne_ls_getEnd(element)
+                    for e_index in range(self.sbne.ne_crv_getNumElements(crv)):
+                        element = self.sbne.ne_crv_getElement(crv, e_index)
+                        start_point = self.sbne.ne_ls_getStart(element)
+                        end_point = self.sbne.ne_ls_getEnd(element)
                         if start_point and end_point:
-                            element_ = {'startX': sbne.ne_point_getX(start_point),
-                                        'startY': sbne.ne_point_getY(start_point),
-                                        'endX': sbne.ne_point_getX(end_point),
-                                        'endY': sbne.ne_point_getY(end_point)}
-                            if sbne.ne_ls_isCubicBezier(element):
-                                base_point1 = sbne.ne_cb_getBasePoint1(element)
-                                base_point2 = sbne.ne_cb_getBasePoint2(element)
+                            element_ = {'startX': self.sbne.ne_point_getX(start_point),
+                                        'startY': self.sbne.ne_point_getY(start_point),
+                                        'endX': self.sbne.ne_point_getX(end_point),
+                                        'endY': self.sbne.ne_point_getY(end_point)}
+                            if self.sbne.ne_ls_isCubicBezier(element):
+                                base_point1 = self.sbne.ne_cb_getBasePoint1(element)
+                                base_point2 = self.sbne.ne_cb_getBasePoint2(element)
                                 if base_point1 and base_point2:
-                                    element_['basePoint1X'] = sbne.ne_point_getX(base_point1)
-                                    element_['basePoint1Y'] = sbne.ne_point_getY(base_point1)
-                                    element_['basePoint2X'] = sbne.ne_point_getX(base_point2)
-                                    element_['basePoint2Y'] = sbne.ne_point_getY(base_point2)
+                                    element_['basePoint1X'] = self.sbne.ne_point_getX(base_point1)
+                                    element_['basePoint1Y'] = self.sbne.ne_point_getY(base_point1)
+                                    element_['basePoint2X'] = self.sbne.ne_point_getX(base_point2)
+                                    element_['basePoint2Y'] = self.sbne.ne_point_getY(base_point2)
 
                             # set start point and slope
                             if e_index == 0:
@@ -303,7 +356,7 @@ class NetworkInfoImportFromSBMLModelUsingLibSBNE(NetworkInfoImportBase):
                                                    element_['startX'] - element_['endX'])
 
                             # set end point and slope
-                            if e_index == sbne.ne_crv_getNumElements(crv) - 1:
+                            if e_index == self.sbne.ne_crv_getNumElements(crv) - 1:
                                 species_reference['features']['endPoint'] = {'x': element_['endX'],
                                                                              'y': element_['endY']}
 
@@ -322,312 +375,330 @@ class NetworkInfoImportFromSBMLModelUsingLibSBNE(NetworkInfoImportBase):
                     species_reference['features']['curve'] = curve_
 
             # get group features
-            if 'style' in list(species_reference.keys()) and sbne.ne_stl_isSetGroup(species_reference['style']):
-                species_reference['features']['graphicalCurve'] = \
-                    self.extract_curve_features(sbne.ne_stl_getGroup(species_reference['style']))
+            if 'style' in list(species_reference.keys()):
+                curve_features = self.extract_style_features(species_reference['style'], self.extract_curve_features)
+                if curve_features is not None:
+                    species_reference['features']['graphicalCurve'] = curve_features
 
     def extract_go_general_features(self, go):
         features = {}
         if go['glyphObject']:
             # get bounding box features
-            if sbne.ne_go_isSetBoundingBox(go['glyphObject']):
+            if self.sbne.ne_go_isSetBoundingBox(go['glyphObject']):
                 features['boundingBox'] = self.extract_bounding_box_features(go['glyphObject'])
 
             # get group features
-            if 'style' in list(go.keys()) and sbne.ne_stl_isSetGroup(go['style']):
-                features['graphicalShape'] = \
-                    self.extract_graphical_shape_features(sbne.ne_stl_getGroup(go['style']))
+            if 'style' in list(go.keys()):
+                graphical_shape = self.extract_style_features(go['style'], self.extract_graphical_shape_features)
+                if graphical_shape is not None:
+                    features['graphicalShape'] = graphical_shape
 
             # get text features
             if 'texts' in list(go.keys()):
-                for text in go['texts']:
-                    text['features'] = self.extract_go_text_features(text)
+                if self.is_feature_required("texts"):
+                    for text in go['texts']:
+                        text['features'] = self.extract_go_text_features(text)
+                else:
+                    go['texts'] = []
         return features
 
     def extract_go_text_features(self, text):
         text_features = {}
         # get plain text
-        if sbne.ne_gtxt_isSetPlainText(text['glyphObject']):
-            text_features['plainText'] = sbne.ne_gtxt_getPlainText(text['glyphObject'])
+        if self.sbne.ne_gtxt_isSetPlainText(text['glyphObject']):
+            text_features['plainText'] = self.sbne.ne_gtxt_getPlainText(text['glyphObject'])
         elif 'graphicalObject' in list(text.keys()):
-            if sbne.ne_ne_isSetName(text['graphicalObject']):
-                text_features['text-name'] = sbne.ne_ne_getName(text['graphicalObject'])
-            if sbne.ne_ne_isSetId(text['graphicalObject']):
-                text_features['text-id'] = sbne.ne_ne_getId(text['graphicalObject'])
+            if self.sbne.ne_ne_isSetName(text['graphicalObject']):
+                text_features['text-name'] = self.sbne.ne_ne_getName(text['graphicalObject'])
+            if self.sbne.ne_ne_isSetId(text['graphicalObject']):
+                text_features['text-id'] = self.sbne.ne_ne_getId(text['graphicalObject'])
         if 'plainText' not in list(text_features.keys()):
             if 'text-name' in list(text_features.keys()):
                 text_features['plainText'] = text_features['text-name']
             elif 'text-id' in list(text_features.keys()):
                 text_features['plainText'] = text_features['text-id']
         # get bounding box features of the text glyph
-        if sbne.ne_go_isSetBoundingBox(text['glyphObject']):
+        if self.sbne.ne_go_isSetBoundingBox(text['glyphObject']):
             text_features['boundingBox'] = self.extract_bounding_box_features(text['glyphObject'])
 
         # get group features
-        if 'style' in list(text.keys()) \
-                and sbne.ne_stl_isSetGroup(text['style']):
-            text_features['graphicalText'] = self.extract_text_features(sbne.ne_stl_getGroup(text['style']))
+        if 'style' in list(text.keys()):
+            graphical_text = self.extract_style_features(text['style'], self.extract_text_features)
+            if graphical_text is not None:
+                text_features['graphicalText'] = graphical_text
         return text_features
 
-    @staticmethod
-    def extract_color_features(color):
+    def extract_style_features(self, style, extract_group_features):
+        # the glyphs sharing a style share its features, so the render group of each style is only read once
+        style_key = (extract_group_features.__name__, get_native_object_key(style),
+                     None if self.required_features is None else tuple(sorted(self.required_features)))
+        if style_key not in self.style_features:
+            group_features = None
+            if self.sbne.ne_stl_isSetGroup(style):
+                group_features = extract_group_features(self.sbne.ne_stl_getGroup(style))
+            self.style_features[style_key] = group_features
+
+        # each glyph gets a shallow copy of its own, so setting a feature of one does not change the others, while
+        # the nested features are shared and are replaced rather than edited in place
+        if self.style_features[style_key] is None:
+            return None
+
+        return dict(self.style_features[style_key])
+
+    def extract_color_features(self, color):
         color['features'] = {}
         if color['colorDefinition']:
             # get color value
-            if sbne.ne_clr_isSetValue(color['colorDefinition']):
-                color['features']['value'] = sbne.ne_clr_getValue(color['colorDefinition'])
+            if self.sbne.ne_clr_isSetValue(color['colorDefinition']):
+                color['features']['value'] = self.sbne.ne_clr_getValue(color['colorDefinition'])
 
-    @staticmethod
-    def extract_gradient_features(gradient):
+    def extract_gradient_features(self, gradient):
         gradient['features'] = {}
         if gradient['gradientBase']:
             # get spread method
-            if sbne.ne_grd_isSetSpreadMethod(gradient['gradientBase']):
-                gradient['features']['spreadMethod'] = sbne.ne_grd_getSpreadMethod(gradient['gradientBase'])
+            if self.sbne.ne_grd_isSetSpreadMethod(gradient['gradientBase']):
+                gradient['features']['spreadMethod'] = self.sbne.ne_grd_getSpreadMethod(gradient['gradientBase'])
 
             # get gradient stops
             stops_ = []
-            for s_index in range(sbne.ne_grd_getNumStops(gradient['gradientBase'])):
-                stop_ = {'gradientStop': sbne.ne_grd_getStop(gradient['gradientBase'], s_index)}
+            for s_index in range(self.sbne.ne_grd_getNumStops(gradient['gradientBase'])):
+                stop_ = {'gradientStop': self.sbne.ne_grd_getStop(gradient['gradientBase'], s_index)}
 
                 # get offset
-                if sbne.ne_gstp_isSetOffset(stop_['gradientStop']):
+                if self.sbne.ne_gstp_isSetOffset(stop_['gradientStop']):
                     stop_['offset'] = \
-                        {'abs': 0, 'rel': sbne.ne_rav_getRelativeValue(sbne.ne_gstp_getOffset(stop_['gradientStop']))}
+                        {'abs': 0, 'rel': self.sbne.ne_rav_getRelativeValue(self.sbne.ne_gstp_getOffset(stop_['gradientStop']))}
 
                 # get stop color
-                if sbne.ne_gstp_isSetColor(stop_['gradientStop']):
-                    stop_['color'] = sbne.ne_gstp_getColor(stop_['gradientStop'])
+                if self.sbne.ne_gstp_isSetColor(stop_['gradientStop']):
+                    stop_['color'] = self.sbne.ne_gstp_getColor(stop_['gradientStop'])
 
                 stops_.append(stop_)
 
             gradient['features']['stops'] = stops_
 
             # for linear gradient
-            if sbne.ne_grd_isLinearGradient(gradient['gradientBase']):
+            if self.sbne.ne_grd_isLinearGradient(gradient['gradientBase']):
                 # get start
                 gradient['features']['start'] = \
                     {'x': {'abs':
-                               sbne.ne_rav_getAbsoluteValue(sbne.ne_grd_getX1(gradient['gradientBase'])),
+                               self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_grd_getX1(gradient['gradientBase'])),
                            'rel':
-                               sbne.ne_rav_getRelativeValue(sbne.ne_grd_getX1(gradient['gradientBase']))},
+                               self.sbne.ne_rav_getRelativeValue(self.sbne.ne_grd_getX1(gradient['gradientBase']))},
                      'y': {'abs':
-                               sbne.ne_rav_getAbsoluteValue(sbne.ne_grd_getY1(gradient['gradientBase'])),
+                               self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_grd_getY1(gradient['gradientBase'])),
                            'rel':
-                               sbne.ne_rav_getRelativeValue(sbne.ne_grd_getY1(gradient['gradientBase']))}}
+                               self.sbne.ne_rav_getRelativeValue(self.sbne.ne_grd_getY1(gradient['gradientBase']))}}
 
                 # get end
                 gradient['features']['end'] = \
                     {'x': {'abs':
-                               sbne.ne_rav_getAbsoluteValue(sbne.ne_grd_getX2(gradient['gradientBase'])),
+                               self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_grd_getX2(gradient['gradientBase'])),
                            'rel':
-                               sbne.ne_rav_getRelativeValue(sbne.ne_grd_getX2(gradient['gradientBase']))},
+                               self.sbne.ne_rav_getRelativeValue(self.sbne.ne_grd_getX2(gradient['gradientBase']))},
                      'y': {'abs':
-                               sbne.ne_rav_getAbsoluteValue(sbne.ne_grd_getY2(gradient['gradientBase'])),
+                               self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_grd_getY2(gradient['gradientBase'])),
                            'rel':
-                               sbne.ne_rav_getRelativeValue(sbne.ne_grd_getY2(gradient['gradientBase']))}}
+                               self.sbne.ne_rav_getRelativeValue(self.sbne.ne_grd_getY2(gradient['gradientBase']))}}
 
             # for radial gradient
-            elif sbne.ne_grd_isLinearGradient(gradient['gradientBase']):
+            elif self.sbne.ne_grd_isLinearGradient(gradient['gradientBase']):
                 # get center
                 gradient['features']['center'] = \
                     {'x': {'abs':
-                               sbne.ne_rav_getAbsoluteValue(sbne.ne_grd_getCx(gradient['gradientBase'])),
+                               self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_grd_getCx(gradient['gradientBase'])),
                            'rel':
-                               sbne.ne_rav_getRelativeValue(sbne.ne_grd_getCx(gradient['gradientBase']))},
+                               self.sbne.ne_rav_getRelativeValue(self.sbne.ne_grd_getCx(gradient['gradientBase']))},
                      'y': {'abs':
-                               sbne.ne_rav_getAbsoluteValue(sbne.ne_grd_getCy(gradient['gradientBase'])),
+                               self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_grd_getCy(gradient['gradientBase'])),
                            'rel':
-                               sbne.ne_rav_getRelativeValue(sbne.ne_grd_getCy(gradient['gradientBase']))}}
+                               self.sbne.ne_rav_getRelativeValue(self.sbne.ne_grd_getCy(gradient['gradientBase']))}}
 
                 # get focal
                 gradient['features']['focalPoint'] = \
                     {'x': {'abs':
-                               sbne.ne_rav_getAbsoluteValue(sbne.ne_grd_getFx(gradient['gradientBase'])),
+                               self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_grd_getFx(gradient['gradientBase'])),
                            'rel':
-                               sbne.ne_rav_getRelativeValue(sbne.ne_grd_getFx(gradient['gradientBase']))},
+                               self.sbne.ne_rav_getRelativeValue(self.sbne.ne_grd_getFx(gradient['gradientBase']))},
                      'y': {'abs':
-                               sbne.ne_rav_getAbsoluteValue(sbne.ne_grd_getFy(gradient['gradientBase'])),
+                               self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_grd_getFy(gradient['gradientBase'])),
                            'rel':
-                               sbne.ne_rav_getRelativeValue(sbne.ne_grd_getFy(gradient['gradientBase']))}}
+                               self.sbne.ne_rav_getRelativeValue(self.sbne.ne_grd_getFy(gradient['gradientBase']))}}
 
                 # get radius
                 gradient['features']['radius'] = \
-                    {'abs': sbne.ne_rav_getAbsoluteValue(sbne.ne_grd_getR(gradient['gradientBase'])),
-                     'rel': sbne.ne_rav_getRelativeValue(sbne.ne_grd_getR(gradient['gradientBase']))}
+                    {'abs': self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_grd_getR(gradient['gradientBase'])),
+                     'rel': self.sbne.ne_rav_getRelativeValue(self.sbne.ne_grd_getR(gradient['gradientBase']))}
 
     def extract_line_ending_features(self, line_ending):
         line_ending['features'] = {}
         if line_ending['lineEnding']:
             # get bounding box features
-            if sbne.ne_le_isSetBoundingBox(line_ending['lineEnding']):
-                bbox = sbne.ne_le_getBoundingBox(line_ending['lineEnding'])
-                line_ending['features']['boundingBox'] = {'x': sbne.ne_bb_getX(bbox), 'y': sbne.ne_bb_getY(bbox),
-                                                          'width': sbne.ne_bb_getWidth(bbox),
-                                                          'height': sbne.ne_bb_getHeight(bbox)}
+            if self.sbne.ne_le_isSetBoundingBox(line_ending['lineEnding']):
+                bbox = self.sbne.ne_le_getBoundingBox(line_ending['lineEnding'])
+                line_ending['features']['boundingBox'] = {'x': self.sbne.ne_bb_getX(bbox), 'y': self.sbne.ne_bb_getY(bbox),
+                                                          'width': self.sbne.ne_bb_getWidth(bbox),
+                                                          'height': self.sbne.ne_bb_getHeight(bbox)}
 
             # get group features
-            if sbne.ne_le_isSetGroup(line_ending['lineEnding']):
+            if self.sbne.ne_le_isSetGroup(line_ending['lineEnding']):
                 line_ending['features']['graphicalShape'] = \
-                    self.extract_graphical_shape_features(sbne.ne_le_getGroup(line_ending['lineEnding']))
+                    self.extract_graphical_shape_features(self.sbne.ne_le_getGroup(line_ending['lineEnding']))
 
             # get enable rotation
-            if sbne.ne_le_isSetEnableRotation(line_ending['lineEnding']):
-                line_ending['features']['enableRotation'] = sbne.ne_le_getEnableRotation(line_ending['lineEnding'])
+            if self.sbne.ne_le_isSetEnableRotation(line_ending['lineEnding']):
+                line_ending['features']['enableRotation'] = self.sbne.ne_le_getEnableRotation(line_ending['lineEnding'])
 
     def extract_graphical_shape_features(self, group):
         graphical_shape_info = {}
         if group:
             graphical_shape_info = self.extract_render_group_general_features(group)
-            graphical_shape_info['geometricShapes'] = self.extract_render_group_geometric_shapes(group)
+            if self.is_feature_required("geometricShapes"):
+                graphical_shape_info['geometricShapes'] = self.extract_render_group_geometric_shapes(group)
         return graphical_shape_info
 
-    @staticmethod
-    def extract_render_group_general_features(group):
+    def extract_render_group_general_features(self, group):
         render_group_general_features = {}
         # get stroke color
-        if sbne.ne_grp_isSetStrokeColor(group):
-            render_group_general_features['strokeColor'] = sbne.ne_grp_getStrokeColor(group)
+        if self.sbne.ne_grp_isSetStrokeColor(group):
+            render_group_general_features['strokeColor'] = self.sbne.ne_grp_getStrokeColor(group)
 
         # get stroke width
-        if sbne.ne_grp_isSetStrokeWidth(group):
-            render_group_general_features['strokeWidth'] = sbne.ne_grp_getStrokeWidth(group)
+        if self.sbne.ne_grp_isSetStrokeWidth(group):
+            render_group_general_features['strokeWidth'] = self.sbne.ne_grp_getStrokeWidth(group)
 
         # get stroke dash array
-        if sbne.ne_grp_isSetStrokeDashArray(group):
+        if self.sbne.ne_grp_isSetStrokeDashArray(group):
             dash_array = []
-            for d_index in range(sbne.ne_grp_getNumStrokeDashes(group)):
-                dash_array.append(sbne.ne_grp_getStrokeDash(group, d_index))
+            for d_index in range(self.sbne.ne_grp_getNumStrokeDashes(group)):
+                dash_array.append(self.sbne.ne_grp_getStrokeDash(group, d_index))
             render_group_general_features['strokeDashArray'] = tuple(dash_array)
 
         # get fill color
-        if sbne.ne_grp_isSetFillColor(group):
-            render_group_general_features['fillColor'] = sbne.ne_grp_getFillColor(group)
+        if self.sbne.ne_grp_isSetFillColor(group):
+            render_group_general_features['fillColor'] = self.sbne.ne_grp_getFillColor(group)
 
         # get fill rule
-        if sbne.ne_grp_isSetFillRule(group):
-            render_group_general_features['fillRule'] = sbne.ne_grp_getFillRule(group)
+        if self.sbne.ne_grp_isSetFillRule(group):
+            render_group_general_features['fillRule'] = self.sbne.ne_grp_getFillRule(group)
         return render_group_general_features
 
     def extract_render_group_geometric_shapes(self, group):
         geometric_shapes = []
-        if sbne.ne_grp_getNumGeometricShapes(group):
-            for gs_index in range(sbne.ne_grp_getNumGeometricShapes(group)):
-                gs = sbne.ne_grp_getGeometricShape(group, gs_index)
+        if self.sbne.ne_grp_getNumGeometricShapes(group):
+            for gs_index in range(self.sbne.ne_grp_getNumGeometricShapes(group)):
+                gs = self.sbne.ne_grp_getGeometricShape(group, gs_index)
                 geometric_shape = {}
                 geometric_shape.update(self.extract_geometric_shape_general_features(gs))
                 geometric_shape.update(self.extract_geometric_shape_exclusive_features(gs))
                 geometric_shapes.append(geometric_shape)
         return geometric_shapes
 
-    @staticmethod
-    def extract_geometric_shape_general_features(gs):
+    def extract_geometric_shape_general_features(self, gs):
         geometric_shape_general_features = {}
         # get stroke color
-        if sbne.ne_gs_isSetStrokeColor(gs):
-            geometric_shape_general_features['strokeColor'] = sbne.ne_gs_getStrokeColor(gs)
+        if self.sbne.ne_gs_isSetStrokeColor(gs):
+            geometric_shape_general_features['strokeColor'] = self.sbne.ne_gs_getStrokeColor(gs)
 
         # get stroke width
-        if sbne.ne_gs_isSetStrokeWidth(gs):
-            geometric_shape_general_features['strokeWidth'] = sbne.ne_gs_getStrokeWidth(gs)
+        if self.sbne.ne_gs_isSetStrokeWidth(gs):
+            geometric_shape_general_features['strokeWidth'] = self.sbne.ne_gs_getStrokeWidth(gs)
 
         # get stroke dash array
-        if sbne.ne_gs_isSetStrokeDashArray(gs):
+        if self.sbne.ne_gs_isSetStrokeDashArray(gs):
             dash_array = []
-            for d_index in range(sbne.ne_gs_getNumStrokeDashes(gs)):
-                dash_array.append(sbne.ne_gs_getStrokeDash(gs, d_index))
+            for d_index in range(self.sbne.ne_gs_getNumStrokeDashes(gs)):
+                dash_array.append(self.sbne.ne_gs_getStrokeDash(gs, d_index))
             geometric_shape_general_features['strokeDashArray'] = tuple(dash_array)
         return geometric_shape_general_features
 
     def extract_geometric_shape_exclusive_features(self, gs):
-        if sbne.ne_gs_getShape(gs) == 0:
+        if self.sbne.ne_gs_getShape(gs) == 0:
             return self.extract_image_shape_features(gs)
-        elif sbne.ne_gs_getShape(gs) == 1:
+        elif self.sbne.ne_gs_getShape(gs) == 1:
             return self.extract_curve_shape_features(gs)
-        elif sbne.ne_gs_getShape(gs) == 2:
+        elif self.sbne.ne_gs_getShape(gs) == 2:
             return self.extract_text_shape_features(gs)
-        elif sbne.ne_gs_getShape(gs) == 3:
+        elif self.sbne.ne_gs_getShape(gs) == 3:
             return self.extract_rectangle_shape_features(gs)
-        elif sbne.ne_gs_getShape(gs) == 4:
+        elif self.sbne.ne_gs_getShape(gs) == 4:
             return self.extract_ellipse_shape_features(gs)
-        elif sbne.ne_gs_getShape(gs) == 5:
+        elif self.sbne.ne_gs_getShape(gs) == 5:
             return self.extract_polygon_shape_features(gs)
 
-    @staticmethod
-    def extract_curve_features(group):
+    def extract_curve_features(self, group):
         curve_info = {}
         if group:
             # get stroke color
-            if sbne.ne_grp_isSetStrokeColor(group):
-                curve_info['strokeColor'] = sbne.ne_grp_getStrokeColor(group)
+            if self.sbne.ne_grp_isSetStrokeColor(group):
+                curve_info['strokeColor'] = self.sbne.ne_grp_getStrokeColor(group)
 
             # get stroke width
-            if sbne.ne_grp_isSetStrokeWidth(group):
-                curve_info['strokeWidth'] = sbne.ne_grp_getStrokeWidth(group)
+            if self.sbne.ne_grp_isSetStrokeWidth(group):
+                curve_info['strokeWidth'] = self.sbne.ne_grp_getStrokeWidth(group)
 
             # get stroke dash array
-            if sbne.ne_grp_isSetStrokeDashArray(group):
+            if self.sbne.ne_grp_isSetStrokeDashArray(group):
                 dash_array = []
-                for d_index in range(sbne.ne_grp_getNumStrokeDashes(group)):
-                    dash_array.append(sbne.ne_grp_getStrokeDash(group, d_index))
+                for d_index in range(self.sbne.ne_grp_getNumStrokeDashes(group)):
+                    dash_array.append(self.sbne.ne_grp_getStrokeDash(group, d_index))
                 curve_info['strokeDashArray'] = tuple(dash_array)
 
             # get heads
             heads_ = {}
-            if sbne.ne_grp_isSetStartHead(group):
-                heads_['start'] = sbne.ne_grp_getStartHead(group)
-            if sbne.ne_grp_isSetEndHead(group):
-                heads_['end'] = sbne.ne_grp_getEndHead(group)
+            if self.sbne.ne_grp_isSetStartHead(group):
+                heads_['start'] = self.sbne.ne_grp_getStartHead(group)
+            if self.sbne.ne_grp_isSetEndHead(group):
+                heads_['end'] = self.sbne.ne_grp_getEndHead(group)
             if heads_:
                 curve_info['heads'] = heads_
         return curve_info
 
-    @staticmethod
-    def extract_text_features(group):
+    def extract_text_features(self, group):
         text_info = {}
         if group:
             # get stroke color
-            if sbne.ne_grp_isSetStrokeColor(group):
-                text_info['strokeColor'] = sbne.ne_grp_getStrokeColor(group)
+            if self.sbne.ne_grp_isSetStrokeColor(group):
+                text_info['strokeColor'] = self.sbne.ne_grp_getStrokeColor(group)
 
             # get font family
-            if sbne.ne_grp_isSetFontFamily(group):
-                text_info['fontFamily'] = sbne.ne_grp_getFontFamily(group)
+            if self.sbne.ne_grp_isSetFontFamily(group):
+                text_info['fontFamily'] = self.sbne.ne_grp_getFontFamily(group)
 
             # get font size
-            if sbne.ne_grp_isSetFontSize(group):
-                rel_abs_vec = sbne.ne_grp_getFontSize(group)
-                text_info['fontSize'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                         'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+            if self.sbne.ne_grp_isSetFontSize(group):
+                rel_abs_vec = self.sbne.ne_grp_getFontSize(group)
+                text_info['fontSize'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                         'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
             # get font weight
-            if sbne.ne_grp_isSetFontWeight(group):
-                text_info['fontWeight'] = sbne.ne_grp_getFontWeight(group)
+            if self.sbne.ne_grp_isSetFontWeight(group):
+                text_info['fontWeight'] = self.sbne.ne_grp_getFontWeight(group)
 
             # get font style
-            if sbne.ne_grp_isSetFontStyle(group):
-                text_info['fontStyle'] = sbne.ne_grp_getFontStyle(group)
+            if self.sbne.ne_grp_isSetFontStyle(group):
+                text_info['fontStyle'] = self.sbne.ne_grp_getFontStyle(group)
 
             # get horizontal text anchor
-            if sbne.ne_grp_isSetHTextAnchor(group):
-                text_info['hTextAnchor'] = sbne.ne_grp_getHTextAnchor(group)
+            if self.sbne.ne_grp_isSetHTextAnchor(group):
+                text_info['hTextAnchor'] = self.sbne.ne_grp_getHTextAnchor(group)
 
             # get vertical text anchor
-            if sbne.ne_grp_isSetVTextAnchor(group):
-                text_info['vTextAnchor'] = sbne.ne_grp_getVTextAnchor(group)
+            if self.sbne.ne_grp_isSetVTextAnchor(group):
+                text_info['vTextAnchor'] = self.sbne.ne_grp_getVTextAnchor(group)
 
             # get geometric shapes
-            if sbne.ne_grp_getNumGeometricShapes(group):
+            if self.sbne.ne_grp_getNumGeometricShapes(group):
                 geometric_shapes = []
-                for gs_index in range(sbne.ne_grp_getNumGeometricShapes(group)):
-                    gs = sbne.ne_grp_getGeometricShape(group, gs_index)
+                for gs_index in range(self.sbne.ne_grp_getNumGeometricShapes(group)):
+                    gs = self.sbne.ne_grp_getGeometricShape(group, gs_index)
 
-                    if sbne.ne_gs_getShape(gs) == 1:
+                    if self.sbne.ne_gs_getShape(gs) == 1:
                         geometric_shape_features = {}
 
                         # get stroke color
-                        if sbne.ne_gs_isSetStrokeColor(gs):
-                            geometric_shape_features['strokeColor'] = sbne.ne_gs_getStrokeColor(gs)
+                        if self.sbne.ne_gs_isSetStrokeColor(gs):
+                            geometric_shape_features['strokeColor'] = self.sbne.ne_gs_getStrokeColor(gs)
 
                         # get geometric shape specific features
                         get_geometric_shape_exclusive_features(gs, geometric_shape_features)
@@ -636,270 +707,269 @@ class NetworkInfoImportFromSBMLModelUsingLibSBNE(NetworkInfoImportBase):
                 text_info['geometricShapes'] = geometric_shapes
         return text_info
 
-    @staticmethod
-    def extract_image_shape_features(image_shape):
+    def extract_image_shape_features(self, image_shape):
         # set shape
         image_shape_info = {'shape': "image"}
 
         # get position x
-        if sbne.ne_img_isSetPositionX(image_shape):
-            rel_abs_vec = sbne.ne_img_getPositionX(image_shape)
-            image_shape_info['x'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                     'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_img_isSetPositionX(image_shape):
+            rel_abs_vec = self.sbne.ne_img_getPositionX(image_shape)
+            image_shape_info['x'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                     'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get position y
-        if sbne.ne_img_isSetPositionY(image_shape):
-            rel_abs_vec = sbne.ne_img_getPositionY(image_shape)
-            image_shape_info['y'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                     'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_img_isSetPositionY(image_shape):
+            rel_abs_vec = self.sbne.ne_img_getPositionY(image_shape)
+            image_shape_info['y'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                     'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get dimension width
-        if sbne.ne_img_isSetDimensionWidth(image_shape):
-            rel_abs_vec = sbne.ne_img_getDimensionWidth(image_shape)
-            image_shape_info['width'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                         'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_img_isSetDimensionWidth(image_shape):
+            rel_abs_vec = self.sbne.ne_img_getDimensionWidth(image_shape)
+            image_shape_info['width'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                         'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get dimension height
-        if sbne.ne_img_isSetDimensionHeight(image_shape):
-            rel_abs_vec = sbne.ne_img_getDimensionHeight(image_shape)
-            image_shape_info['height'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                          'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_img_isSetDimensionHeight(image_shape):
+            rel_abs_vec = self.sbne.ne_img_getDimensionHeight(image_shape)
+            image_shape_info['height'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                          'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get href
-        if sbne.ne_img_isSetHref(image_shape):
-            image_shape_info['href'] = sbne.ne_img_getHref(image_shape)
+        if self.sbne.ne_img_isSetHref(image_shape):
+            image_shape_info['href'] = self.sbne.ne_img_getHref(image_shape)
 
         return image_shape_info
 
-    @staticmethod
-    def extract_curve_shape_features(curve_shape):
+    def extract_curve_shape_features(self, curve_shape):
         # set shape
         curve_shape_info = {'shape': "renderCurve"}
 
+        if not self.is_feature_required("vertices"):
+            return curve_shape_info
+
         vertices_ = []
-        for v_index in range(sbne.ne_rc_getNumVertices(curve_shape)):
-            vertex = sbne.ne_rc_getVertex(curve_shape, v_index)
+        for v_index in range(self.sbne.ne_rc_getNumVertices(curve_shape)):
+            vertex = self.sbne.ne_rc_getVertex(curve_shape, v_index)
             vertex_ = {}
-            render_point = sbne.ne_vrx_getRenderPoint(vertex)
+            render_point = self.sbne.ne_vrx_getRenderPoint(vertex)
             if render_point:
                 vertex_['renderPointX'] = dict(
-                    abs=sbne.ne_rav_getAbsoluteValue(sbne.ne_rp_getX(render_point)),
-                    rel=sbne.ne_rav_getRelativeValue(sbne.ne_rp_getX(render_point)))
+                    abs=self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_rp_getX(render_point)),
+                    rel=self.sbne.ne_rav_getRelativeValue(self.sbne.ne_rp_getX(render_point)))
                 vertex_['renderPointY'] = dict(
-                    abs=sbne.ne_rav_getAbsoluteValue(sbne.ne_rp_getY(render_point)),
-                    rel=sbne.ne_rav_getRelativeValue(sbne.ne_rp_getY(render_point)))
-            if sbne.ne_vertex_isRenderCubicBezier(vertex):
-                base_point1 = sbne.ne_vrx_getBasePoint1(vertex)
-                base_point2 = sbne.ne_vrx_getBasePoint2(vertex)
+                    abs=self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_rp_getY(render_point)),
+                    rel=self.sbne.ne_rav_getRelativeValue(self.sbne.ne_rp_getY(render_point)))
+            if self.sbne.ne_vertex_isRenderCubicBezier(vertex):
+                base_point1 = self.sbne.ne_vrx_getBasePoint1(vertex)
+                base_point2 = self.sbne.ne_vrx_getBasePoint2(vertex)
                 if base_point1 and base_point2:
                     vertex_['basePoint1X'] = dict(
-                        abs=sbne.ne_rav_getAbsoluteValue(sbne.ne_rp_getX(base_point1)),
-                        rel=sbne.ne_rav_getRelativeValue(sbne.ne_rp_getX(base_point1)))
+                        abs=self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_rp_getX(base_point1)),
+                        rel=self.sbne.ne_rav_getRelativeValue(self.sbne.ne_rp_getX(base_point1)))
                     vertex_['basePoint1Y'] = dict(
-                        abs=sbne.ne_rav_getAbsoluteValue(sbne.ne_rp_getY(base_point1)),
-                        rel=sbne.ne_rav_getRelativeValue(sbne.ne_rp_getY(base_point1)))
+                        abs=self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_rp_getY(base_point1)),
+                        rel=self.sbne.ne_rav_getRelativeValue(self.sbne.ne_rp_getY(base_point1)))
                     vertex_['basePoint2X'] = dict(
-                        abs=sbne.ne_rav_getAbsoluteValue(sbne.ne_rp_getX(base_point2)),
-                        rel=sbne.ne_rav_getRelativeValue(sbne.ne_rp_getX(base_point2)))
+                        abs=self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_rp_getX(base_point2)),
+                        rel=self.sbne.ne_rav_getRelativeValue(self.sbne.ne_rp_getX(base_point2)))
                     vertex_['basePoint2Y'] = dict(
-                        abs=sbne.ne_rav_getAbsoluteValue(sbne.ne_rp_getY(base_point2)),
-                        rel=sbne.ne_rav_getRelativeValue(sbne.ne_rp_getY(base_point2)))
+                        abs=self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_rp_getY(base_point2)),
+                        rel=self.sbne.ne_rav_getRelativeValue(self.sbne.ne_rp_getY(base_point2)))
             vertices_.append(vertex_)
 
         curve_shape_info['vertices'] = vertices_
 
         return curve_shape_info
 
-    @staticmethod
-    def extract_text_shape_features(text_shape):
+    def extract_text_shape_features(self, text_shape):
         # set shape
         text_shape_info = {'shape': "text"}
 
         # get position x
-        if sbne.ne_txt_isSetPositionX(text_shape):
-            rel_abs_vec = sbne.ne_txt_getPositionX(text_shape)
-            text_shape_info['x'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                    'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_txt_isSetPositionX(text_shape):
+            rel_abs_vec = self.sbne.ne_txt_getPositionX(text_shape)
+            text_shape_info['x'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                    'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get position y
-        if sbne.ne_txt_isSetPositionY(text_shape):
-            rel_abs_vec = sbne.ne_txt_getPositionY(text_shape)
-            text_shape_info['y'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                    'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_txt_isSetPositionY(text_shape):
+            rel_abs_vec = self.sbne.ne_txt_getPositionY(text_shape)
+            text_shape_info['y'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                    'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get font family
-        if sbne.ne_txt_isSetFontFamily(text_shape):
-            text_shape_info['fontFamily'] = sbne.ne_txt_getFontFamily(text_shape)
+        if self.sbne.ne_txt_isSetFontFamily(text_shape):
+            text_shape_info['fontFamily'] = self.sbne.ne_txt_getFontFamily(text_shape)
 
         # get font size
-        if sbne.ne_txt_isSetFontSize(text_shape):
-            rel_abs_vec = sbne.ne_txt_getFontSize(gs)
-            text_shape_info['fontSize'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                           'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_txt_isSetFontSize(text_shape):
+            rel_abs_vec = self.sbne.ne_txt_getFontSize(gs)
+            text_shape_info['fontSize'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                           'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get font weight
-        if sbne.ne_txt_isSetFontWeight(text_shape):
-            text_shape_info['fontWeight'] = sbne.ne_txt_getFontWeight(text_shape)
+        if self.sbne.ne_txt_isSetFontWeight(text_shape):
+            text_shape_info['fontWeight'] = self.sbne.ne_txt_getFontWeight(text_shape)
 
         # get font style
-        if sbne.ne_txt_isSetFontStyle(text_shape):
-            text_shape_info['fontStyle'] = sbne.ne_grp_getFontStyle(text_shape)
+        if self.sbne.ne_txt_isSetFontStyle(text_shape):
+            text_shape_info['fontStyle'] = self.sbne.ne_grp_getFontStyle(text_shape)
 
         # get horizontal text anchor
-        if sbne.ne_txt_isSetHTextAnchor(text_shape):
-            text_shape_info['hTextAnchor'] = sbne.ne_txt_getHTextAnchor(text_shape)
+        if self.sbne.ne_txt_isSetHTextAnchor(text_shape):
+            text_shape_info['hTextAnchor'] = self.sbne.ne_txt_getHTextAnchor(text_shape)
 
         # get vertical text anchor
-        if sbne.ne_txt_isSetVTextAnchor(text_shape):
-            text_shape_info['vTextAnchor'] = sbne.ne_txt_getVTextAnchor(text_shape)
+        if self.sbne.ne_txt_isSetVTextAnchor(text_shape):
+            text_shape_info['vTextAnchor'] = self.sbne.ne_txt_getVTextAnchor(text_shape)
 
         return text_shape_info
 
-    @staticmethod
-    def extract_rectangle_shape_features(rectangle_shape):
+    def extract_rectangle_shape_features(self, rectangle_shape):
         # set shape
         rectangle_shape_info = {'shape': "rectangle"}
 
         # get fill color
-        if sbne.ne_gs_isSetFillColor(rectangle_shape):
-            rectangle_shape_info['fillColor'] = sbne.ne_gs_getFillColor(rectangle_shape)
+        if self.sbne.ne_gs_isSetFillColor(rectangle_shape):
+            rectangle_shape_info['fillColor'] = self.sbne.ne_gs_getFillColor(rectangle_shape)
 
         # get position x
-        if sbne.ne_rec_isSetPositionX(rectangle_shape):
-            rel_abs_vec = sbne.ne_rec_getPositionX(rectangle_shape)
-            rectangle_shape_info['x'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                         'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_rec_isSetPositionX(rectangle_shape):
+            rel_abs_vec = self.sbne.ne_rec_getPositionX(rectangle_shape)
+            rectangle_shape_info['x'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                         'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get position y
-        if sbne.ne_rec_isSetPositionY(rectangle_shape):
-            rel_abs_vec = sbne.ne_rec_getPositionY(rectangle_shape)
-            rectangle_shape_info['y'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                         'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_rec_isSetPositionY(rectangle_shape):
+            rel_abs_vec = self.sbne.ne_rec_getPositionY(rectangle_shape)
+            rectangle_shape_info['y'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                         'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get dimension width
-        if sbne.ne_rec_isSetDimensionWidth(rectangle_shape):
-            rel_abs_vec = sbne.ne_rec_getDimensionWidth(rectangle_shape)
-            rectangle_shape_info['width'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                             'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_rec_isSetDimensionWidth(rectangle_shape):
+            rel_abs_vec = self.sbne.ne_rec_getDimensionWidth(rectangle_shape)
+            rectangle_shape_info['width'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                             'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get dimension height
-        if sbne.ne_rec_isSetDimensionHeight(rectangle_shape):
-            rel_abs_vec = sbne.ne_rec_getDimensionHeight(rectangle_shape)
-            rectangle_shape_info['height'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                              'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_rec_isSetDimensionHeight(rectangle_shape):
+            rel_abs_vec = self.sbne.ne_rec_getDimensionHeight(rectangle_shape)
+            rectangle_shape_info['height'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                              'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get corner curvature radius rx
-        if sbne.ne_rec_isSetCornerCurvatureRX(rectangle_shape):
-            rel_abs_vec = sbne.ne_rec_getCornerCurvatureRX(rectangle_shape)
-            rectangle_shape_info['rx'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                          'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_rec_isSetCornerCurvatureRX(rectangle_shape):
+            rel_abs_vec = self.sbne.ne_rec_getCornerCurvatureRX(rectangle_shape)
+            rectangle_shape_info['rx'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                          'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get corner curvature radius ry
-        if sbne.ne_rec_isSetCornerCurvatureRY(rectangle_shape):
-            rel_abs_vec = sbne.ne_rec_getCornerCurvatureRY(rectangle_shape)
-            rectangle_shape_info['ry'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                          'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_rec_isSetCornerCurvatureRY(rectangle_shape):
+            rel_abs_vec = self.sbne.ne_rec_getCornerCurvatureRY(rectangle_shape)
+            rectangle_shape_info['ry'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                          'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get width/height ratio
-        if sbne.ne_rec_isSetRatio(rectangle_shape):
-            rectangle_shape_info['ratio'] = sbne.ne_rec_getRatio(rectangle_shape)
+        if self.sbne.ne_rec_isSetRatio(rectangle_shape):
+            rectangle_shape_info['ratio'] = self.sbne.ne_rec_getRatio(rectangle_shape)
 
         return rectangle_shape_info
 
-    @staticmethod
-    def extract_ellipse_shape_features(ellipse_shape):
+    def extract_ellipse_shape_features(self, ellipse_shape):
         # set shape
         ellipse_shape_info = {'shape': "ellipse"}
 
         # get fill color
-        if sbne.ne_gs_isSetFillColor(ellipse_shape):
-            ellipse_shape_info['fillColor'] = sbne.ne_gs_getFillColor(ellipse_shape)
+        if self.sbne.ne_gs_isSetFillColor(ellipse_shape):
+            ellipse_shape_info['fillColor'] = self.sbne.ne_gs_getFillColor(ellipse_shape)
 
         # get position cx
-        if sbne.ne_elp_isSetPositionCX(ellipse_shape):
-            rel_abs_vec = sbne.ne_elp_getPositionCX(ellipse_shape)
-            ellipse_shape_info['cx'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                        'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_elp_isSetPositionCX(ellipse_shape):
+            rel_abs_vec = self.sbne.ne_elp_getPositionCX(ellipse_shape)
+            ellipse_shape_info['cx'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                        'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get position cy
-        if sbne.ne_elp_isSetPositionCY(ellipse_shape):
-            rel_abs_vec = sbne.ne_elp_getPositionCY(ellipse_shape)
-            ellipse_shape_info['cy'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                        'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_elp_isSetPositionCY(ellipse_shape):
+            rel_abs_vec = self.sbne.ne_elp_getPositionCY(ellipse_shape)
+            ellipse_shape_info['cy'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                        'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get dimension rx
-        if sbne.ne_elp_isSetDimensionRX(ellipse_shape):
-            rel_abs_vec = sbne.ne_elp_getDimensionRX(ellipse_shape)
-            ellipse_shape_info['rx'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                        'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_elp_isSetDimensionRX(ellipse_shape):
+            rel_abs_vec = self.sbne.ne_elp_getDimensionRX(ellipse_shape)
+            ellipse_shape_info['rx'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                        'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get dimension ry
-        if sbne.ne_elp_isSetDimensionRY(ellipse_shape):
-            rel_abs_vec = sbne.ne_elp_getDimensionRY(ellipse_shape)
-            ellipse_shape_info['ry'] = {'abs': sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
-                                        'rel': sbne.ne_rav_getRelativeValue(rel_abs_vec)}
+        if self.sbne.ne_elp_isSetDimensionRY(ellipse_shape):
+            rel_abs_vec = self.sbne.ne_elp_getDimensionRY(ellipse_shape)
+            ellipse_shape_info['ry'] = {'abs': self.sbne.ne_rav_getAbsoluteValue(rel_abs_vec),
+                                        'rel': self.sbne.ne_rav_getRelativeValue(rel_abs_vec)}
 
         # get radius ratio
-        if sbne.ne_elp_isSetRatio(ellipse_shape):
-            ellipse_shape_info['ratio'] = sbne.ne_elp_getRatio(ellipse_shape)
+        if self.sbne.ne_elp_isSetRatio(ellipse_shape):
+            ellipse_shape_info['ratio'] = self.sbne.ne_elp_getRatio(ellipse_shape)
 
         return ellipse_shape_info
 
-    @staticmethod
-    def extract_polygon_shape_features(polygon_shape):
+    def extract_polygon_shape_features(self, polygon_shape):
         # set shape
         polygon_shape_info = {'shape': "polygon"}
 
         # get fill color
-        if sbne.ne_gs_isSetFillColor(polygon_shape):
-            polygon_shape_info['fillColor'] = sbne.ne_gs_getFillColor(polygon_shape)
+        if self.sbne.ne_gs_isSetFillColor(polygon_shape):
+            polygon_shape_info['fillColor'] = self.sbne.ne_gs_getFillColor(polygon_shape)
 
         # get fill rule
-        if sbne.ne_gs_isSetFillRule(polygon_shape):
-            polygon_shape_info['fillRule'] = sbne.ne_gs_getFillRule(polygon_shape)
+        if self.sbne.ne_gs_isSetFillRule(polygon_shape):
+            polygon_shape_info['fillRule'] = self.sbne.ne_gs_getFillRule(polygon_shape)
+
+        if not self.is_feature_required("vertices"):
+            return polygon_shape_info
 
         vertices_ = []
-        for v_index in range(sbne.ne_plg_getNumVertices(polygon_shape)):
-            vertex = sbne.ne_plg_getVertex(polygon_shape, v_index)
+        for v_index in range(self.sbne.ne_plg_getNumVertices(polygon_shape)):
+            vertex = self.sbne.ne_plg_getVertex(polygon_shape, v_index)
             vertex_ = {}
-            render_point = sbne.ne_vrx_getRenderPoint(vertex)
+            render_point = self.sbne.ne_vrx_getRenderPoint(vertex)
             if render_point:
                 vertex_['renderPointX'] = dict(
-                    abs=sbne.ne_rav_getAbsoluteValue(sbne.ne_rp_getX(render_point)),
-                    rel=sbne.ne_rav_getRelativeValue(sbne.ne_rp_getX(render_point)))
+                    abs=self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_rp_getX(render_point)),
+                    rel=self.sbne.ne_rav_getRelativeValue(self.sbne.ne_rp_getX(render_point)))
                 vertex_['renderPointY'] = dict(
-                    abs=sbne.ne_rav_getAbsoluteValue(sbne.ne_rp_getY(render_point)),
-                    rel=sbne.ne_rav_getRelativeValue(sbne.ne_rp_getY(render_point)))
-            if sbne.ne_vrx_isRenderCubicBezier(vertex):
-                base_point1 = sbne.ne_vrx_getBasePoint1(vertex)
-                base_point2 = sbne.ne_vrx_getBasePoint2(vertex)
+                    abs=self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_rp_getY(render_point)),
+                    rel=self.sbne.ne_rav_getRelativeValue(self.sbne.ne_rp_getY(render_point)))
+            if self.sbne.ne_vrx_isRenderCubicBezier(vertex):
+                base_point1 = self.sbne.ne_vrx_getBasePoint1(vertex)
+                base_point2 = self.sbne.ne_vrx_getBasePoint2(vertex)
                 if base_point1 and base_point2:
                     vertex_['basePoint1X'] = dict(
-                        abs=sbne.ne_rav_getAbsoluteValue(sbne.ne_rp_getX(base_point1)),
-                        rel=sbne.ne_rav_getRelativeValue(sbne.ne_rp_getX(base_point1)))
+                        abs=self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_rp_getX(base_point1)),
+                        rel=self.sbne.ne_rav_getRelativeValue(self.sbne.ne_rp_getX(base_point1)))
                     vertex_['basePoint1Y'] = dict(
-                        abs=sbne.ne_rav_getAbsoluteValue(sbne.ne_rp_getY(base_point1)),
-                        rel=sbne.ne_rav_getRelativeValue(sbne.ne_rp_getY(base_point1)))
+                        abs=self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_rp_getY(base_point1)),
+                        rel=self.sbne.ne_rav_getRelativeValue(self.sbne.ne_rp_getY(base_point1)))
                     vertex_['basePoint2X'] = dict(
-                        abs=sbne.ne_rav_getAbsoluteValue(sbne.ne_rp_getX(base_point2)),
-                        rel=sbne.ne_rav_getRelativeValue(sbne.ne_rp_getX(base_point2)))
+                        abs=self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_rp_getX(base_point2)),
+                        rel=self.sbne.ne_rav_getRelativeValue(self.sbne.ne_rp_getX(base_point2)))
                     vertex_['basePoint2Y'] = dict(
-                        abs=sbne.ne_rav_getAbsoluteValue(sbne.ne_rp_getY(base_point2)),
-                        rel=sbne.ne_rav_getRelativeValue(sbne.ne_rp_getY(base_point2)))
+                        abs=self.sbne.ne_rav_getAbsoluteValue(self.sbne.ne_rp_getY(base_point2)),
+                        rel=self.sbne.ne_rav_getRelativeValue(self.sbne.ne_rp_getY(base_point2)))
             vertices_.append(vertex_)
 
         polygon_shape_info['vertices'] = vertices_
 
         return polygon_shape_info
 
-    @staticmethod
-    def extract_bounding_box_features(glyph_object):
+    def extract_bounding_box_features(self, glyph_object):
         bounding_box = {}
-        if sbne.ne_go_isSetBoundingBox(glyph_object):
-            bbox = sbne.ne_go_getBoundingBox(glyph_object)
-            bounding_box = {'x': sbne.ne_bb_getX(bbox), 'y': sbne.ne_bb_getY(bbox),
-                            'width': sbne.ne_bb_getWidth(bbox),
-                            'height': sbne.ne_bb_getHeight(bbox)}
+        if self.sbne.ne_go_isSetBoundingBox(glyph_object):
+            bbox = self.sbne.ne_go_getBoundingBox(glyph_object)
+            bounding_box = {'x': self.sbne.ne_bb_getX(bbox), 'y': self.sbne.ne_bb_getY(bbox),
+                            'width': self.sbne.ne_bb_getWidth(bbox),
+                            'height': self.sbne.ne_bb_getHeight(bbox)}
         return bounding_box
 
     @staticmethod
@@ -909,16 +979,10 @@ class NetworkInfoImportFromSBMLModelUsingLibSBNE(NetworkInfoImportBase):
                 and 'graphicalText' in list(text_features.keys()) \
                 and 'fontFamily' in list(text_features['graphicalText'].keys()) \
                 and 'fontSize' in list(text_features['graphicalText'].keys()):
-            fp = FontProperties(family=text_features['graphicalText']['fontFamily'],
-                                size=text_features['graphicalText']['fontSize']['abs']
-                                     + 0.01 * text_features['graphicalText']['fontSize']['rel']
-                                     * text_features['boundingBox']['width'])
-            text_width, text_height, text_descent = TextToPath().get_text_width_height_descent(
-                s=text_features['plainText'],
-                prop=fp, ismath=False)
-            char_width = text_width / len(text_features['plainText'])
-            if text_width > text_features['boundingBox']['width'] - char_width:
-                while text_width > text_features['boundingBox']['width'] - char_width:
-                    text_features['plainText'] = text_features['plainText'][:-1]
-                    text_width -= char_width
-                text_features['plainText'] += "."
\ No newline at end of file
+            # the characters are measured with the advance widths of the font, and the text cut where it overflows
+            graphical_text = text_features['graphicalText']
+            text_features['plainText'] = default_text_metrics.truncate_text(
+                text_features['plainText'], text_features['boundingBox']['width'], graphical_text['fontFamily'],
+                graphical_text['fontSize']['abs'] + 0.01 * graphical_text['fontSize']['rel']
+                * text_features['boundingBox']['width'], graphical_text.get('fontWeight', "normal"),
+                graphical_text.get('fontStyle', "normal"))
\ No newline at end of file
@@ -0,0 +1,93 @@
+class NetworkInfoViewport:
+    def __init__(self, graph_info, x, y, width, height):
+        # the entities of the info inside a region, so only their features are extracted when the info extracts them
+        # lazily (see NetworkInfoImportBase.lazy_features)
+        self.graph_info = graph_info
+        self.region = {'x': x, 'y': y, 'width': width, 'height': height}
+        self.selected_entities = None
+
+    def __getattr__(self, name):
+        # the rest of the info (e.g. its colors, line endings and flags) is that of the whole info
+        return getattr(self.graph_info, name)
+
+    @property
+    def compartments(self):
+        return self.select_entities()['compartments']
+
+    @property
+    def species(self):
+        return self.select_entities()['species']
+
+    @property
+    def reactions(self):
+        return self.select_entities()['reactions']
+
+    @property
+    def extents(self):
+        return self.select_entities()['extents']
+
+    def get_sbml_source(self):
+        # the source is that of the whole info, so it is not passed through
+        return None
+
+    def get_sbml_document(self):
+        return None
+
+    def select_entities(self):
+        # the entities are selected again once the info replaces them (e.g. with its lazy entities)
+        entities = (self.graph_info.compartments, self.graph_info.species, self.graph_info.reactions)
+        if self.selected_entities is None or \
+                any(e is not s for e, s in zip(entities, self.selected_entities['source'])):
+            self.selected_entities = self.get_entities_in_region(*entities)
+            self.selected_entities['source'] = entities
+
+        return self.selected_entities
+
+    def get_entities_in_region(self, compartments, species, reactions):
+        bounding_boxes = {}
+        selected_reactions = [reaction for reaction in reactions if self.is_in_region(reaction, bounding_boxes)]
+
+        # the species connected to the reactions in the region are kept, so none of their edges is left without an end
+        species_glyph_ids = set()
+        for reaction in selected_reactions:
+            for species_reference in reaction.get('speciesReferences', []):
+                for key in ['speciesGlyph', 'species_glyph_id']:
+                    if key in species_reference:
+                        species_glyph_ids.add(species_reference[key])
+        selected_species = [s for s in species
+                            if s['id'] in species_glyph_ids or self.is_in_region(s, bounding_boxes)]
+
+        # and so are the compartments of the kept species and reactions
+        compartment_ids = set(go['compartment'] for go in selected_species + selected_reactions
+                              if 'compartment' in go)
+        selected_compartments = [c for c in compartments
+                                 if c['referenceId'] in compartment_ids or self.is_in_region(c, bounding_boxes)]
+
+        # the extents are found as the importers find them, from the origin on
+        extents = {'minX': 0, 'maxX': 0, 'minY': 0, 'maxY': 0}
+        for go in selected_compartments + selected_species + selected_reactions:
+            bounding_box = self.get_bounding_box(go, bounding_boxes)
+            if bounding_box:
+                extents['minX'] = min(extents['minX'], bounding_box['x'])
+                extents['maxX'] = max(extents['maxX'], bounding_box['x'] + bounding_box['width'])
+                extents['minY'] = min(extents['minY'], bounding_box['y'])
+                extents['maxY'] = max(extents['maxY'], bounding_box['y'] + bounding_box['height'])
+
+        return {'compartments': selected_compartments, 'species': selected_species, 'reactions': selected_reactions,
+                'extents': extents}
+
+    def get_bounding_box(self, go, bounding_boxes):
+        if id(go) not in bounding_boxes:
+            bounding_boxes[id(go)] = self.graph_info.get_entity_bounding_box(go)
+
+        return bounding_boxes[id(go)]
+
+    def is_in_region(self, go, bounding_boxes):
+        bounding_box = self.get_bounding_box(go, bounding_boxes)
+        if not bounding_box:
+            return False
+
+        return bounding_box['x'] < self.region['x'] + self.region['width'] and \
+            bounding_box['x'] + bounding_box['width'] > self.region['x'] and \
+            bounding_box['y'] < self.region['y'] + self.region['height'] and \
+            bounding_box['y'] + bounding_box['height'] > self.region['y']
@@ -0,0 +1,52 @@
+import os
+import json
+
+
+class NetworkInfoLayoutCache:
+    def __init__(self, cache_directory="", max_entries=256):
+        if not cache_directory:
+            cache_directory = os.path.join(os.path.expanduser("~"), ".cache", "networkinfotranslator", "layouts")
+        self.cache_directory = cache_directory
+        self.max_entries = max_entries
+
+    def get(self, key):
+        file_name = self.get_file_name(key)
+        try:
+            with open(file_name) as cache_file:
+                snapshot = json.load(cache_file)
+            # mark the entry as recently used
+            os.utime(file_name)
+            return snapshot
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, snapshot):
+        os.makedirs(self.cache_directory, exist_ok=True)
+        file_name = self.get_file_name(key)
+        temporary_file_name = file_name + "." + str(os.getpid()) + ".tmp"
+        with open(temporary_file_name, 'w') as cache_file:
+            json.dump(snapshot, cache_file)
+        os.replace(temporary_file_name, file_name)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.cache_directory):
+            if entry.name.endswith(".json"):
+                entries.append((entry.stat().st_mtime, entry.path))
+        if len(entries) > self.max_entries:
+            entries.sort()
+            for mtime, file_name in entries[:len(entries) - self.max_entries]:
+                try:
+                    os.remove(file_name)
+                except OSError:
+                    pass
+
+    def clear(self):
+        if os.path.isdir(self.cache_directory):
+            for entry in os.scandir(self.cache_directory):
+                if entry.name.endswith(".json"):
+                    os.remove(entry.path)
+
+    def get_file_name(self, key):
+        return os.path.join(self.cache_directory, key + ".json")
@@ -0,0 +1,327 @@
+import numpy as np
+import math
+
+
+class NetworkInfoForceDirectedLayout:
+    def __init__(self):
+        self.num_iterations = 150
+        self.node_distance = 120.0
+        self.compartment_gravity = 1.0
+        self.gravity = 0.1
+        self.compartment_padding = 40.0
+        self.curve_gap = 5.0
+        self.grid_approximation_threshold = 1000
+        self.block_size = 2000000
+        self.seed = 0
+
+    def apply(self, graph_info):
+        nodes = self.get_nodes(graph_info)
+        if not len(nodes):
+            return
+
+        edges = self.get_edges(graph_info, nodes)
+        compartment_indices, num_compartments = self.get_compartment_indices(graph_info, nodes)
+        positions = self.get_initial_positions(compartment_indices, num_compartments)
+        positions = self.run_iterations(positions, edges, compartment_indices, num_compartments)
+        self.set_node_positions(nodes, positions)
+        self.set_species_reference_curves(graph_info, nodes, positions)
+        self.set_compartment_bounding_boxes(graph_info, nodes, compartment_indices)
+        self.set_extents(graph_info)
+
+    @staticmethod
+    def get_nodes(graph_info):
+        nodes = []
+        for species in graph_info.species:
+            if 'features' in list(species.keys()) and 'boundingBox' in list(species['features'].keys()):
+                nodes.append(species)
+        for reaction in graph_info.reactions:
+            if 'features' in list(reaction.keys()) and 'boundingBox' in list(reaction['features'].keys()):
+                nodes.append(reaction)
+
+        return nodes
+
+    @staticmethod
+    def get_edges(graph_info, nodes):
+        glyph_indices = {}
+        for n_index in range(len(nodes)):
+            glyph_indices[id(nodes[n_index])] = n_index
+        species_node_indices = NetworkInfoForceDirectedLayout.get_species_node_indices(graph_info, glyph_indices)
+
+        sources = []
+        targets = []
+        for reaction in graph_info.reactions:
+            if id(reaction) in glyph_indices and 'speciesReferences' in list(reaction.keys()):
+                for species_reference in reaction['speciesReferences']:
+                    species_index = NetworkInfoForceDirectedLayout.find_species_node_index(species_reference,
+                                                                                           *species_node_indices)
+                    if species_index is not None:
+                        sources.append(glyph_indices[id(reaction)])
+                        targets.append(species_index)
+
+        return np.array([sources, targets], dtype=np.int64).reshape(2, len(sources))
+
+    @staticmethod
+    def get_species_node_indices(graph_info, node_indices):
+        # the index of each species node by its glyph id, and apart from those, by the id of its model species
+        glyph_id_indices = {}
+        species_id_indices = {}
+        for species in graph_info.species:
+            if id(species) in node_indices:
+                if 'id' in list(species.keys()):
+                    glyph_id_indices.setdefault(species['id'], node_indices[id(species)])
+                species_id_indices.setdefault(species['referenceId'], node_indices[id(species)])
+
+        return glyph_id_indices, species_id_indices
+
+    @staticmethod
+    def find_species_node_index(species_reference, glyph_id_indices, species_id_indices):
+        # a species reference is matched by the glyph of its species first, and by its species only then
+        for key in ['species_glyph_id', 'speciesGlyph']:
+            if key in list(species_reference.keys()) and species_reference[key] in glyph_id_indices:
+                return glyph_id_indices[species_reference[key]]
+        if 'species' in list(species_reference.keys()) and species_reference['species'] in species_id_indices:
+            return species_id_indices[species_reference['species']]
+
+        return None
+
+    @staticmethod
+    def get_compartment_indices(graph_info, nodes):
+        compartment_ids = {}
+        compartment_indices = np.zeros(len(nodes), dtype=np.int64)
+        for n_index in range(len(nodes)):
+            compartment_id = ""
+            if 'compartment' in list(nodes[n_index].keys()) and nodes[n_index]['compartment']:
+                compartment_id = nodes[n_index]['compartment']
+            compartment_indices[n_index] = compartment_ids.setdefault(compartment_id, len(compartment_ids))
+
+        return compartment_indices, len(compartment_ids)
+
+    def get_initial_positions(self, compartment_indices, num_compartments):
+        random_generator = np.random.default_rng(self.seed)
+        num_nodes = np.bincount(compartment_indices, minlength=num_compartments)
+        # place each compartment in its own cell of a square grid so that the compartments start apart
+        cell_sizes = self.node_distance * np.sqrt(num_nodes)
+        cell_size = cell_sizes.max()
+        num_columns = int(math.ceil(math.sqrt(num_compartments)))
+        cell_centers = np.column_stack([(np.arange(num_compartments) % num_columns + 0.5) * 1.5 * cell_size,
+                                        (np.arange(num_compartments) // num_columns + 0.5) * 1.5 * cell_size])
+        offsets = random_generator.uniform(-0.5, 0.5, (len(compartment_indices), 2))
+
+        return cell_centers[compartment_indices] + offsets * cell_sizes[compartment_indices, np.newaxis]
+
+    def run_iterations(self, positions, edges, compartment_indices, num_compartments):
+        k = self.node_distance
+        num_nodes = len(positions)
+        temperature = 0.1 * k * math.sqrt(num_nodes) + k
+        cooling = temperature / max(self.num_iterations, 1)
+        compartment_sizes = np.maximum(np.bincount(compartment_indices, minlength=num_compartments), 1)
+        for iteration in range(self.num_iterations):
+            if num_nodes > self.grid_approximation_threshold:
+                displacements = self.get_approximate_repulsive_forces(positions, k)
+            else:
+                displacements = self.get_repulsive_forces(positions, k)
+            displacements += self.get_attractive_forces(positions, edges, k)
+
+            # pull the nodes towards the center of their compartment and the whole network towards its center
+            compartment_centers = np.column_stack(
+                [np.bincount(compartment_indices, weights=positions[:, 0], minlength=num_compartments),
+                 np.bincount(compartment_indices, weights=positions[:, 1], minlength=num_compartments)]) / \
+                compartment_sizes[:, np.newaxis]
+            displacements -= self.compartment_gravity * (positions - compartment_centers[compartment_indices])
+            displacements -= self.gravity * (positions - positions.mean(axis=0))
+
+            # limit the displacement of each node by the current temperature
+            lengths = np.maximum(np.hypot(displacements[:, 0], displacements[:, 1]), 1e-9)
+            positions += displacements / lengths[:, np.newaxis] * np.minimum(lengths, temperature)[:, np.newaxis]
+            temperature = max(temperature - cooling, 0.01 * k)
+
+        return positions
+
+    def get_repulsive_forces(self, positions, k):
+        forces = np.zeros_like(positions)
+        block_length = max(1, self.block_size // len(positions))
+        for start in range(0, len(positions), block_length):
+            deltas = positions[start:start + block_length, np.newaxis, :] - positions[np.newaxis, :, :]
+            squared_distances = np.maximum(np.einsum('ijk,ijk->ij', deltas, deltas), 0.01)
+            forces[start:start + block_length] = k * k * np.einsum('ijk,ij->ik', deltas, 1.0 / squared_distances)
+
+        return forces
+
+    def get_approximate_repulsive_forces(self, positions, k):
+        # split the nodes into a grid of cells holding the same number of nodes: the nodes of the same cell repel
+        # each other exactly and the other cells act on them as single bodies located at their centers of mass
+        num_nodes = len(positions)
+        grid_size = max(2, int(math.sqrt(2.0 * math.sqrt(num_nodes))))
+        columns = np.empty(num_nodes, dtype=np.int64)
+        columns[np.argsort(positions[:, 0], kind='stable')] = np.arange(num_nodes) * grid_size // num_nodes
+        order = np.lexsort((positions[:, 1], columns))
+        column_sizes = np.bincount(columns, minlength=grid_size)
+        column_ranks = np.arange(num_nodes) - np.repeat(np.cumsum(column_sizes) - column_sizes, column_sizes)
+        cell_indices = np.empty(num_nodes, dtype=np.int64)
+        cell_indices[order] = columns[order] * grid_size + \
+            column_ranks * grid_size // np.maximum(column_sizes[columns[order]], 1)
+        cell_sizes = np.bincount(cell_indices, minlength=grid_size * grid_size)
+        cell_centers = np.column_stack(
+            [np.bincount(cell_indices, weights=positions[:, 0], minlength=grid_size * grid_size),
+             np.bincount(cell_indices, weights=positions[:, 1], minlength=grid_size * grid_size)]) / \
+            np.maximum(cell_sizes, 1)[:, np.newaxis]
+
+        forces = np.zeros_like(positions)
+        block_length = max(1, self.block_size // len(cell_centers))
+        for start in range(0, num_nodes, block_length):
+            deltas = positions[start:start + block_length, np.newaxis, :] - cell_centers[np.newaxis, :, :]
+            weights = cell_sizes / np.maximum(np.einsum('ijk,ijk->ij', deltas, deltas), 0.01)
+            weights[np.arange(len(deltas)), cell_indices[start:start + block_length]] = 0.0
+            forces[start:start + block_length] = k * k * np.einsum('ijk,ij->ik', deltas, weights)
+
+        # gather the members of each cell into a padded array to get the exact forces inside all the cells at once
+        members = np.full((len(cell_sizes), cell_sizes.max()), -1, dtype=np.int64)
+        cell_order = np.argsort(cell_indices, kind='stable')
+        members[cell_indices[cell_order],
+                np.arange(num_nodes) - np.repeat(np.cumsum(cell_sizes) - cell_sizes, cell_sizes)] = cell_order
+        cell_block_length = max(1, self.block_size // (cell_sizes.max() ** 2))
+        for start in range(0, len(cell_sizes), cell_block_length):
+            block_members = members[start:start + cell_block_length]
+            is_member = block_members >= 0
+            deltas = positions[block_members][:, :, np.newaxis, :] - positions[block_members][:, np.newaxis, :, :]
+            weights = 1.0 / np.maximum(np.einsum('ijkl,ijkl->ijk', deltas, deltas), 0.01)
+            weights *= is_member[:, :, np.newaxis] & is_member[:, np.newaxis, :]
+            weights[:, np.arange(members.shape[1]), np.arange(members.shape[1])] = 0.0
+            forces[block_members[is_member]] += k * k * np.einsum('ijkl,ijk->ijl', deltas, weights)[is_member]
+
+        return forces
+
+    @staticmethod
+    def get_attractive_forces(positions, edges, k):
+        forces = np.zeros_like(positions)
+        if edges.shape[1]:
+            deltas = positions[edges[0]] - positions[edges[1]]
+            distances = np.hypot(deltas[:, 0], deltas[:, 1])
+            edge_forces = deltas * (distances / k)[:, np.newaxis]
+            np.add.at(forces, edges[0], -edge_forces)
+            np.add.at(forces, edges[1], edge_forces)
+
+        return forces
+
+    @staticmethod
+    def set_node_positions(nodes, positions):
+        for n_index in range(len(nodes)):
+            bounding_box = nodes[n_index]['features']['boundingBox']
+            delta_x = positions[n_index, 0] - (bounding_box['x'] + 0.5 * bounding_box['width'])
+            delta_y = positions[n_index, 1] - (bounding_box['y'] + 0.5 * bounding_box['height'])
+            NetworkInfoForceDirectedLayout.move_bounding_box(bounding_box, delta_x, delta_y)
+
+            # move the curve of the reaction along with it
+            if 'curve' in list(nodes[n_index]['features'].keys()):
+                for curve_segment in nodes[n_index]['features']['curve']:
+                    for key in list(curve_segment.keys()):
+                        if key.endswith('X'):
+                            curve_segment[key] += delta_x
+                        elif key.endswith('Y'):
+                            curve_segment[key] += delta_y
+
+            # move the texts along with it
+            if 'texts' in list(nodes[n_index].keys()):
+                for text in nodes[n_index]['texts']:
+                    if 'features' in list(text.keys()) and 'boundingBox' in list(text['features'].keys()):
+                        NetworkInfoForceDirectedLayout.move_bounding_box(text['features']['boundingBox'],
+                                                                         delta_x, delta_y)
+
+    @staticmethod
+    def move_bounding_box(bounding_box, delta_x, delta_y):
+        bounding_box['x'] = float(bounding_box['x'] + delta_x)
+        bounding_box['y'] = float(bounding_box['y'] + delta_y)
+
+    def set_species_reference_curves(self, graph_info, nodes, positions):
+        node_indices = {}
+        for n_index in range(len(nodes)):
+            node_indices[id(nodes[n_index])] = n_index
+        species_node_indices = self.get_species_node_indices(graph_info, node_indices)
+
+        species_references = []
+        reaction_indices = []
+        species_indices = []
+        for reaction in graph_info.reactions:
+            if id(reaction) in node_indices and 'speciesReferences' in list(reaction.keys()):
+                for species_reference in reaction['speciesReferences']:
+                    species_index = self.find_species_node_index(species_reference, *species_node_indices)
+                    if species_index is not None and 'features' in list(species_reference.keys()):
+                        species_references.append(species_reference)
+                        reaction_indices.append(node_indices[id(reaction)])
+                        species_indices.append(species_index)
+        if not len(species_references):
+            return
+
+        # clip the straight line connecting the reaction to the species at the border of the species bounding box
+        half_dimensions = np.array([[0.5 * node['features']['boundingBox']['width'],
+                                     0.5 * node['features']['boundingBox']['height']] for node in nodes])
+        start_points = positions[reaction_indices]
+        species_centers = positions[species_indices]
+        deltas = species_centers - start_points
+        scales = np.min(half_dimensions[species_indices] /
+                        np.maximum(np.abs(deltas), 1e-9), axis=1)
+        lengths = np.maximum(np.hypot(deltas[:, 0], deltas[:, 1]), 1e-9)
+        scales = np.clip(scales + self.curve_gap / lengths, 0.0, 1.0)
+        end_points = species_centers - deltas * scales[:, np.newaxis]
+        slopes = np.arctan2(deltas[:, 1], deltas[:, 0])
+        for sr_index in range(len(species_references)):
+            start_x, start_y = start_points[sr_index].tolist()
+            end_x, end_y = end_points[sr_index].tolist()
+            features = species_references[sr_index]['features']
+            features['curve'] = [{'startX': start_x, 'startY': start_y, 'endX': end_x, 'endY': end_y}]
+            features['startPoint'] = {'x': start_x, 'y': start_y}
+            features['endPoint'] = {'x': end_x, 'y': end_y}
+            features['startSlope'] = float(slopes[sr_index] + math.pi)
+            features['endSlope'] = float(slopes[sr_index])
+
+    def set_compartment_bounding_boxes(self, graph_info, nodes, compartment_indices):
+        compartment_members = {}
+        for n_index in range(len(nodes)):
+            if 'compartment' in list(nodes[n_index].keys()):
+                compartment_members.setdefault(nodes[n_index]['compartment'], []).append(n_index)
+
+        for compartment in graph_info.compartments:
+            if compartment['referenceId'] in compartment_members and 'features' in list(compartment.keys()) \
+                    and 'boundingBox' in list(compartment['features'].keys()):
+                bounding_boxes = np.array([[nodes[n_index]['features']['boundingBox']['x'],
+                                            nodes[n_index]['features']['boundingBox']['y'],
+                                            nodes[n_index]['features']['boundingBox']['x'] +
+                                            nodes[n_index]['features']['boundingBox']['width'],
+                                            nodes[n_index]['features']['boundingBox']['y'] +
+                                            nodes[n_index]['features']['boundingBox']['height']]
+                                           for n_index in compartment_members[compartment['referenceId']]])
+                old_bounding_box = dict(compartment['features']['boundingBox'])
+                bounding_box = compartment['features']['boundingBox']
+                bounding_box['x'] = float(bounding_boxes[:, 0].min() - self.compartment_padding)
+                bounding_box['y'] = float(bounding_boxes[:, 1].min() - self.compartment_padding)
+                bounding_box['width'] = float(bounding_boxes[:, 2].max() + self.compartment_padding - bounding_box['x'])
+                bounding_box['height'] = float(bounding_boxes[:, 3].max() + self.compartment_padding - bounding_box['y'])
+                if 'texts' in list(compartment.keys()):
+                    for text in compartment['texts']:
+                        if 'features' in list(text.keys()) and 'boundingBox' in list(text['features'].keys()):
+                            self.set_compartment_text_bounding_box(text['features']['boundingBox'],
+                                                                   old_bounding_box, bounding_box)
+
+    @staticmethod
+    def set_compartment_text_bounding_box(text_bounding_box, old_bounding_box, bounding_box):
+        if text_bounding_box == old_bounding_box:
+            text_bounding_box.update(bounding_box)
+        else:
+            NetworkInfoForceDirectedLayout.move_bounding_box(text_bounding_box,
+                                                             bounding_box['x'] - old_bounding_box['x'],
+                                                             bounding_box['y'] - old_bounding_box['y'])
+
+    @staticmethod
+    def set_extents(graph_info):
+        bounding_boxes = []
+        for entity in graph_info.compartments + graph_info.species + graph_info.reactions:
+            if 'features' in list(entity.keys()) and 'boundingBox' in list(entity['features'].keys()):
+                bounding_boxes.append([entity['features']['boundingBox']['x'],
+                                       entity['features']['boundingBox']['y'],
+                                       entity['features']['boundingBox']['width'],
+                                       entity['features']['boundingBox']['height']])
+        bounding_boxes = np.array(bounding_boxes)
+        graph_info.extents['minX'] = float(min(0.0, bounding_boxes[:, 0].min()))
+        graph_info.extents['maxX'] = float((bounding_boxes[:, 0] + bounding_boxes[:, 2]).max())
+        graph_info.extents['minY'] = float(min(0.0, bounding_boxes[:, 1].min()))
+        graph_info.extents['maxY'] = float((bounding_boxes[:, 1] + bounding_boxes[:, 3]).max())
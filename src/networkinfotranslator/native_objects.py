@@ -0,0 +1,12 @@
+def get_native_object_key(native_object):
+    # the swig objects are told apart by the address of the native object they wrap
+    if hasattr(native_object, 'this'):
+        try:
+            return type(native_object).__name__ + "@" + str(int(native_object.this))
+        except (TypeError, ValueError):
+            pass
+    try:
+        hash(native_object)
+        return native_object
+    except TypeError:
+        return repr(native_object)
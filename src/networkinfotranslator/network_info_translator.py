@@ -5,6 +5,13 @@ from .exports.export_network_editor import NetworkInfoExportToNetworkEditor
 from .exports.export_cytoscapejs import NetworkInfoExportToCytoscapeJs
 from .exports.export_figure_skia import NetworkInfoExportToSkia
 from .exports.export_escher import NetworkInfoExportToEscher
+from .layouts.layout_force_directed import NetworkInfoForceDirectedLayout
+from .layouts.layout_cache import NetworkInfoLayoutCache
+import concurrent.futures
+import json
+import io
+import os
+import threading
 
 
 def import_sbml_export_figure(import_file, file_name=""):
@@ -20,4 +27,122 @@ def import_sbml_export_pil_image(import_file):
     import_from_sbml.extract_info(import_file)
     export_to_figure = NetworkInfoExportToSkia()
     export_to_figure.extract_graph_info(import_from_sbml)
-    return export_to_figure.export_as_pil_image()
\ No newline at end of file
+    return export_to_figure.export_as_pil_image()
+
+
+def get_export_formats():
+    # the exporter and the extension of the file it writes for each target format
+    return {'png': (NetworkInfoExportToSkia, "png"), 'jpg': (NetworkInfoExportToSkia, "jpg"),
+            'pdf': (NetworkInfoExportToSkia, "pdf"), 'cytoscapejs': (NetworkInfoExportToCytoscapeJs, "js"),
+            'escher': (NetworkInfoExportToEscher, "json"), 'network_editor': (NetworkInfoExportToNetworkEditor, "json"),
+            'sbml': (NetworkInfoExportToSBMLModel, "xml")}
+
+
+def import_info(source):
+    # the source is an SBML file or string, or a network editor graph given as a dict or a .json file
+    if isinstance(source, bytes):
+        source = source.decode("utf-8")
+    if isinstance(source, str) and source.endswith(".json") and os.path.isfile(source):
+        with open(source, encoding="utf-8") as json_file:
+            source = json.load(json_file)
+    elif isinstance(source, str) and source.lstrip().startswith("{"):
+        source = json.loads(source)
+    if isinstance(source, dict):
+        import_from_network_editor = NetworkInfoImportFromNetworkEditor()
+        import_from_network_editor.extract_info(source)
+        return import_from_network_editor
+
+    import_from_sbml = NetworkInfoImportFromSBMLModel()
+    import_from_sbml.extract_info(source)
+    return import_from_sbml
+
+
+def import_info_from_content(content):
+    # the content is never looked up as the path of a file: a network editor graph is given as JSON, and the rest as SBML
+    if isinstance(content, bytes):
+        content = content.decode("utf-8")
+    if content.lstrip().startswith("{"):
+        import_from_network_editor = NetworkInfoImportFromNetworkEditor()
+        import_from_network_editor.extract_info(json.loads(content))
+        return import_from_network_editor
+    if not content.lstrip().startswith("<"):
+        raise ValueError("the source is neither a JSON nor an SBML document")
+
+    import_from_sbml = NetworkInfoImportFromSBMLModel()
+    import_from_sbml.read_only_content = True
+    import_from_sbml.extract_info(content)
+    return import_from_sbml
+
+
+def get_exporter(target_format):
+    export_formats = get_export_formats()
+    if target_format not in list(export_formats.keys()):
+        raise ValueError('unsupported target format "' + str(target_format) + '"')
+
+    return export_formats[target_format][0]()
+
+
+shared_exporters = {}
+shared_exporters_lock = threading.Lock()
+
+
+def get_shared_exporter(target_format):
+    # the exporters build their scenes without changing themselves, so one of each is shared by all the threads
+    with shared_exporters_lock:
+        if target_format not in list(shared_exporters.keys()):
+            shared_exporters[target_format] = get_exporter(target_format)
+
+        return shared_exporters[target_format]
+
+
+def export_info(graph_info, target_format, file_name=""):
+    scene = get_shared_exporter(target_format).build(graph_info)
+    if file_name:
+        scene.export(file_name)
+        return file_name
+
+    # without a file name, the output is written to memory and returned as bytes
+    output_stream = io.BytesIO()
+    scene.export_to_stream(output_stream, get_export_formats()[target_format][1])
+    return output_stream.getvalue()
+
+
+def get_required_features(target_formats):
+    # the features needed by the exporters of all the target formats, or None if one of them needs all of them
+    required_features = set()
+    for target_format in target_formats:
+        if get_shared_exporter(target_format).required_features is None:
+            return None
+        required_features |= get_shared_exporter(target_format).required_features
+
+    return required_features
+
+
+def convert(source, target_format, file_name=""):
+    # the native document of the importer is released as soon as the output is written
+    with import_info(source) as graph_info:
+        # the features the exporter does not use are not extracted
+        graph_info.required_features = get_required_features([target_format])
+        return export_info(graph_info, target_format, file_name)
+
+
+def export_info_to_formats(graph_info, target_formats, max_workers=None):
+    # the target formats are a list of formats, whose outputs are returned as bytes, or a dict of format to file name
+    if not isinstance(target_formats, dict):
+        target_formats = {target_format: "" for target_format in target_formats}
+    for target_format in list(target_formats.keys()):
+        get_exporter(target_format)
+
+    # the features are extracted once and shared by the exporters running side by side
+    graph_info.freeze()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or len(target_formats) or 1,
+                                               thread_name_prefix="networkinfotranslator") as executor:
+        futures = {target_format: executor.submit(export_info, graph_info, target_format, file_name)
+                   for target_format, file_name in target_formats.items()}
+        return {target_format: future.result() for target_format, future in futures.items()}
+
+
+def convert_to_formats(source, target_formats, max_workers=None):
+    with import_info(source) as graph_info:
+        graph_info.required_features = get_required_features(target_formats)
+        return export_info_to_formats(graph_info, target_formats, max_workers)
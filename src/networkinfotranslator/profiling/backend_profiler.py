@@ -0,0 +1,110 @@
+from ..native_objects import get_native_object_key
+import json
+import time
+
+
+class NetworkInfoBackendProfiler:
+    def __init__(self):
+        self.functions = {}
+        self.repeated_arguments = 5
+
+    def reset(self):
+        self.functions = {}
+
+    def wrap(self, backend):
+        return NetworkInfoProfiledBackend(backend, self)
+
+    def add_call(self, function_name, args, kwargs, elapsed_time):
+        if function_name not in self.functions:
+            self.functions[function_name] = {'calls': 0, 'cumulativeTime': 0.0, 'arguments': {}}
+        function = self.functions[function_name]
+        function['calls'] += 1
+        function['cumulativeTime'] += elapsed_time
+        arguments_key = self.get_arguments_key(args, kwargs)
+        function['arguments'][arguments_key] = function['arguments'].get(arguments_key, 0) + 1
+
+    def get_arguments_key(self, args, kwargs):
+        arguments_key = tuple(self.get_argument_key(arg) for arg in args)
+        if kwargs:
+            arguments_key += tuple((name, self.get_argument_key(value)) for name, value in sorted(kwargs.items()))
+
+        return arguments_key
+
+    @staticmethod
+    def get_argument_key(argument):
+        return get_native_object_key(argument)
+
+    def get_report(self, sort_by='cumulativeTime'):
+        report = []
+        for function_name, function in self.functions.items():
+            repeated_arguments = sorted([(count, arguments_key) for arguments_key, count in function['arguments'].items()
+                                         if count > 1], key=lambda x: x[0], reverse=True)
+            report.append({'function': function_name,
+                           'calls': function['calls'],
+                           'cumulativeTime': function['cumulativeTime'],
+                           'averageTime': function['cumulativeTime'] / function['calls'],
+                           'distinctCalls': len(function['arguments']),
+                           # the calls made again with the same arguments as an earlier call
+                           'redundantCalls': function['calls'] - len(function['arguments']),
+                           'mostRepeatedArguments': [{'arguments': repr(arguments_key), 'calls': count}
+                                                     for count, arguments_key in
+                                                     repeated_arguments[:self.repeated_arguments]]})
+        report.sort(key=lambda x: x[sort_by], reverse=True)
+
+        return report
+
+    def get_summary(self):
+        calls = 0
+        redundant_calls = 0
+        cumulative_time = 0.0
+        for function in self.functions.values():
+            calls += function['calls']
+            redundant_calls += function['calls'] - len(function['arguments'])
+            cumulative_time += function['cumulativeTime']
+
+        return {'functions': len(self.functions), 'calls': calls, 'redundantCalls': redundant_calls,
+                'cumulativeTime': cumulative_time}
+
+    def to_json(self, file_name="", indent=1):
+        profile = {'summary': self.get_summary(), 'functions': self.get_report()}
+        if file_name:
+            with open(file_name, 'w', encoding='utf8') as js_file:
+                json.dump(profile, js_file, indent=indent)
+
+        return json.dumps(profile, indent=indent)
+
+    def print_report(self, number_of_functions=25, sort_by='cumulativeTime'):
+        summary = self.get_summary()
+        print("%d backend calls to %d functions (%d redundant) in %.3f s" %
+              (summary['calls'], summary['functions'], summary['redundantCalls'], summary['cumulativeTime']))
+        print("%-50s %10s %12s %10s %10s" % ("function", "calls", "time (s)", "us/call", "redundant"))
+        for function in self.get_report(sort_by)[:number_of_functions]:
+            print("%-50s %10d %12.4f %10.2f %10d" % (function['function'], function['calls'],
+                                                      function['cumulativeTime'], 1e6 * function['averageTime'],
+                                                      function['redundantCalls']))
+
+
+class NetworkInfoProfiledBackend:
+    def __init__(self, backend, profiler):
+        self.__dict__['backend'] = backend
+        self.__dict__['profiler'] = profiler
+
+    def __getattr__(self, name):
+        attribute = getattr(self.backend, name)
+        if not callable(attribute):
+            return attribute
+
+        profiler = self.profiler
+
+        def profiled_call(*args, **kwargs):
+            start_time = time.perf_counter()
+            value = attribute(*args, **kwargs)
+            profiler.add_call(name, args, kwargs, time.perf_counter() - start_time)
+            return value
+
+        # the wrapper is kept so that the next calls skip the lookup
+        self.__dict__[name] = profiled_call
+        return profiled_call
+
+    def __setattr__(self, name, value):
+        setattr(self.backend, name, value)
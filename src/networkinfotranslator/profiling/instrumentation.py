@@ -0,0 +1,227 @@
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+
+class NetworkInfoInstrumentation:
+    def __init__(self, track_memory=False, memory_budget=None):
+        self.is_enabled = True
+        self.stages = {}
+        # the stages are nested per thread, so the exporters sharing this instrumentation can run side by side
+        self.local = threading.local()
+        self.lock = threading.RLock()
+        # the peak of the python memory of each stage is traced with tracemalloc
+        self.track_memory = track_memory
+        # the peaks are only measured once the stages end, so the stages over the budget are reported, not stopped.
+        # the budget is enforced before the large allocations instead (see NetworkInfoMemoryBudget)
+        self.memory_budget = memory_budget
+        self.number_of_memory_frames = 0
+        self.is_tracing_memory = False
+
+    def reset(self):
+        with self.lock:
+            self.stages = {}
+            self.local = threading.local()
+            self.number_of_memory_frames = 0
+
+    def get_stage_path(self):
+        if not hasattr(self.local, 'stage_path'):
+            self.local.stage_path = []
+
+        return self.local.stage_path
+
+    def get_memory_frames(self):
+        if not hasattr(self.local, 'memory_frames'):
+            self.local.memory_frames = []
+
+        return self.local.memory_frames
+
+    def stage(self, name):
+        return NetworkInfoInstrumentationStage(self, name)
+
+    def begin_stage(self, name):
+        self.get_stage_path().append(name)
+        self.get_current_stage()
+        if self.track_memory:
+            self.begin_memory_frame()
+
+    def end_stage(self, wall_time):
+        stage_path = self.get_stage_path()
+        with self.lock:
+            stage = self.get_current_stage()
+            stage['calls'] += 1
+            stage['wallTime'] += wall_time
+        if self.track_memory:
+            peak_memory = self.end_memory_frame()
+            with self.lock:
+                stage['peakMemory'] = max(stage['peakMemory'], peak_memory)
+                if self.memory_budget and not self.memory_budget.fits(peak_memory):
+                    stage['overMemoryBudget'] = True
+        stage_path.pop()
+
+    def begin_memory_frame(self):
+        # tracemalloc is shared by the threads, so the peaks of the stages running side by side include each other
+        memory_frames = self.get_memory_frames()
+        with self.lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.is_tracing_memory = True
+            self.number_of_memory_frames += 1
+            current_memory, peak_memory = tracemalloc.get_traced_memory()
+            # the peak is reset for the nested stage, so the peak reached so far is kept by the enclosing one
+            if memory_frames:
+                memory_frames[-1]['peak'] = max(memory_frames[-1]['peak'], peak_memory)
+            # (python 3.8 cannot reset the peak, so the peaks of the nested stages are only upper bounds there)
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+        memory_frames.append({'start': current_memory, 'peak': current_memory})
+
+    def end_memory_frame(self):
+        memory_frames = self.get_memory_frames()
+        frame = memory_frames.pop()
+        with self.lock:
+            peak_memory = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            self.number_of_memory_frames -= 1
+            if not self.number_of_memory_frames and self.is_tracing_memory:
+                tracemalloc.stop()
+                self.is_tracing_memory = False
+        if memory_frames:
+            memory_frames[-1]['peak'] = max(memory_frames[-1]['peak'], peak_memory)
+
+        return peak_memory - frame['start']
+
+    def get_current_stage(self):
+        # the stages are keyed by their path, so the same stage nested in different places is kept apart
+        stage_name = "/".join(self.get_stage_path())
+        with self.lock:
+            if stage_name not in self.stages:
+                self.stages[stage_name] = {'calls': 0, 'wallTime': 0.0, 'entities': 0, 'backendCalls': 0,
+                                           'bytesWritten': 0, 'peakMemory': 0, 'estimatedMemory': 0,
+                                           'overMemoryBudget': False, 'cacheHits': 0, 'cacheMisses': 0}
+
+            return self.stages[stage_name]
+
+    def add_to_current_stage(self, key, count):
+        with self.lock:
+            self.get_current_stage()[key] += count
+
+    def add_entities(self, count=1):
+        self.add_to_current_stage('entities', count)
+
+    def add_backend_calls(self, count=1):
+        self.add_to_current_stage('backendCalls', count)
+
+    def add_bytes_written(self, count):
+        self.add_to_current_stage('bytesWritten', count)
+
+    def add_cache_lookup(self, is_hit):
+        if is_hit:
+            self.add_to_current_stage('cacheHits', 1)
+        else:
+            self.add_to_current_stage('cacheMisses', 1)
+
+    def add_file_bytes_written(self, file_name):
+        if os.path.isfile(file_name):
+            self.add_bytes_written(os.path.getsize(file_name))
+
+    def add_estimated_memory(self, number_of_bytes):
+        # the memory allocated outside python (e.g. a skia surface) is not seen by tracemalloc
+        with self.lock:
+            stage = self.get_current_stage()
+            stage['estimatedMemory'] = max(stage['estimatedMemory'], number_of_bytes)
+
+    def wrap_backend(self, backend):
+        return NetworkInfoInstrumentedBackend(backend, self)
+
+    def as_dict(self):
+        with self.lock:
+            return {stage_name: dict(stage) for stage_name, stage in self.stages.items()}
+
+    def to_json(self, file_name="", indent=1):
+        if file_name:
+            with open(file_name, 'w', encoding='utf8') as js_file:
+                json.dump(self.as_dict(), js_file, indent=indent)
+
+        return json.dumps(self.as_dict(), indent=indent)
+
+
+class NetworkInfoInstrumentationStage:
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.start_time = 0.0
+
+    def __enter__(self):
+        self.instrumentation.begin_stage(self.name)
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.instrumentation.end_stage(time.perf_counter() - self.start_time)
+
+
+class NetworkInfoNoInstrumentation:
+    # the default instrumentation which records nothing and leaves the backends unwrapped
+    def __init__(self):
+        self.is_enabled = False
+        self.null_stage = contextlib.nullcontext()
+
+    def reset(self):
+        pass
+
+    def stage(self, name):
+        return self.null_stage
+
+    def add_entities(self, count=1):
+        pass
+
+    def add_backend_calls(self, count=1):
+        pass
+
+    def add_bytes_written(self, count):
+        pass
+
+    def add_cache_lookup(self, is_hit):
+        pass
+
+    def add_file_bytes_written(self, file_name):
+        pass
+
+    def add_estimated_memory(self, number_of_bytes):
+        pass
+
+    def wrap_backend(self, backend):
+        return backend
+
+    def as_dict(self):
+        return {}
+
+    def to_json(self, file_name="", indent=1):
+        return "{}"
+
+
+class NetworkInfoInstrumentedBackend:
+    def __init__(self, backend, instrumentation):
+        self.__dict__['backend'] = backend
+        self.__dict__['instrumentation'] = instrumentation
+
+    def __getattr__(self, name):
+        attribute = getattr(self.backend, name)
+        if not callable(attribute):
+            return attribute
+
+        instrumentation = self.instrumentation
+
+        def counted_call(*args, **kwargs):
+            instrumentation.add_backend_calls()
+            return attribute(*args, **kwargs)
+
+        # the wrapper is kept so that the next calls skip the lookup
+        self.__dict__[name] = counted_call
+        return counted_call
+
+    def __setattr__(self, name, value):
+        setattr(self.backend, name, value)
@@ -0,0 +1,50 @@
+import math
+
+
+class NetworkInfoMemoryBudgetExceeded(MemoryError):
+    pass
+
+
+class NetworkInfoMemoryBudget:
+    def __init__(self, max_bytes, degrade=True):
+        self.max_bytes = max_bytes
+        # whether a large allocation is made smaller (e.g. a downscaled figure) instead of failing
+        self.degrade = degrade
+        self.min_scale = 0.05
+
+    def fits(self, number_of_bytes):
+        return number_of_bytes <= self.max_bytes
+
+    def check(self, number_of_bytes, description):
+        if not self.fits(number_of_bytes):
+            raise NetworkInfoMemoryBudgetExceeded(description + " needs about " + self.format_bytes(number_of_bytes) +
+                                                  ", which is over the memory budget of " +
+                                                  self.format_bytes(self.max_bytes))
+
+    def get_scale(self, number_of_bytes, description):
+        # the scale of an allocation whose size grows with its area, so that it fits in the budget
+        if self.fits(number_of_bytes):
+            return 1.0
+        if not self.degrade:
+            self.check(number_of_bytes, description)
+        scale = math.sqrt(self.max_bytes / number_of_bytes)
+        if scale < self.min_scale:
+            raise NetworkInfoMemoryBudgetExceeded(description + " needs about " + self.format_bytes(number_of_bytes) +
+                                                  " and would have to be scaled down to " + "%.1f%%" % (100 * scale) +
+                                                  " of its size to fit in the memory budget of " +
+                                                  self.format_bytes(self.max_bytes))
+
+        return scale
+
+    @staticmethod
+    def get_surface_bytes(width, height, bytes_per_pixel=4):
+        return int(width) * int(height) * bytes_per_pixel
+
+    @staticmethod
+    def format_bytes(number_of_bytes):
+        for unit in ["B", "KiB", "MiB", "GiB"]:
+            if number_of_bytes < 1024:
+                return "%.1f %s" % (number_of_bytes, unit)
+            number_of_bytes /= 1024.0
+
+        return "%.1f TiB" % number_of_bytes
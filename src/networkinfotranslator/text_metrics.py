@@ -0,0 +1,139 @@
+import skia
+import bisect
+import collections
+import itertools
+import threading
+
+
+class NetworkInfoTextMetrics:
+    def __init__(self, reference_size=100.0):
+        # the advance widths are measured once at the reference size and scaled linearly to the others
+        self.reference_size = reference_size
+        self.typefaces = {}
+        self.reference_fonts = {}
+        self.advance_widths = {}
+        self.lock = threading.RLock()
+
+    def reset(self):
+        with self.lock:
+            self.typefaces = {}
+            self.reference_fonts = {}
+            self.advance_widths = {}
+
+    @staticmethod
+    def get_font_key(font_family, font_weight="normal", font_style="normal"):
+        return (str(font_family or ""), str(font_weight or "normal").lower() == "bold",
+                str(font_style or "normal").lower() == "italic")
+
+    @staticmethod
+    def get_font_style(font_key):
+        if font_key[1]:
+            if font_key[2]:
+                return skia.FontStyle.BoldItalic()
+            return skia.FontStyle.Bold()
+        if font_key[2]:
+            return skia.FontStyle.Italic()
+
+        return skia.FontStyle.Normal()
+
+    def get_typeface(self, font_family, font_weight="normal", font_style="normal"):
+        return self._get_typeface(self.get_font_key(font_family, font_weight, font_style))
+
+    def _get_typeface(self, font_key):
+        # a typeface is looked up among the system fonts only once
+        with self.lock:
+            if font_key not in self.typefaces:
+                self.typefaces[font_key] = skia.Typeface(font_key[0], self.get_font_style(font_key))
+
+            return self.typefaces[font_key]
+
+    def _get_reference_font(self, font_key):
+        if font_key not in self.reference_fonts:
+            font = skia.Font(self._get_typeface(font_key), self.reference_size)
+            font.setLinearMetrics(True)
+            font.setSubpixel(True)
+            self.reference_fonts[font_key] = font
+
+        return self.reference_fonts[font_key]
+
+    def get_advance_widths(self, plain_text, font_family, font_size, font_weight="normal", font_style="normal"):
+        # the width of each character of the text at the given font size
+        font_key = self.get_font_key(font_family, font_weight, font_style)
+        with self.lock:
+            advance_widths = self.advance_widths.setdefault(font_key, {})
+            new_characters = "".join(character for character in set(plain_text) if character not in advance_widths)
+            if new_characters:
+                font = self._get_reference_font(font_key)
+                for character, width in zip(new_characters, font.getWidths(font.textToGlyphs(new_characters))):
+                    advance_widths[character] = width
+        scale = font_size / self.reference_size
+
+        return [advance_widths[character] * scale for character in plain_text]
+
+    def measure_text(self, plain_text, font_family, font_size, font_weight="normal", font_style="normal"):
+        return sum(self.get_advance_widths(plain_text, font_family, font_size, font_weight, font_style))
+
+    def truncate_text(self, plain_text, max_width, font_family, font_size, font_weight="normal",
+                      font_style="normal", ellipsis="."):
+        # the longest start of the text which fits in the width together with the ellipsis
+        advance_widths = self.get_advance_widths(plain_text + ellipsis, font_family, font_size, font_weight,
+                                                 font_style)
+        text_widths = list(itertools.accumulate(advance_widths[:len(plain_text)]))
+        if not text_widths or text_widths[-1] <= max_width:
+            return plain_text
+        ellipsis_width = sum(advance_widths[len(plain_text):])
+
+        return plain_text[:bisect.bisect_right(text_widths, max_width - ellipsis_width)] + ellipsis
+
+
+class NetworkInfoTextBlobCache:
+    def __init__(self, max_size=4096, text_metrics=None):
+        # the least recently used blobs are dropped once there are more than max_size of them
+        self.max_size = max_size
+        if not text_metrics:
+            text_metrics = default_text_metrics
+        self.text_metrics = text_metrics
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def reset(self):
+        with self.lock:
+            self.entries = collections.OrderedDict()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get(self, plain_text, font_family, font_size, font_weight="normal", font_style="normal"):
+        # returns the text blob and the width of the text, and whether they were already in the cache
+        font_key = self.text_metrics.get_font_key(font_family, font_weight, font_style)
+        entry_key = (plain_text, font_key, font_size)
+        with self.lock:
+            if entry_key in self.entries:
+                self.entries.move_to_end(entry_key)
+                self.hits += 1
+                return self.entries[entry_key], True
+
+        # the blob is shaped with the same settings the text is measured with, so it is as wide as measured
+        font = skia.Font(self.text_metrics.get_typeface(font_family, font_weight, font_style), font_size)
+        font.setLinearMetrics(True)
+        font.setSubpixel(True)
+        entry = {'blob': skia.TextBlob(plain_text, font), 'width': font.measureText(plain_text)}
+        with self.lock:
+            self.misses += 1
+            self.entries[entry_key] = entry
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+        return entry, False
+
+    def get_statistics(self):
+        with self.lock:
+            return {'size': len(self.entries), 'maxSize': self.max_size, 'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions}
+
+
+default_text_metrics = NetworkInfoTextMetrics()
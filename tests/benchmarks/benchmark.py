@@ -0,0 +1,297 @@
+from synthetic_model import NetworkInfoSyntheticModel
+import argparse
+import gc
+import importlib
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+
+class NetworkInfoBenchmark:
+    def __init__(self, sizes=None, working_directory=""):
+        if not sizes:
+            sizes = [10, 100, 1000, 10000]
+        self.sizes = sizes
+        self.working_directory = working_directory
+        self.seed = 0
+        self.repeats = 1
+        self.measure_memory = True
+        # the measurements below the resolution of the timer (or of the memory tracing) are left out of the scaling
+        self.max_scaling_exponent = 1.3
+        self.min_measured_time = 0.001
+        self.min_measured_memory = 1 << 10
+        # the figure exporters draw on a surface covering the whole network
+        self.max_figure_size = 2000
+        self.importers = ["sbml", "sbml_sbne", "network_editor"]
+        self.exporters = ["skia_png", "skia_pdf", "matplotlib", "cytoscapejs", "escher", "network_editor", "sbml"]
+        self.results = {}
+
+    def reset(self):
+        self.results = {}
+
+    @staticmethod
+    def get_importer_cases():
+        return {'sbml': {'module': "networkinfotranslator.imports.import_sbml", 'class': "NetworkInfoImportFromSBMLModel",
+                         'input': "sbml"},
+                'sbml_sbne': {'module': "networkinfotranslator.imports.import_sbml_sbne",
+                              'class': "NetworkInfoImportFromSBMLModelUsingLibSBNE", 'input': "sbml"},
+                'network_editor': {'module': "networkinfotranslator.imports.import_network_editor",
+                                   'class': "NetworkInfoImportFromNetworkEditor", 'input': "network_editor"}}
+
+    @staticmethod
+    def get_exporter_cases():
+        return {'skia_png': {'module': "networkinfotranslator.exports.export_figure_skia", 'class': "NetworkInfoExportToSkia",
+                             'extension': "png", 'isFigure': True},
+                'skia_pdf': {'module': "networkinfotranslator.exports.export_figure_skia", 'class': "NetworkInfoExportToSkia",
+                             'extension': "pdf", 'isFigure': True},
+                'matplotlib': {'module': "networkinfotranslator.exports.export_figure_matplotlib", 'class': "NetworkInfoExportToMatPlotLib",
+                               'extension': "png", 'isFigure': True},
+                'cytoscapejs': {'module': "networkinfotranslator.exports.export_cytoscapejs", 'class': "NetworkInfoExportToCytoscapeJs",
+                                'extension': "js", 'isFigure': False},
+                'escher': {'module': "networkinfotranslator.exports.export_escher", 'class': "NetworkInfoExportToEscher",
+                           'extension': "json", 'isFigure': False},
+                'network_editor': {'module': "networkinfotranslator.exports.export_network_editor",
+                                   'class': "NetworkInfoExportToNetworkEditor", 'extension': "json",
+                                   'isFigure': False},
+                'sbml': {'module': "networkinfotranslator.exports.export_sbml", 'class': "NetworkInfoExportToSBMLModel",
+                         'extension': "xml", 'isFigure': False}}
+
+    @staticmethod
+    def get_class(case):
+        # the backends of some of the cases may not be installed
+        try:
+            return getattr(importlib.import_module(case['module']), case['class'])
+        except ImportError:
+            return None
+
+    def run(self):
+        self.reset()
+        working_directory = self.working_directory
+        if not working_directory:
+            working_directory = tempfile.mkdtemp(prefix="networkinfotranslator_benchmark_")
+        os.makedirs(working_directory, exist_ok=True)
+        try:
+            for size in sorted(self.sizes):
+                self.run_size(size, working_directory)
+        finally:
+            if not self.working_directory:
+                shutil.rmtree(working_directory, ignore_errors=True)
+
+        return self.results
+
+    def run_size(self, size, working_directory):
+        # the model is generated with all of its features, so the exporters are timed on their own
+        model = NetworkInfoSyntheticModel(size, self.seed)
+        self.add_measurement("generate", "model", size, self.measure(lambda: self.generate_model(model, size)))
+        input_files = self.write_input_files(model, size, working_directory)
+
+        # importers
+        importer_cases = self.get_importer_cases()
+        for importer_name in self.importers:
+            importer_class = self.get_class(importer_cases[importer_name])
+            if not importer_class:
+                self.add_measurement("import", importer_name, size, {'error': "unavailable"})
+                continue
+            input_file = input_files[importer_cases[importer_name]['input']]
+            self.add_measurement("import", importer_name, size,
+                                 self.measure(lambda: self.import_model(importer_class, input_file)))
+
+        # exporters
+        exporter_cases = self.get_exporter_cases()
+        for exporter_name in self.exporters:
+            exporter_class = self.get_class(exporter_cases[exporter_name])
+            if not exporter_class:
+                self.add_measurement("export", exporter_name, size, {'error': "unavailable"})
+                continue
+            if exporter_cases[exporter_name]['isFigure'] and size > self.max_figure_size:
+                self.add_measurement("export", exporter_name, size, {'skipped': True})
+                continue
+            file_name = os.path.join(working_directory,
+                                     exporter_name + "_" + str(size) + "." + exporter_cases[exporter_name]['extension'])
+            self.add_measurement("export", exporter_name, size,
+                                 self.measure(lambda: self.export_model(exporter_class, model, file_name)))
+
+    @staticmethod
+    def generate_model(model, size):
+        model.extract_info(size)
+        model.freeze()
+
+    @staticmethod
+    def write_input_files(model, size, working_directory):
+        from networkinfotranslator.exports.export_sbml import NetworkInfoExportToSBMLModel
+        from networkinfotranslator.exports.export_network_editor import NetworkInfoExportToNetworkEditor
+        input_files = {'sbml': os.path.join(working_directory, "model_" + str(size) + ".xml"),
+                       'network_editor': os.path.join(working_directory, "model_" + str(size) + ".json")}
+        export_to_sbml = NetworkInfoExportToSBMLModel()
+        export_to_sbml.extract_graph_info(model)
+        export_to_sbml.export(input_files['sbml'])
+        export_to_network_editor = NetworkInfoExportToNetworkEditor()
+        export_to_network_editor.extract_graph_info(model)
+        export_to_network_editor.export(input_files['network_editor'])
+
+        return input_files
+
+    @staticmethod
+    def import_model(importer_class, input_file):
+        importer = importer_class()
+        if input_file.endswith(".json"):
+            with open(input_file) as json_file:
+                importer.extract_info(json.load(json_file))
+        else:
+            importer.extract_info(input_file)
+        importer.extract_entity_features()
+
+    @staticmethod
+    def export_model(exporter_class, model, file_name):
+        exporter = exporter_class()
+        exporter.extract_graph_info(model)
+        exporter.export(file_name)
+
+    def measure(self, function):
+        try:
+            wall_times = []
+            for r_index in range(self.repeats):
+                gc.collect()
+                start_time = time.perf_counter()
+                function()
+                wall_times.append(time.perf_counter() - start_time)
+            measurement = {'wallTime': min(wall_times)}
+
+            # the memory is traced in a separate run, so the tracing does not slow down the timed ones
+            if self.measure_memory:
+                gc.collect()
+                tracemalloc.start()
+                try:
+                    function()
+                    measurement['peakMemory'] = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+        except Exception as error:
+            measurement = {'error': type(error).__name__ + ": " + str(error)}
+
+        return measurement
+
+    def add_measurement(self, kind, name, size, measurement):
+        case_name = kind + "." + name
+        if case_name not in self.results:
+            self.results[case_name] = {'kind': kind, 'name': name, 'measurements': {}}
+        self.results[case_name]['measurements'][size] = measurement
+
+    @staticmethod
+    def get_scaling_exponent(measurements, key, min_value):
+        # the steepest slope between two consecutive sizes on a log-log scale, so a growth which only starts at the
+        # larger sizes is not averaged away by the fixed costs dominating the smaller ones
+        points = [(math.log(size), math.log(measurement[key])) for size, measurement in sorted(measurements.items())
+                  if key in list(measurement.keys()) and measurement[key] >= min_value]
+        slopes = [(y2 - y1) / (x2 - x1) for (x1, y1), (x2, y2) in zip(points, points[1:]) if x2 > x1]
+        if not slopes:
+            return None
+
+        return max(slopes)
+
+    def get_report(self):
+        report = {}
+        for case_name, case in self.results.items():
+            report[case_name] = dict(case)
+            report[case_name]['timeExponent'] = \
+                self.get_scaling_exponent(case['measurements'], 'wallTime', self.min_measured_time)
+            report[case_name]['memoryExponent'] = \
+                self.get_scaling_exponent(case['measurements'], 'peakMemory', self.min_measured_memory)
+
+        return report
+
+    def get_errors(self):
+        # the cases whose backends are not installed are not errors
+        errors = []
+        for case_name, case in self.results.items():
+            for size, measurement in sorted(case['measurements'].items()):
+                if 'error' in list(measurement.keys()) and not measurement['error'] == "unavailable":
+                    errors.append("%s (n=%d): %s" % (case_name, size, measurement['error']))
+
+        return errors
+
+    def check(self):
+        failures = self.get_errors()
+        for case_name, case in self.get_report().items():
+            for key, label in [('timeExponent', "time"), ('memoryExponent', "peak memory")]:
+                if case[key] is not None and case[key] > self.max_scaling_exponent:
+                    failures.append("%s: %s grows as n^%.2f (limit n^%.2f)" %
+                                    (case_name, label, case[key], self.max_scaling_exponent))
+
+        return failures
+
+    def to_json(self, file_name="", indent=1):
+        report = {'sizes': sorted(self.sizes), 'maxScalingExponent': self.max_scaling_exponent,
+                  'cases': self.get_report(), 'failures': self.check()}
+        if file_name:
+            with open(file_name, 'w', encoding='utf8') as js_file:
+                json.dump(report, js_file, indent=indent)
+
+        return json.dumps(report, indent=indent)
+
+    def print_report(self):
+        sizes = sorted(self.sizes)
+        print("%-24s" % "case" + "".join("%14s" % ("n=" + str(size)) for size in sizes) + "%10s%10s" % ("time", "memory"))
+        for case_name, case in self.get_report().items():
+            row = "%-24s" % case_name
+            for size in sizes:
+                measurement = case['measurements'].get(size, {})
+                if 'wallTime' in list(measurement.keys()):
+                    cell = "%.3fs" % measurement['wallTime']
+                    if 'peakMemory' in list(measurement.keys()):
+                        cell += "/%.0fM" % (measurement['peakMemory'] / (1 << 20))
+                elif 'skipped' in list(measurement.keys()):
+                    cell = "skipped"
+                elif measurement.get('error') == "unavailable":
+                    cell = "unavailable"
+                else:
+                    cell = "error"
+                row += "%14s" % cell
+            for key in ['timeExponent', 'memoryExponent']:
+                row += "%10s" % ("n^%.2f" % case[key] if case[key] is not None else "-")
+            print(row)
+        for error in self.get_errors():
+            print(error)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Time and memory-profile the importers and exporters of "
+                                                 "NetworkInfoTranslator on synthetic models of growing size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000],
+                        help="the numbers of reactions of the generated models")
+    parser.add_argument("--repeats", type=int, default=1, help="the number of timed runs of each case")
+    parser.add_argument("--no-memory", action="store_true", help="do not trace the peak memory")
+    parser.add_argument("--max-exponent", type=float, default=1.3, help="the largest accepted scaling exponent")
+    parser.add_argument("--max-figure-size", type=int, default=2000,
+                        help="the largest model given to the figure exporters")
+    parser.add_argument("--importers", nargs="*", help="the importers to benchmark")
+    parser.add_argument("--exporters", nargs="*", help="the exporters to benchmark")
+    parser.add_argument("--directory", default="", help="keep the generated files in this directory")
+    parser.add_argument("--output", default="", help="write the report to this .json file")
+    arguments = parser.parse_args(arguments)
+
+    benchmark = NetworkInfoBenchmark(arguments.sizes, arguments.directory)
+    benchmark.repeats = arguments.repeats
+    benchmark.measure_memory = not arguments.no_memory
+    benchmark.max_scaling_exponent = arguments.max_exponent
+    benchmark.max_figure_size = arguments.max_figure_size
+    if arguments.importers is not None:
+        benchmark.importers = arguments.importers
+    if arguments.exporters is not None:
+        benchmark.exporters = arguments.exporters
+    benchmark.run()
+    benchmark.print_report()
+    if arguments.output:
+        benchmark.to_json(arguments.output)
+
+    failures = benchmark.check()
+    if failures:
+        raise SystemExit("failed cases:\n" + "\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
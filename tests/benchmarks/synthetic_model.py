@@ -0,0 +1,288 @@
+from networkinfotranslator.imports.import_base import NetworkInfoImportBase
+import math
+import random
+
+
+class NetworkInfoSyntheticModel(NetworkInfoImportBase):
+    def __init__(self, number_of_reactions=100, seed=0):
+        super().__init__()
+        self.number_of_reactions = number_of_reactions
+        self.seed = seed
+        self.species_width = 60.0
+        self.species_height = 36.0
+        self.horizontal_spacing = 140.0
+        self.vertical_spacing = 100.0
+        self.rows_per_compartment = 10
+        self.number_of_columns = 1
+        self.species_positions = []
+
+    def extract_info(self, graph=None):
+        super().extract_info(graph)
+
+        # the graph, if given, is the number of reactions of the model
+        if graph:
+            self.number_of_reactions = int(graph)
+        self.random = random.Random(self.seed)
+        self.set_species_positions(self.number_of_reactions + 1)
+        self.add_colors()
+        self.add_gradients()
+        self.add_line_endings()
+        self.add_compartments()
+        self.add_species()
+        self.add_reactions()
+
+    def set_species_positions(self, number_of_species):
+        # the species are laid out row by row on a serpentine grid, so consecutive species are next to each other
+        self.number_of_columns = max(1, int(math.ceil(math.sqrt(number_of_species))))
+        self.species_positions = []
+        for s_index in range(number_of_species):
+            row = s_index // self.number_of_columns
+            column = s_index % self.number_of_columns
+            if row % 2:
+                column = self.number_of_columns - 1 - column
+            self.species_positions.append((column * self.horizontal_spacing, row * self.vertical_spacing))
+
+    def add_colors(self):
+        for color_id, color_value in [("black", "#000000"), ("white", "#ffffff"), ("light_gray", "#eeeeee"),
+                                      ("steel_blue", "#4682b4"), ("gold", "#ffd700"), ("salmon", "#fa8072"),
+                                      ("sea_green", "#2e8b57"), ("dark_red", "#8b0000")]:
+            self.colors.append({'id': color_id, 'value': color_value})
+
+    def add_gradients(self):
+        self.gradients.append({'id': "linear_gradient", 'type': "linear"})
+        self.gradients.append({'id': "radial_gradient", 'type': "radial"})
+
+    def add_line_endings(self):
+        for line_ending_id in ["arrow", "bar", "circle"]:
+            self.line_endings.append({'id': line_ending_id})
+
+    def add_compartments(self):
+        number_of_rows = int(math.ceil(len(self.species_positions) / self.number_of_columns))
+        for c_index in range(int(math.ceil(number_of_rows / self.rows_per_compartment))):
+            self.compartments.append({'id': "compartment_" + str(c_index) + "_glyph",
+                                      'referenceId': "compartment_" + str(c_index), 'index': 0,
+                                      'first_row': c_index * self.rows_per_compartment,
+                                      'last_row': min(number_of_rows, (c_index + 1) * self.rows_per_compartment) - 1})
+
+    def add_species(self):
+        for s_index in range(len(self.species_positions)):
+            self.species.append({'id': "species_" + str(s_index) + "_glyph", 'referenceId': "species_" + str(s_index),
+                                 'index': 0, 'compartment': self.get_compartment_id(s_index),
+                                 'name': self.get_random_name()})
+
+    def add_reactions(self):
+        number_of_species = len(self.species_positions)
+        for r_index in range(self.number_of_reactions):
+            reaction_id = "reaction_" + str(r_index)
+            reaction = {'id': reaction_id + "_glyph", 'referenceId': reaction_id, 'index': 0,
+                        'compartment': self.get_compartment_id(r_index), 'speciesReferences': []}
+            self.add_species_reference(reaction, r_index, "substrate")
+            self.add_species_reference(reaction, r_index + 1, "product")
+            # a part of the reactions have a second substrate or a modifier from anywhere in the network
+            if r_index % 3 == 2:
+                self.add_species_reference(reaction, self.random.randrange(number_of_species), "sidesubstrate")
+            if r_index % 5 == 4:
+                self.add_species_reference(reaction, self.random.randrange(number_of_species), "modifier")
+            self.reactions.append(reaction)
+
+    @staticmethod
+    def add_species_reference(reaction, species_index, role):
+        species_reference_id = reaction['referenceId'] + "_" + role + "_" + str(len(reaction['speciesReferences']))
+        reaction['speciesReferences'].append({'id': species_reference_id + "_glyph",
+                                              'referenceId': species_reference_id,
+                                              'reaction': reaction['referenceId'],
+                                              'species': "species_" + str(species_index),
+                                              'speciesGlyph': "species_" + str(species_index) + "_glyph",
+                                              'species_glyph_id': "species_" + str(species_index) + "_glyph",
+                                              'species_index': species_index, 'role': role})
+
+    def get_compartment_id(self, species_index):
+        row = species_index // self.number_of_columns
+        return "compartment_" + str(min(row // self.rows_per_compartment, len(self.compartments) - 1))
+
+    def get_random_name(self):
+        syllables = ["glu", "co", "se", "pyr", "uv", "ate", "phos", "pho", "fruc", "to", "kin", "ase", "ace", "tyl",
+                     "ad", "eno", "sine", "tri", "di", "nu", "cle", "o", "tide", "ox", "al", "lac"]
+        words = []
+        for w_index in range(self.random.randint(1, 3)):
+            words.append("".join(self.random.choice(syllables) for s_index in range(self.random.randint(1, 4))))
+
+        return "_".join(words)
+
+    def extract_entity_bounding_box(self, go):
+        # the bounding boxes follow from the positions of the species, without extracting the entities
+        if go['referenceId'].startswith("compartment_"):
+            return self.get_compartment_bounding_box(go)
+        elif go['referenceId'].startswith("species_"):
+            return self.get_species_bounding_box(int(go['referenceId'].split("_")[-1]))
+        elif go['referenceId'].startswith("reaction_"):
+            return self.get_reaction_bounding_box(int(go['referenceId'].split("_")[-1]))
+
+        return None
+
+    def get_compartment_bounding_box(self, compartment):
+        return {'x': -0.5 * self.horizontal_spacing,
+                'y': compartment['first_row'] * self.vertical_spacing - 0.5 * self.vertical_spacing,
+                'width': self.number_of_columns * self.horizontal_spacing,
+                'height': (compartment['last_row'] - compartment['first_row'] + 1) * self.vertical_spacing}
+
+    def get_species_bounding_box(self, s_index):
+        return {'x': self.species_positions[s_index][0] - 0.5 * self.species_width,
+                'y': self.species_positions[s_index][1] - 0.5 * self.species_height,
+                'width': self.species_width, 'height': self.species_height}
+
+    def get_reaction_center(self, r_index):
+        start_x, start_y = self.species_positions[r_index]
+        end_x, end_y = self.species_positions[r_index + 1]
+        return 0.5 * (start_x + end_x), 0.5 * (start_y + end_y)
+
+    def get_reaction_bounding_box(self, r_index):
+        center_x, center_y = self.get_reaction_center(r_index)
+        return {'x': center_x - 5.0, 'y': center_y - 5.0, 'width': 10.0, 'height': 10.0}
+
+    def extract_compartment_features(self, compartment):
+        bounding_box = self.get_compartment_bounding_box(compartment)
+        compartment['features'] = {'boundingBox': bounding_box,
+                                   'graphicalShape': {'strokeColor': "dark_red", 'strokeWidth': 3.0,
+                                                      'fillColor': "light_gray",
+                                                      'geometricShapes': [self.get_rectangle_shape(10.0)]}}
+        compartment['texts'] = [{'features': {'plainText': compartment['referenceId'],
+                                              'boundingBox': {'x': bounding_box['x'] + 10.0,
+                                                              'y': bounding_box['y'] + 5.0,
+                                                              'width': 200.0, 'height': 20.0},
+                                              'graphicalText': {'strokeColor': "dark_red", 'fontFamily': "sans-serif",
+                                                                'fontSize': {'abs': 14.0, 'rel': 0.0},
+                                                                'fontWeight': "bold", 'hTextAnchor': "start",
+                                                                'vTextAnchor': "top"}}}]
+        self.extract_extents(bounding_box)
+
+    def extract_species_features(self, species):
+        s_index = int(species['referenceId'].split("_")[-1])
+        bounding_box = self.get_species_bounding_box(s_index)
+        species['features'] = {'boundingBox': bounding_box, 'graphicalShape': self.get_species_graphical_shape(s_index)}
+        species['texts'] = [{'features': {'plainText': species['name'], 'boundingBox': dict(bounding_box),
+                                          'graphicalText': {'strokeColor': "black",
+                                                            'fontFamily': ["sans-serif", "serif", "monospace"][s_index % 3],
+                                                            'fontSize': {'abs': 10.0 + s_index % 5, 'rel': 0.0},
+                                                            'fontStyle': ["normal", "italic"][(s_index // 3) % 2],
+                                                            'fontWeight': ["normal", "bold"][(s_index // 7) % 2],
+                                                            'hTextAnchor': "middle", 'vTextAnchor': "middle"}}}]
+        self.extract_extents(bounding_box)
+
+    def get_species_graphical_shape(self, species_index):
+        shape_index = species_index % 4
+        if shape_index == 0:
+            return {'strokeColor': "black", 'strokeWidth': 2.0, 'fillColor': "linear_gradient",
+                    'geometricShapes': [self.get_rectangle_shape(6.0)]}
+        elif shape_index == 1:
+            return {'strokeColor': "steel_blue", 'strokeWidth': 2.0, 'fillColor': "radial_gradient",
+                    'geometricShapes': [self.get_ellipse_shape()]}
+        elif shape_index == 2:
+            return {'strokeColor': "sea_green", 'strokeWidth': 1.5, 'fillColor': "gold",
+                    'geometricShapes': [self.get_polygon_shape([(0.0, 50.0), (25.0, 0.0), (75.0, 0.0), (100.0, 50.0),
+                                                                (75.0, 100.0), (25.0, 100.0)])]}
+
+        return {'strokeColor': "black", 'strokeWidth': 1.0, 'strokeDashArray': (5, 3), 'fillColor': "salmon",
+                'geometricShapes': [self.get_rectangle_shape(0.0)]}
+
+    def extract_reaction_features(self, reaction):
+        r_index = int(reaction['referenceId'].split("_")[-1])
+        center_x, center_y = self.get_reaction_center(r_index)
+        reaction['center'] = (center_x, center_y)
+        reaction['features'] = {'boundingBox': self.get_reaction_bounding_box(r_index),
+                                'curve': [{'startX': center_x - 5.0, 'startY': center_y,
+                                           'endX': center_x + 5.0, 'endY': center_y}],
+                                'graphicalCurve': {'strokeColor': "black", 'strokeWidth': 2.0}}
+        reaction['texts'] = []
+        for species_reference in reaction['speciesReferences']:
+            species_reference['center'] = reaction['center']
+
+    def extract_species_reference_features(self, species_reference):
+        species_x, species_y = self.species_positions[species_reference['species_index']]
+        reaction_x, reaction_y = species_reference['center']
+        role = species_reference['role']
+        # the curve goes from the reaction towards the border of the species
+        slope = math.atan2(species_y - reaction_y, species_x - reaction_x)
+        end_x = species_x - (0.5 * self.species_width + 5.0) * math.cos(slope)
+        end_y = species_y - (0.5 * self.species_height + 5.0) * math.sin(slope)
+        segment = {'startX': reaction_x, 'startY': reaction_y, 'endX': end_x, 'endY': end_y}
+        if role == "product" or role == "sidesubstrate":
+            segment['basePoint1X'] = reaction_x + 0.5 * (end_x - reaction_x)
+            segment['basePoint1Y'] = reaction_y
+            segment['basePoint2X'] = end_x
+            segment['basePoint2Y'] = reaction_y + 0.5 * (end_y - reaction_y)
+        graphical_curve = {'strokeColor': "black", 'strokeWidth': 2.0, 'heads': {}}
+        if role == "product":
+            graphical_curve['heads']['end'] = "arrow"
+        elif role == "modifier":
+            graphical_curve['strokeColor'] = "steel_blue"
+            graphical_curve['strokeDashArray'] = (4, 2)
+            graphical_curve['heads']['end'] = "circle"
+        elif role == "sidesubstrate":
+            graphical_curve['heads']['end'] = "bar"
+        species_reference['features'] = {'curve': [segment], 'graphicalCurve': graphical_curve,
+                                         'startPoint': {'x': reaction_x, 'y': reaction_y},
+                                         'endPoint': {'x': end_x, 'y': end_y}}
+        if 'basePoint1X' in list(segment.keys()):
+            species_reference['features']['startSlope'] = math.atan2(reaction_y - segment['basePoint1Y'],
+                                                                     reaction_x - segment['basePoint1X'])
+            species_reference['features']['endSlope'] = math.atan2(end_y - segment['basePoint2Y'],
+                                                                   end_x - segment['basePoint2X'])
+        else:
+            species_reference['features']['startSlope'] = math.atan2(reaction_y - end_y, reaction_x - end_x)
+            species_reference['features']['endSlope'] = math.atan2(end_y - reaction_y, end_x - reaction_x)
+
+    def extract_color_features(self, color):
+        color['features'] = {'value': color['value']}
+
+    def extract_gradient_features(self, gradient):
+        gradient['features'] = {'type': gradient['type'], 'spreadMethod': "pad",
+                                'stops': [{'offset': {'abs': 0, 'rel': 0.0}, 'color': "white"},
+                                          {'offset': {'abs': 0, 'rel': 100.0}, 'color': "steel_blue"}]}
+        if gradient['type'] == "linear":
+            gradient['features']['start'] = {'x': {'abs': 0.0, 'rel': 0.0}, 'y': {'abs': 0.0, 'rel': 0.0}}
+            gradient['features']['end'] = {'x': {'abs': 0.0, 'rel': 100.0}, 'y': {'abs': 0.0, 'rel': 100.0}}
+        else:
+            gradient['features']['center'] = {'x': {'abs': 0.0, 'rel': 50.0}, 'y': {'abs': 0.0, 'rel': 50.0}}
+            gradient['features']['focalPoint'] = {'x': {'abs': 0.0, 'rel': 50.0}, 'y': {'abs': 0.0, 'rel': 50.0}}
+            gradient['features']['radius'] = {'abs': 0.0, 'rel': 50.0}
+
+    def extract_line_ending_features(self, line_ending):
+        line_ending['features'] = {'enableRotation': True}
+        if line_ending['id'] == "arrow":
+            line_ending['features']['boundingBox'] = {'x': -12.0, 'y': -6.0, 'width': 12.0, 'height': 12.0}
+            line_ending['features']['graphicalShape'] = \
+                {'strokeColor': "black", 'strokeWidth': 1.0, 'fillColor': "black",
+                 'geometricShapes': [self.get_polygon_shape([(0.0, 0.0), (100.0, 50.0), (0.0, 100.0)])]}
+        elif line_ending['id'] == "bar":
+            line_ending['features']['boundingBox'] = {'x': -2.0, 'y': -8.0, 'width': 4.0, 'height': 16.0}
+            line_ending['features']['graphicalShape'] = \
+                {'strokeColor': "black", 'strokeWidth': 1.0, 'fillColor': "black",
+                 'geometricShapes': [self.get_rectangle_shape(0.0)]}
+        else:
+            line_ending['features']['boundingBox'] = {'x': -10.0, 'y': -5.0, 'width': 10.0, 'height': 10.0}
+            line_ending['features']['graphicalShape'] = \
+                {'strokeColor': "steel_blue", 'strokeWidth': 1.0, 'fillColor': "white",
+                 'geometricShapes': [self.get_ellipse_shape()]}
+
+    def extract_extents(self, bounding_box):
+        self.extents['minX'] = min(self.extents['minX'], bounding_box['x'])
+        self.extents['maxX'] = max(self.extents['maxX'], bounding_box['x'] + bounding_box['width'])
+        self.extents['minY'] = min(self.extents['minY'], bounding_box['y'])
+        self.extents['maxY'] = max(self.extents['maxY'], bounding_box['y'] + bounding_box['height'])
+
+    @staticmethod
+    def get_rectangle_shape(corner_radius):
+        return {'shape': "rectangle", 'x': {'abs': 0.0, 'rel': 0.0}, 'y': {'abs': 0.0, 'rel': 0.0},
+                'width': {'abs': 0.0, 'rel': 100.0}, 'height': {'abs': 0.0, 'rel': 100.0},
+                'rx': {'abs': corner_radius, 'rel': 0.0}, 'ry': {'abs': corner_radius, 'rel': 0.0}}
+
+    @staticmethod
+    def get_ellipse_shape():
+        return {'shape': "ellipse", 'cx': {'abs': 0.0, 'rel': 50.0}, 'cy': {'abs': 0.0, 'rel': 50.0},
+                'rx': {'abs': 0.0, 'rel': 50.0}, 'ry': {'abs': 0.0, 'rel': 50.0}}
+
+    @staticmethod
+    def get_polygon_shape(vertices):
+        return {'shape': "polygon", 'vertices': [{'renderPointX': {'abs': 0.0, 'rel': x},
+                                                  'renderPointY': {'abs': 0.0, 'rel': y}} for x, y in vertices]}
@@ -0,0 +1,53 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+from benchmark import NetworkInfoBenchmark
+
+
+def test_errors_fail_the_check():
+    benchmark = NetworkInfoBenchmark([10, 100])
+    benchmark.add_measurement("import", "sbml", 10, {'error': "unavailable"})
+    benchmark.add_measurement("export", "escher", 10, {'error': "KeyError: 'SBMLObject'"})
+    assert benchmark.check() == ["export.escher (n=10): KeyError: 'SBMLObject'"]
+
+
+def test_superlinear_growth_fails_the_check():
+    benchmark = NetworkInfoBenchmark([100, 1000, 10000])
+    for size in [100, 1000, 10000]:
+        benchmark.add_measurement("import", "sbml", size, {'wallTime': 1e-5 * size ** 2})
+    assert len(benchmark.check()) == 1
+
+
+def test_growth_at_small_sizes_fails_the_check():
+    benchmark = NetworkInfoBenchmark([10, 100, 300])
+    for size, wall_time in [(10, 0.004), (100, 0.047), (300, 0.366)]:
+        benchmark.add_measurement("import", "network_editor", size, {'wallTime': wall_time})
+    assert len(benchmark.check()) == 1
+
+
+def test_linear_growth_passes_the_check():
+    benchmark = NetworkInfoBenchmark([10, 100, 1000])
+    for size in [10, 100, 1000]:
+        benchmark.add_measurement("export", "sbml", size, {'wallTime': 0.01 + 0.0001 * size,
+                                                           'peakMemory': 4096 * size})
+    assert benchmark.check() == []
+
+
+def test_synthetic_models_are_exported_without_errors(tmp_path):
+    benchmark = NetworkInfoBenchmark([5, 15], str(tmp_path))
+    benchmark.measure_memory = False
+    benchmark.importers = ["network_editor"]
+    benchmark.run()
+    assert benchmark.get_errors() == []
+
+
+def test_small_run_measures_every_case(tmp_path):
+    benchmark = NetworkInfoBenchmark([5], str(tmp_path))
+    benchmark.measure_memory = False
+    benchmark.importers = ["network_editor"]
+    benchmark.exporters = ["network_editor", "sbml"]
+    results = benchmark.run()
+    assert sorted(results.keys()) == ["export.network_editor", "export.sbml", "generate.model",
+                                      "import.network_editor"]
+    assert all('wallTime' in case['measurements'][5] for case in results.values())
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import libsbml
+from networkinfotranslator.exports.export_sbml import NetworkInfoExportToSBMLModel
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+def get_model(number_of_reactions, seed=0):
+    model = NetworkInfoSyntheticModel(number_of_reactions, seed)
+    model.extract_info()
+    model.extract_entity_features()
+    return model
+
+
+def test_model_has_the_requested_number_of_reactions():
+    model = get_model(25)
+    assert len(model.reactions) == 25
+    assert len(model.species) == 26
+    assert all(len(reaction['speciesReferences']) for reaction in model.reactions)
+    for go in model.compartments + model.species + model.reactions:
+        bounding_box = go['features']['boundingBox']
+        assert model.extents['minX'] <= bounding_box['x']
+        assert bounding_box['x'] + bounding_box['width'] <= model.extents['maxX']
+
+
+def test_model_is_generated_from_its_seed():
+    first_model = get_model(10)
+    second_model = get_model(10)
+    assert [species['name'] for species in first_model.species] == \
+        [species['name'] for species in second_model.species]
+    assert [species['features'] for species in first_model.species] == \
+        [species['features'] for species in second_model.species]
+
+
+def test_gradients_are_written_to_sbml_with_their_ids():
+    exporter = NetworkInfoExportToSBMLModel()
+    exporter.extract_graph_info(get_model(5))
+    gradient_definitions = exporter.global_render.getListOfGradientDefinitions()
+    assert sorted(gradient_definitions.get(g_index).getId() for g_index in range(gradient_definitions.size())) == \
+        ["linear_gradient", "radial_gradient"]
+    assert exporter.global_render.getGradientDefinition("radial_gradient").getTypeCode() == \
+        libsbml.SBML_RENDER_RADIALGRADIENT
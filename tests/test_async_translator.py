@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import asyncio
+import threading
+import time
+from networkinfotranslator import network_info_translator
+from networkinfotranslator.async_translator import NetworkInfoAsyncTranslator
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+@pytest.fixture
+def source():
+    model = NetworkInfoSyntheticModel(10)
+    model.extract_info()
+    return network_info_translator.export_info(model, "network_editor")
+
+
+def test_async_translation_is_the_same_as_the_conversion(source):
+    async def translate():
+        async with NetworkInfoAsyncTranslator() as translator:
+            return await asyncio.gather(translator.translate(source, "sbml"),
+                                        translator.translate(source, "cytoscapejs"))
+
+    sbml, cytoscapejs = asyncio.run(translate())
+    assert sbml == network_info_translator.convert(source, "sbml")
+    assert cytoscapejs == network_info_translator.convert(source, "cytoscapejs")
+
+
+def test_unsupported_formats_are_reported(source):
+    with pytest.raises(ValueError):
+        network_info_translator.convert(source, "svg")
+
+
+def test_concurrent_conversions_are_limited():
+    lock = threading.Lock()
+    counts = {'running': 0, 'maxRunning': 0}
+
+    def convert():
+        with lock:
+            counts['running'] += 1
+            counts['maxRunning'] = max(counts['maxRunning'], counts['running'])
+        time.sleep(0.02)
+        with lock:
+            counts['running'] -= 1
+
+    async def run_all():
+        async with NetworkInfoAsyncTranslator(max_concurrent_conversions=2) as translator:
+            await asyncio.gather(*[translator.run(convert) for c_index in range(8)])
+
+    asyncio.run(run_all())
+    assert counts['maxRunning'] == 2
+
+
+def test_slow_conversions_time_out():
+    async def run_slow():
+        async with NetworkInfoAsyncTranslator(timeout=0.01) as translator:
+            await translator.run(time.sleep, 0.5)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run_slow())
@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import json
+import libsbml
+from networkinfotranslator.imports.import_base import NetworkInfoImportBase
+from networkinfotranslator.profiling.backend_profiler import NetworkInfoBackendProfiler
+from networkinfotranslator.profiling.instrumentation import NetworkInfoInstrumentation
+
+
+class NetworkInfoBackend:
+    def get_id(self, sbml_object):
+        return sbml_object.getId()
+
+    def get_value(self, value, scale=1):
+        return scale * value
+
+
+def test_calls_repeating_their_arguments_are_counted_as_redundant():
+    profiler = NetworkInfoBackendProfiler()
+    backend = profiler.wrap(NetworkInfoBackend())
+    for value in [1, 2, 1, 1]:
+        assert backend.get_value(value) == value
+    assert backend.get_value(1, scale=2) == 2
+    report = {function['function']: function for function in profiler.get_report()}
+    assert report['get_value']['calls'] == 5
+    assert report['get_value']['distinctCalls'] == 3
+    assert report['get_value']['redundantCalls'] == 2
+    assert report['get_value']['mostRepeatedArguments'] == [{'arguments': repr((1,)), 'calls': 3}]
+    assert profiler.get_summary()['redundantCalls'] == 2
+    assert json.loads(profiler.to_json())['summary']['calls'] == 5
+
+
+def test_swig_objects_are_keyed_by_their_native_object():
+    document = libsbml.SBMLDocument(3, 1)
+    model = document.createModel()
+    model.setId("model")
+    profiler = NetworkInfoBackendProfiler()
+    backend = profiler.wrap(NetworkInfoBackend())
+    # each call to getModel() returns a new proxy of the same native object
+    backend.get_id(document.getModel())
+    backend.get_id(document.getModel())
+    assert profiler.get_report()[0]['redundantCalls'] == 1
+
+
+def test_importers_wrap_their_backend_with_the_profiler_and_the_instrumentation():
+    importer = NetworkInfoImportBase()
+    importer.backend_profiler = NetworkInfoBackendProfiler()
+    importer.instrumentation = NetworkInfoInstrumentation()
+    backend = importer.wrap_backend(NetworkInfoBackend())
+    with importer.instrumentation.stage("extract"):
+        backend.get_value(3)
+    assert importer.backend_profiler.get_summary()['calls'] == 1
+    assert importer.instrumentation.as_dict()["extract"]['backendCalls'] == 1
@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+class NetworkInfoReleasingSyntheticModel(NetworkInfoSyntheticModel):
+    # a synthetic model whose species are extracted lazily, counting the releases of its native objects
+    def __init__(self, number_of_reactions=5):
+        super().__init__(number_of_reactions)
+        self.lazy_features = True
+        self.number_of_releases = 0
+
+    def supports_lazy_features(self):
+        return True
+
+    def release_native_objects(self):
+        self.number_of_releases += 1
+
+
+def get_model():
+    model = NetworkInfoReleasingSyntheticModel()
+    model.extract_info()
+    return model
+
+
+def test_detach_keeps_the_features_as_plain_data():
+    model = get_model()
+    model.detach()
+    assert model.is_frozen and model.is_closed
+    assert model.number_of_releases == 1
+    assert all(species['features']['boundingBox'] for species in model.species)
+
+
+def test_the_importer_is_closed_by_the_context_manager():
+    with get_model() as model:
+        assert not model.is_closed
+    assert model.is_closed
+    assert model.number_of_releases == 1
+
+
+def test_a_closed_importer_cannot_extract_its_features():
+    model = get_model()
+    model.close()
+    with pytest.raises(ValueError):
+        model.extract_entity_features()
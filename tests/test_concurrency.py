@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import concurrent.futures
+import json
+import threading
+from networkinfotranslator import network_info_translator
+from networkinfotranslator.exports.export_network_editor import NetworkInfoExportToNetworkEditor
+from networkinfotranslator.profiling.instrumentation import NetworkInfoInstrumentation
+from synthetic_model import NetworkInfoSyntheticModel
+
+target_formats = ["png", "pdf", "cytoscapejs", "escher", "network_editor", "sbml"]
+
+
+@pytest.fixture(scope="module")
+def network_editor_graph(tmp_path_factory):
+    model = NetworkInfoSyntheticModel(20)
+    model.extract_info()
+    exporter = NetworkInfoExportToNetworkEditor()
+    exporter.extract_graph_info(model)
+    file_name = str(tmp_path_factory.mktemp("graph") / "graph.json")
+    exporter.export(file_name)
+    with open(file_name) as json_file:
+        return json.load(json_file)
+
+
+def test_concurrent_conversions_to_formats_match_a_sequential_one(network_editor_graph):
+    expected_outputs = network_info_translator.convert_to_formats(network_editor_graph, target_formats)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(network_info_translator.convert_to_formats, network_editor_graph, target_formats)
+                   for c_index in range(8)]
+        outputs = [future.result() for future in futures]
+    for output in outputs:
+        assert sorted(output.keys()) == sorted(target_formats)
+        for target_format in ["cytoscapejs", "escher", "network_editor", "sbml"]:
+            assert output[target_format] == expected_outputs[target_format]
+        assert output["png"].startswith(b"\x89PNG")
+
+
+def test_shared_exporters_are_created_once():
+    network_info_translator.shared_exporters.clear()
+    barrier = threading.Barrier(8)
+
+    def get_shared_exporter():
+        barrier.wait()
+        return network_info_translator.get_shared_exporter("sbml")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        exporters = list(executor.map(lambda e_index: get_shared_exporter(), range(8)))
+    assert all(exporter is exporters[0] for exporter in exporters)
+
+
+def test_clones_sharing_an_instrumentation_keep_their_stages_apart(network_editor_graph):
+    graph_info = network_info_translator.import_info(network_editor_graph)
+    graph_info.freeze()
+    exporter = network_info_translator.get_exporter("network_editor")
+    exporter.instrumentation = NetworkInfoInstrumentation()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda b_index: exporter.build(graph_info), range(16)))
+    stages = exporter.instrumentation.as_dict()
+    assert all("/" not in stage_name for stage_name in stages)
+    assert stages["NetworkInfoExportToNetworkEditor.add_species"]['calls'] == 16
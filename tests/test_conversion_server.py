@@ -0,0 +1,92 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import concurrent.futures.process
+import http.client
+import json
+from networkinfotranslator import network_info_translator
+from networkinfotranslator.conversion_server import NetworkInfoConversionServer
+from networkinfotranslator.imports.import_sbml import NetworkInfoImportFromSBMLModel
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+@pytest.fixture(scope="module")
+def conversion_server():
+    conversion_server = NetworkInfoConversionServer(port=0, number_of_workers=1, max_queued_requests=0)
+    conversion_server.start()
+    yield conversion_server
+    conversion_server.shutdown()
+
+
+@pytest.fixture(scope="module")
+def source():
+    model = NetworkInfoSyntheticModel(5)
+    model.extract_info()
+    return network_info_translator.export_info(model, "network_editor")
+
+
+def request(conversion_server, method, path, body=None):
+    host, port = conversion_server.get_address()[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=60)
+    try:
+        connection.request(method, path, body)
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+def test_health(conversion_server):
+    status, headers, body = request(conversion_server, "GET", "/health")
+    assert status == 200
+    assert json.loads(body)['workers'] == 1
+
+
+def test_conversion(conversion_server, source):
+    status, headers, body = request(conversion_server, "POST", "/convert/sbml", source)
+    assert status == 200
+    assert headers['Content-Type'] == "application/xml"
+    assert body == network_info_translator.convert(source, "sbml")
+    assert "total;dur=" in headers['Server-Timing']
+
+    status, headers, body = request(conversion_server, "POST", "/convert?format=cytoscapejs", source)
+    assert status == 200
+    assert body == network_info_translator.convert(source, "cytoscapejs")
+
+
+def test_bad_requests(conversion_server, source):
+    assert request(conversion_server, "POST", "/convert/svg", source)[0] == 400
+    assert request(conversion_server, "POST", "/convert/sbml", b"")[0] == 400
+    assert request(conversion_server, "POST", "/translate/sbml", source)[0] == 404
+
+
+def test_requests_over_the_queue_are_turned_away(conversion_server, source):
+    assert conversion_server.slots.acquire(blocking=False)
+    try:
+        status, headers, body = request(conversion_server, "POST", "/convert/sbml", source)
+    finally:
+        conversion_server.slots.release()
+    assert status == 503
+    assert headers['Retry-After'] == "1"
+
+
+def test_request_bodies_are_not_read_as_files(conversion_server, source, tmp_path):
+    source_file = tmp_path / "source.json"
+    source_file.write_bytes(source)
+    status, headers, body = request(conversion_server, "POST", "/convert/network_editor", str(source_file))
+    assert status == 422
+
+    import_from_sbml = NetworkInfoImportFromSBMLModel()
+    import_from_sbml.read_only_content = True
+    assert import_from_sbml.read_sbml_source(str(source_file)) == str(source_file)
+
+
+def test_broken_workers_are_turned_away(conversion_server, source, monkeypatch):
+    def convert(source, target_format):
+        raise concurrent.futures.process.BrokenProcessPool("a worker stopped")
+
+    monkeypatch.setattr(conversion_server, "convert", convert)
+    status, headers, body = request(conversion_server, "POST", "/convert/sbml", source)
+    assert status == 503
+    assert headers['Retry-After'] == "1"
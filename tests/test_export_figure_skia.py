@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+from networkinfotranslator.exports.export_figure_skia import NetworkInfoExportToSkia
+from networkinfotranslator.profiling.instrumentation import NetworkInfoInstrumentation
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+def get_model():
+    model = NetworkInfoSyntheticModel(5)
+    model.extract_info()
+    return model
+
+
+def test_the_label_blobs_are_shared_by_the_renders(tmp_path):
+    exporter = NetworkInfoExportToSkia()
+    exporter.render(get_model(), str(tmp_path / "first.png"))
+    misses = exporter.text_blob_cache.get_statistics()['misses']
+    assert misses > 0
+    exporter.render(get_model(), str(tmp_path / "second.png"))
+    assert exporter.text_blob_cache.get_statistics()['misses'] == misses
+    assert exporter.text_blob_cache.get_statistics()['hits'] >= misses
+
+
+def test_the_cache_lookups_are_counted():
+    instrumentation = NetworkInfoInstrumentation()
+    with instrumentation.stage("draw_text"):
+        instrumentation.add_cache_lookup(True)
+        instrumentation.add_cache_lookup(False)
+        instrumentation.add_cache_lookup(False)
+    assert instrumentation.stages['draw_text']['cacheHits'] == 1
+    assert instrumentation.stages['draw_text']['cacheMisses'] == 2
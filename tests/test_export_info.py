@@ -0,0 +1,50 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import asyncio
+import tempfile
+from networkinfotranslator import network_info_translator
+from networkinfotranslator.async_translator import NetworkInfoAsyncTranslator
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+@pytest.fixture
+def graph_info():
+    model = NetworkInfoSyntheticModel(10)
+    model.extract_info()
+    return model
+
+
+@pytest.mark.parametrize("target_format", ["png", "jpg", "cytoscapejs", "escher", "network_editor", "sbml"])
+def test_bytes_are_the_same_as_the_file(graph_info, target_format, tmp_path):
+    extension = network_info_translator.get_export_formats()[target_format][1]
+    file_name = str(tmp_path / ("network." + extension))
+    network_info_translator.export_info(graph_info, target_format, file_name)
+    with open(file_name, 'rb') as output_file:
+        assert network_info_translator.export_info(graph_info, target_format) == output_file.read()
+
+
+def test_bytes_are_written_without_a_temporary_file(graph_info, monkeypatch):
+    def mkdtemp(*args, **kwargs):
+        raise AssertionError("a temporary directory was made")
+
+    monkeypatch.setattr(tempfile, "mkdtemp", mkdtemp)
+    for target_format in ["png", "pdf", "cytoscapejs", "escher", "network_editor", "sbml"]:
+        assert network_info_translator.export_info(graph_info, target_format)
+
+
+def test_async_translations_to_formats(graph_info):
+    source = network_info_translator.export_info(graph_info, "network_editor")
+    target_formats = ["png", "cytoscapejs", "network_editor", "sbml"]
+    expected_outputs = network_info_translator.convert_to_formats(source, target_formats)
+
+    async def translate_all():
+        async with NetworkInfoAsyncTranslator(max_concurrent_conversions=4) as translator:
+            return await asyncio.gather(*[translator.translate_to_formats(source, target_formats)
+                                          for t_index in range(8)])
+
+    for outputs in asyncio.run(translate_all()):
+        for target_format in ["cytoscapejs", "network_editor", "sbml"]:
+            assert outputs[target_format] == expected_outputs[target_format]
+        assert outputs["png"].startswith(b"\x89PNG")
@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import math
+from networkinfotranslator.imports.import_base import NetworkInfoImportBase
+from networkinfotranslator.exports.export_network_editor import NetworkInfoExportToNetworkEditor
+
+
+class NetworkInfoImportEdges(NetworkInfoImportBase):
+    # a reaction between two species, one of which has two glyphs
+    def __init__(self):
+        super().__init__()
+        self.reset_info()
+        self.species = [self.get_go("S1_glyph_a", "S1", 0.0, 0.0, 40.0, 20.0),
+                        self.get_go("S1_glyph_b", "S1", 0.0, 200.0, 40.0, 20.0),
+                        self.get_go("S2_glyph", "S2", 200.0, 0.0, 40.0, 20.0)]
+        reaction = self.get_go("R_glyph", "R", 100.0, 0.0, 20.0, 20.0)
+        reaction['speciesReferences'] = [
+            {'id': "SR1_glyph", 'referenceId': "SR1", 'species': "S1", 'speciesGlyph': "S1_glyph_a",
+             'role': "substrate", 'features': {}},
+            {'id': "SR2_glyph", 'referenceId': "SR2", 'species': "S2", 'speciesGlyph': "S2_glyph",
+             'role': "product", 'features': {}}]
+        self.reactions = [reaction]
+
+    @staticmethod
+    def get_go(glyph_id, reference_id, x, y, width, height):
+        return {'id': glyph_id, 'referenceId': reference_id, 'texts': [],
+                'features': {'boundingBox': {'x': x, 'y': y, 'width': width, 'height': height}}}
+
+    def extract_entity_features(self):
+        pass
+
+
+def get_edges(graph_info):
+    exporter = NetworkInfoExportToNetworkEditor()
+    exporter.extract_graph_info(graph_info)
+    return {edge['id']: edge for edge in exporter.edges}
+
+
+def test_edges_connect_the_species_glyph_of_their_species_reference():
+    edges = get_edges(NetworkInfoImportEdges())
+    assert edges["SR1_glyph"]['source']['node'] == "S1_glyph_a"
+    assert edges["SR1_glyph"]['target']['node'] == "R_glyph"
+    assert edges["SR2_glyph"]['source']['node'] == "R_glyph"
+    assert edges["SR2_glyph"]['target']['node'] == "S2_glyph"
+
+
+def test_edge_ends_are_clipped_at_the_node_borders():
+    edges = get_edges(NetworkInfoImportEdges())
+    assert edges["SR1_glyph"]['source']['position'] == pytest.approx({'x': 40.0, 'y': 10.0})
+    assert edges["SR1_glyph"]['target']['position'] == pytest.approx({'x': 100.0, 'y': 10.0})
+    assert edges["SR2_glyph"]['source']['position'] == pytest.approx({'x': 120.0, 'y': 10.0})
+    assert edges["SR2_glyph"]['target']['position'] == pytest.approx({'x': 200.0, 'y': 10.0})
+
+
+def test_diagonal_edge_ends_are_clipped_at_the_node_borders():
+    graph_info = NetworkInfoImportEdges()
+    graph_info.reactions[0]['speciesReferences'][0]['speciesGlyph'] = "S1_glyph_b"
+    edges = get_edges(graph_info)
+    # from the center of S1_glyph_b (20, 210) to the center of R_glyph (110, 10)
+    slope = math.atan2(10.0 - 210.0, 110.0 - 20.0)
+    assert edges["SR1_glyph"]['source']['position'] == \
+        pytest.approx({'x': 20.0 + 20.0 * math.cos(slope), 'y': 210.0 + 20.0 * math.sin(slope)})
+    assert edges["SR1_glyph"]['target']['position'] == \
+        pytest.approx({'x': 110.0 - 10.0 * math.cos(slope), 'y': 10.0 - 10.0 * math.sin(slope)})
+    assert edges["SR1_glyph"]['target']['position']['y'] > 10.0
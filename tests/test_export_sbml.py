@@ -0,0 +1,313 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import libsbml
+import io
+import gzip
+import bz2
+import zipfile
+from networkinfotranslator.imports.import_base import NetworkInfoImportBase
+from networkinfotranslator.imports.import_sbml import NetworkInfoImportFromSBMLModel
+from networkinfotranslator.exports.export_sbml import NetworkInfoExportToSBMLModel
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+class NetworkInfoImportStyled(NetworkInfoImportBase):
+    # species with the given fill colors, all in the same compartment
+    def __init__(self, fill_colors):
+        super().__init__()
+        self.reset_info()
+        self.extents = {'minX': 0.0, 'maxX': 100.0 * len(fill_colors), 'minY': 0.0, 'maxY': 100.0}
+        for s_index, fill_color in enumerate(fill_colors):
+            self.species.append({'id': "S{}_glyph".format(s_index), 'referenceId': "S{}".format(s_index),
+                                 'texts': [],
+                                 'features': {'boundingBox': {'x': 100.0 * s_index, 'y': 0.0,
+                                                              'width': 60.0, 'height': 36.0},
+                                              'graphicalShape': {'strokeColor': "black", 'strokeWidth': 1.0,
+                                                                 'fillColor': fill_color,
+                                                                 'geometricShapes': [{'shape': 'rectangle'}]}}})
+
+    def extract_entity_features(self):
+        pass
+
+
+def get_styles(fill_colors):
+    exporter = NetworkInfoExportToSBMLModel()
+    exporter.deduplicate_styles = True
+    exporter.extract_graph_info(NetworkInfoImportStyled(fill_colors))
+    local_render = exporter.local_render
+    styles = []
+    for s_index in range(local_render.getNumStyles()):
+        style = local_render.getStyle(s_index)
+        styles.append({'ids': sorted(style.createIdString().split()), 'types': sorted(style.createTypeString().split()),
+                       'fill': style.getGroup().getFill()})
+    return styles
+
+
+def test_glyphs_which_look_alike_are_bound_by_type():
+    styles = get_styles(["white", "white", "white"])
+    assert styles == [{'ids': [], 'types': ["SPECIESGLYPH"], 'fill': "white"}]
+
+
+def test_glyphs_which_look_different_are_listed_by_id():
+    styles = get_styles(["white", "red", "white"])
+    assert sorted(styles, key=lambda style: style['fill']) == \
+        [{'ids': ["S1_glyph"], 'types': [], 'fill': "red"},
+         {'ids': ["S0_glyph", "S2_glyph"], 'types': [], 'fill': "white"}]
+
+
+class NetworkInfoImportFromDocument(NetworkInfoImportStyled):
+    # the styled species, along with the SBML document they were exported to
+    def __init__(self, fill_colors):
+        super().__init__(fill_colors)
+        exporter = NetworkInfoExportToSBMLModel()
+        exporter.extract_graph_info(NetworkInfoImportStyled(fill_colors))
+        exporter.layout.setId("source_layout")
+        self.sbml_document = exporter.document
+
+    def get_sbml_document(self):
+        return self.sbml_document
+
+
+def pass_through(graph_info):
+    exporter = NetworkInfoExportToSBMLModel()
+    exporter.pass_through = True
+    exporter.extract_graph_info(graph_info)
+    return exporter.document
+
+
+def get_layout(document):
+    return document.getModel().getPlugin("layout").getLayout(0)
+
+
+def test_pass_through_copies_the_source_document():
+    graph_info = NetworkInfoImportFromDocument(["white", "red"])
+    document = pass_through(graph_info)
+    assert document is not graph_info.sbml_document
+    assert get_layout(document).getId() == "source_layout"
+
+
+def test_pass_through_writes_back_the_edits_of_extracted_info():
+    graph_info = NetworkInfoImportFromDocument(["white", "red"])
+    graph_info.has_entity_features = True
+    graph_info.species[1]['features']['boundingBox']['width'] = 123.0
+    document = pass_through(graph_info)
+    assert get_layout(document).getSpeciesGlyph("S1_glyph").getBoundingBox().getWidth() == 123.0
+    assert get_layout(document).getSpeciesGlyph("S0_glyph").getBoundingBox().getWidth() == 60.0
+    # the source document itself is left as it is
+    assert get_layout(graph_info.sbml_document).getSpeciesGlyph("S1_glyph").getBoundingBox().getWidth() == 60.0
+
+
+def test_pass_through_rebuilds_a_generated_layout():
+    graph_info = NetworkInfoImportFromDocument(["white", "red"])
+    graph_info.is_layout_modified = True
+    document = pass_through(graph_info)
+    assert get_layout(document).getId() == "NetworkInfoTranslator_Layout"
+
+
+def test_curves_are_written_with_their_segments():
+    graph_info = NetworkInfoImportStyled(["white"])
+    graph_info.reactions.append({'id': "R_glyph", 'referenceId': "R", 'texts': [],
+                                 'features': {'boundingBox': {'x': 40.0, 'y': 40.0, 'width': 20.0, 'height': 20.0},
+                                              'curve': [{'startX': 0.0, 'startY': 1.0, 'endX': 2.0, 'endY': 3.0},
+                                                        {'startX': 2.0, 'startY': 3.0, 'endX': 4.0, 'endY': 5.0,
+                                                         'basePoint1X': 6.0, 'basePoint1Y': 7.0,
+                                                         'basePoint2X': 8.0, 'basePoint2Y': 9.0}]}})
+    exporter = NetworkInfoExportToSBMLModel()
+    exporter.extract_graph_info(graph_info)
+    curve = exporter.layout.getReactionGlyph("R_glyph").getCurve()
+    assert exporter.get_glyph_curve(curve) == graph_info.reactions[0]['features']['curve']
+
+
+def test_bounding_boxes_are_written_into_the_glyphs():
+    graph_info = NetworkInfoImportStyled(["white"])
+    graph_info.reactions.append({'id': "R_glyph", 'referenceId': "R", 'texts': [],
+                                 'features': {'boundingBox': {'x': 40.0, 'y': 40.0, 'width': 20.0, 'height': 20.0},
+                                              'curve': [{'startX': 0.0, 'startY': 1.0, 'endX': 2.0, 'endY': 3.0}]}})
+    exporter = NetworkInfoExportToSBMLModel()
+    exporter.extract_graph_info(graph_info)
+    document = libsbml.readSBMLFromString(exporter.export_as_bytes().decode("utf-8"))
+    layout = get_layout(document)
+    species_bounding_box = layout.getSpeciesGlyph("S0_glyph").getBoundingBox()
+    assert species_bounding_box.getId() == "S0_glyph_bb"
+    assert (species_bounding_box.getX(), species_bounding_box.getWidth()) == (0.0, 60.0)
+    # the bounding box of a reaction glyph is written next to its curve
+    reaction_bounding_box = layout.getReactionGlyph("R_glyph").getBoundingBox()
+    assert reaction_bounding_box.getId() == "R_glyph_bb"
+    assert (reaction_bounding_box.getX(), reaction_bounding_box.getWidth()) == (40.0, 20.0)
+
+
+def test_check_formats_the_message_only_on_failure():
+    # a message which cannot be formatted shows that it is not formatted on success
+    NetworkInfoExportToSBMLModel.check(libsbml.LIBSBML_OPERATION_SUCCESS, 'set %s %s id', "S1")
+    with pytest.raises(SystemExit, match="set species S1 id"):
+        NetworkInfoExportToSBMLModel.check(libsbml.LIBSBML_INVALID_ATTRIBUTE_VALUE, 'set species %s id', "S1")
+    with pytest.raises(SystemExit, match="null value trying to create species S1"):
+        NetworkInfoExportToSBMLModel.check(None, 'create species %s', "S1")
+
+
+def get_exporter(fill_colors):
+    exporter = NetworkInfoExportToSBMLModel()
+    exporter.extract_graph_info(NetworkInfoImportStyled(fill_colors))
+    return exporter
+
+
+def read_species_ids(sbml):
+    document = libsbml.readSBMLFromString(sbml)
+    return [species.getId() for species in document.getModel().getListOfSpecies()]
+
+
+def test_compression_follows_the_extension_of_the_file_name(tmp_path):
+    exporter = get_exporter(["white", "red"])
+    exporter.export(str(tmp_path / "model.xml.gz"))
+    exporter.export(str(tmp_path / "model.sbml.zip"))
+    exporter.export(str(tmp_path / "model"))
+    assert read_species_ids(gzip.decompress((tmp_path / "model.xml.gz").read_bytes()).decode()) == ["S0", "S1"]
+    with zipfile.ZipFile(str(tmp_path / "model.sbml.zip")) as zip_file:
+        assert zip_file.namelist() == ["model.sbml"]
+    assert read_species_ids((tmp_path / "model.xml").read_text()) == ["S0", "S1"]
+
+
+def test_compression_attribute_adds_its_extension(tmp_path):
+    exporter = get_exporter(["white"])
+    exporter.compression = "bz2"
+    exporter.export(str(tmp_path / "model"))
+    assert read_species_ids(bz2.decompress((tmp_path / "model.xml.bz2").read_bytes()).decode()) == ["S0"]
+    with pytest.raises(ValueError):
+        exporter.export_as_bytes("rar")
+
+
+def test_export_writes_to_streams():
+    exporter = get_exporter(["white"])
+    text_stream = io.StringIO()
+    exporter.export(text_stream)
+    assert read_species_ids(text_stream.getvalue()) == ["S0"]
+
+    exporter.compression = "gzip"
+    binary_stream = io.BytesIO()
+    exporter.export(binary_stream)
+    assert read_species_ids(gzip.decompress(binary_stream.getvalue()).decode()) == ["S0"]
+    with pytest.raises(ValueError):
+        exporter.export(io.StringIO())
+
+
+class NetworkInfoSBMLSourceModel(NetworkInfoSyntheticModel):
+    # a synthetic model which is passed through as the SBML source it was exported to
+    def __init__(self, number_of_reactions=3):
+        super().__init__(number_of_reactions)
+        self.track_changes = True
+        self.sbml_source = None
+        self.number_of_parses = 0
+
+    def extract_info(self, graph=None):
+        super().extract_info(graph)
+        exporter = NetworkInfoExportToSBMLModel()
+        exporter.extract_graph_info(self)
+        self.sbml_source = exporter.export_as_bytes().decode("utf-8")
+        super().extract_info(graph)
+
+    def get_sbml_source(self):
+        return self.sbml_source
+
+    def get_sbml_document(self):
+        self.number_of_parses += 1
+        return libsbml.readSBMLFromString(self.sbml_source)
+
+
+def pass_through_and_read(graph_info):
+    exporter = NetworkInfoExportToSBMLModel()
+    exporter.pass_through = True
+    exporter.extract_graph_info(graph_info)
+    return libsbml.readSBMLFromString(exporter.export_as_bytes().decode("utf-8"))
+
+
+def test_pass_through_writes_resized_glyphs():
+    model = NetworkInfoSBMLSourceModel()
+    model.extract_info()
+    model.freeze()
+    model.species[0]['features']['boundingBox']['width'] = 123.0
+    model.reactions[0]['features']['boundingBox']['height'] = 45.0
+
+    document = pass_through_and_read(model)
+    layout = get_layout(document)
+    assert layout.getSpeciesGlyph(model.species[0]['id']).getBoundingBox().getWidth() == 123.0
+    # the bounding box of a reaction glyph with a curve is only written when it is set on the glyph
+    assert layout.getReactionGlyph(model.reactions[0]['id']).getBoundingBox().getHeight() == 45.0
+    assert layout.getSpeciesGlyph(model.species[1]['id']).getBoundingBox().getWidth() == model.species_width
+
+
+def test_pass_through_keeps_unchanged_glyphs():
+    model = NetworkInfoSBMLSourceModel()
+    model.extract_info()
+    model.freeze()
+
+    document = pass_through_and_read(model)
+    layout = get_layout(document)
+    for reaction in model.reactions:
+        bounding_box = layout.getReactionGlyph(reaction['id']).getBoundingBox()
+        assert bounding_box.getWidth() == reaction['features']['boundingBox']['width']
+
+
+def test_pass_through_writes_back_edits_of_unfrozen_info():
+    model = NetworkInfoSBMLSourceModel()
+    model.extract_info()
+    model.extract_entity_features()
+    model.species[0]['features']['boundingBox']['x'] = -321.0
+
+    document = pass_through_and_read(model)
+    assert get_layout(document).getSpeciesGlyph(model.species[0]['id']).getBoundingBox().getX() == -321.0
+    assert not model.is_frozen
+
+
+def test_pass_through_copies_an_unchanged_source_without_parsing_it():
+    model = NetworkInfoSBMLSourceModel()
+    model.extract_info()
+    model.freeze()
+
+    exporter = NetworkInfoExportToSBMLModel()
+    exporter.pass_through = True
+    exporter.extract_graph_info(model)
+    assert exporter.export_as_bytes().decode("utf-8") == model.sbml_source
+    assert model.number_of_parses == 0
+
+
+def test_pass_through_parses_an_edited_source_once():
+    model = NetworkInfoSBMLSourceModel()
+    model.extract_info()
+    model.freeze()
+    model.species[2]['features']['boundingBox']['y'] = 77.0
+
+    document = pass_through(model)
+    assert get_layout(document).getSpeciesGlyph(model.species[2]['id']).getBoundingBox().getY() == 77.0
+    assert model.number_of_parses == 1
+
+
+def test_pass_through_refuses_edited_render_features():
+    model = NetworkInfoSBMLSourceModel()
+    model.extract_info()
+    model.freeze()
+    model.species[0]['features']['graphicalShape']['fillColor'] = "gold"
+
+    with pytest.raises(ValueError, match=model.species[0]['id']):
+        pass_through(model)
+
+
+def test_changes_are_only_tracked_for_the_pass_through():
+    assert not NetworkInfoImportFromSBMLModel().track_changes
+    model = NetworkInfoSBMLSourceModel()
+    model.track_changes = False
+    model.extract_info()
+    NetworkInfoExportToSBMLModel().build(model)
+    assert not model.track_changes and not model.fingerprints
+
+    model = NetworkInfoSBMLSourceModel()
+    model.track_changes = False
+    model.extract_info()
+    exporter = NetworkInfoExportToSBMLModel()
+    exporter.pass_through = True
+    exporter.build(model)
+    assert model.track_changes and model.fingerprints
+    model.species[0]['features']['graphicalShape']['fillColor'] = "gold"
+    with pytest.raises(ValueError, match=model.species[0]['id']):
+        pass_through(model)
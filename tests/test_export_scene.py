@@ -0,0 +1,50 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import concurrent.futures
+from PIL import Image
+from networkinfotranslator.exports.export_cytoscapejs import NetworkInfoExportToCytoscapeJs
+from networkinfotranslator.exports.export_figure_matplotlib import NetworkInfoExportToMatPlotLib
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+def get_model(number_of_reactions=5):
+    model = NetworkInfoSyntheticModel(number_of_reactions)
+    model.extract_info()
+    return model
+
+
+def test_building_a_scene_leaves_the_exporter_as_it_is(tmp_path):
+    exporter = NetworkInfoExportToCytoscapeJs()
+    scene = exporter.build(get_model())
+    assert exporter.graph_info is None
+    assert not len(exporter.nodes)
+    assert scene.exporter is not exporter
+    assert len(scene.exporter.nodes)
+
+
+def test_figure_scenes_are_built_by_a_clone_which_keeps_its_figure():
+    exporter = NetworkInfoExportToMatPlotLib()
+    scene = exporter.build(get_model())
+    assert scene.exporter.recycle_figure
+    assert not exporter.recycle_figure
+
+
+def test_scenes_are_built_from_several_threads(tmp_path):
+    exporter = NetworkInfoExportToCytoscapeJs()
+    models = [get_model(number_of_reactions) for number_of_reactions in [2, 4, 6, 8]]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        scenes = list(executor.map(exporter.build, models))
+    for index, scene in enumerate(scenes):
+        assert scene.graph_info is models[index]
+        assert len([node for node in scene.exporter.nodes if node['data'].get('id', "").startswith("reaction_")]) \
+               == len(models[index].reactions)
+
+
+def test_figure_scenes_are_exported_more_than_once(tmp_path):
+    scene = NetworkInfoExportToMatPlotLib().build(get_model())
+    scene.export(str(tmp_path / "first.png"))
+    scene.export(str(tmp_path / "second.png"))
+    with Image.open(tmp_path / "first.png") as first_image, Image.open(tmp_path / "second.png") as second_image:
+        assert first_image.size == second_image.size
@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+from networkinfotranslator import network_info_translator
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+def get_model():
+    model = NetworkInfoSyntheticModel(10)
+    model.extract_info()
+    return model
+
+
+def test_outputs_are_the_same_as_the_single_exports():
+    outputs = network_info_translator.export_info_to_formats(get_model(), ["sbml", "cytoscapejs", "network_editor"])
+    assert sorted(outputs.keys()) == ["cytoscapejs", "network_editor", "sbml"]
+    for target_format in ["sbml", "cytoscapejs", "network_editor"]:
+        assert outputs[target_format] == network_info_translator.export_info(get_model(), target_format)
+
+
+def test_features_are_extracted_once():
+    model = get_model()
+    counts = {'species': 0}
+    extract_species_features = model.extract_species_features
+
+    def count_species_features(species):
+        counts['species'] += 1
+        extract_species_features(species)
+
+    model.extract_species_features = count_species_features
+    network_info_translator.export_info_to_formats(model, ["sbml", "cytoscapejs", "escher"])
+    assert model.is_frozen
+    assert counts['species'] == len(model.species)
+
+
+def test_outputs_are_written_to_the_given_files(tmp_path):
+    file_names = {'sbml': str(tmp_path / "model.xml"), 'cytoscapejs': str(tmp_path / "model.js")}
+    outputs = network_info_translator.export_info_to_formats(get_model(), file_names)
+    assert outputs == file_names
+    assert (tmp_path / "model.xml").read_bytes() == network_info_translator.export_info(get_model(), "sbml")
+
+
+def test_unsupported_formats_are_reported_before_exporting():
+    model = get_model()
+    with pytest.raises(ValueError):
+        network_info_translator.export_info_to_formats(model, ["sbml", "svg"])
+    assert not model.is_frozen
+
+
+def test_conversion_to_formats():
+    source = network_info_translator.export_info(get_model(), "network_editor")
+    outputs = network_info_translator.convert_to_formats(source, ["sbml", "cytoscapejs"])
+    assert outputs['sbml'] == network_info_translator.convert(source, "sbml")
+    assert outputs['cytoscapejs'] == network_info_translator.convert(source, "cytoscapejs")
@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+def test_freezing_keeps_the_features_restored_from_the_cache():
+    model = NetworkInfoSyntheticModel(3)
+    model.extract_info()
+    model.extract_entity_features()
+    snapshot = model.get_info_snapshot()
+    snapshot['species'][0]['features']['boundingBox']['x'] = 1234.0
+
+    restored_model = NetworkInfoSyntheticModel(3)
+    restored_model.extract_info()
+    restored_model.set_info_snapshot(snapshot)
+    restored_model.is_restored_from_cache = True
+    restored_model.freeze()
+    assert restored_model.is_frozen
+    assert restored_model.species[0]['features']['boundingBox']['x'] == 1234.0
+
+
+def test_extraction_is_repeated_until_the_info_is_frozen():
+    model = NetworkInfoSyntheticModel(3)
+    model.extract_info()
+    model.extract_entity_features()
+    assert model.has_entity_features and not model.is_frozen and not model.is_restored_from_cache
+    model.species[0]['features']['boundingBox']['x'] = 1234.0
+    model.extract_entity_features()
+    assert model.species[0]['features']['boundingBox']['x'] != 1234.0
+
+    model.freeze()
+    model.species[0]['features']['boundingBox']['x'] = 1234.0
+    model.extract_entity_features()
+    assert model.species[0]['features']['boundingBox']['x'] == 1234.0
@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+pytest.importorskip("libsbne")
+
+from networkinfotranslator.imports.import_sbml_sbne import NetworkInfoImportFromSBMLModelUsingLibSBNE
+
+
+class NetworkInfoStyle:
+    def __init__(self, group):
+        self.group = group
+
+
+class NetworkInfoStyleBackend:
+    # the style calls of libsbne, counting the reads of the render groups
+    def __init__(self):
+        self.number_of_group_reads = 0
+
+    def ne_stl_isSetGroup(self, style):
+        return style.group is not None
+
+    def ne_stl_getGroup(self, style):
+        self.number_of_group_reads += 1
+        return style.group
+
+
+def get_importer():
+    importer = NetworkInfoImportFromSBMLModelUsingLibSBNE()
+    importer.sbne = NetworkInfoStyleBackend()
+    return importer
+
+
+def extract_group_features(group):
+    return {'strokeColor': group}
+
+
+def test_the_group_of_a_style_is_read_once():
+    importer = get_importer()
+    style = NetworkInfoStyle("black")
+    first_features = importer.extract_style_features(style, extract_group_features)
+    second_features = importer.extract_style_features(style, extract_group_features)
+    assert first_features == second_features == {'strokeColor': "black"}
+    assert first_features is not second_features
+    assert importer.sbne.number_of_group_reads == 1
+    assert importer.extract_style_features(NetworkInfoStyle(None), extract_group_features) is None
+
+
+def test_the_style_features_are_kept_per_required_features():
+    importer = get_importer()
+    style = NetworkInfoStyle("black")
+    importer.extract_style_features(style, extract_group_features)
+    importer.required_features = {"texts"}
+    importer.extract_style_features(style, extract_group_features)
+    assert importer.sbne.number_of_group_reads == 2
+
+
+def test_the_style_features_are_dropped_with_the_native_objects():
+    importer = get_importer()
+    importer.extract_style_features(NetworkInfoStyle("black"), extract_group_features)
+    importer.release_native_objects()
+    assert not importer.style_features
@@ -0,0 +1,76 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import json
+from networkinfotranslator.imports.import_base import NetworkInfoImportBase
+from networkinfotranslator.exports.export_sbml import NetworkInfoExportToSBMLModel
+from networkinfotranslator.profiling.instrumentation import NetworkInfoInstrumentation, \
+    NetworkInfoNoInstrumentation
+
+
+class NetworkInfoImportTwoSpecies(NetworkInfoImportBase):
+    def __init__(self):
+        super().__init__()
+        self.reset_info()
+        self.extents = {'minX': 0.0, 'maxX': 200.0, 'minY': 0.0, 'maxY': 100.0}
+        for s_index in range(2):
+            self.species.append({'id': "S{}_glyph".format(s_index), 'referenceId': "S{}".format(s_index),
+                                 'texts': [],
+                                 'features': {'boundingBox': {'x': 100.0 * s_index, 'y': 0.0,
+                                                              'width': 60.0, 'height': 36.0}}})
+
+    def extract_entity_features(self):
+        pass
+
+
+class NetworkInfoBackend:
+    def __init__(self):
+        self.name = "backend"
+
+    def get_value(self, value):
+        return value
+
+
+def test_nested_stages_are_kept_apart():
+    instrumentation = NetworkInfoInstrumentation()
+    for i in range(2):
+        with instrumentation.stage("export"):
+            instrumentation.add_entities(3)
+            with instrumentation.stage("encode"):
+                instrumentation.add_bytes_written(10)
+    with instrumentation.stage("encode"):
+        pass
+    stages = instrumentation.as_dict()
+    assert sorted(stages.keys()) == ["encode", "export", "export/encode"]
+    assert stages["export"]['calls'] == 2 and stages["export"]['entities'] == 6
+    assert stages["export/encode"]['bytesWritten'] == 20 and stages["encode"]['bytesWritten'] == 0
+    assert json.loads(instrumentation.to_json()) == stages
+
+
+def test_backend_calls_are_counted():
+    instrumentation = NetworkInfoInstrumentation()
+    backend = instrumentation.wrap_backend(NetworkInfoBackend())
+    with instrumentation.stage("extract"):
+        assert backend.get_value(1) == 1
+        assert backend.get_value(2) == 2
+        assert backend.name == "backend"
+    assert instrumentation.as_dict()["extract"]['backendCalls'] == 2
+
+
+def test_no_instrumentation_records_nothing():
+    instrumentation = NetworkInfoNoInstrumentation()
+    backend = NetworkInfoBackend()
+    assert instrumentation.wrap_backend(backend) is backend
+    with instrumentation.stage("export"):
+        instrumentation.add_entities(3)
+    assert instrumentation.as_dict() == {}
+
+
+def test_exporter_stages_are_prefixed_with_the_exporter():
+    exporter = NetworkInfoExportToSBMLModel()
+    exporter.instrumentation = NetworkInfoInstrumentation()
+    exporter.extract_graph_info(NetworkInfoImportTwoSpecies())
+    stages = exporter.instrumentation.as_dict()
+    assert stages["NetworkInfoExportToSBMLModel.add_species"]['entities'] == 2
+    assert stages["NetworkInfoExportToSBMLModel.add_species"]['calls'] == 1
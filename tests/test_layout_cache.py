@@ -0,0 +1,166 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import libsbml
+import os
+from networkinfotranslator.imports.import_sbml import NetworkInfoImportFromSBMLModel
+from networkinfotranslator.layouts.layout_cache import NetworkInfoLayoutCache
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+def create_sbml(species_ids):
+    # a model without layout, with a reaction between its first two species
+    document = libsbml.SBMLDocument(3, 1)
+    model = document.createModel()
+    compartment = model.createCompartment()
+    compartment.setId("c")
+    compartment.setConstant(True)
+    for species_id in species_ids:
+        species = model.createSpecies()
+        species.setId(species_id)
+        species.setCompartment("c")
+        species.setConstant(False)
+        species.setBoundaryCondition(False)
+        species.setHasOnlySubstanceUnits(False)
+    reaction = model.createReaction()
+    reaction.setId("r")
+    reaction.setReversible(False)
+    reaction.createReactant().setSpecies(species_ids[0])
+    reaction.createProduct().setSpecies(species_ids[1])
+
+    return libsbml.writeSBMLToString(document)
+
+
+def get_snapshot(x):
+    return {'compartments': [], 'species': [{'id': "s0_glyph", 'referenceId': "s0",
+                                             'features': {'boundingBox': {'x': x, 'y': 0.0,
+                                                                          'width': 60.0, 'height': 36.0}}}],
+            'reactions': [], 'colors': [], 'gradients': [], 'line_endings': [],
+            'extents': {'minX': 0.0, 'maxX': x + 60.0, 'minY': 0.0, 'maxY': 36.0}, 'background_color': "white"}
+
+
+def look_up(layout_cache, sbml):
+    importer = NetworkInfoImportFromSBMLModel()
+    importer.layout_cache = layout_cache
+    importer.sbml_graph = sbml
+    return importer.extract_cached_info(sbml), importer
+
+
+def test_put_and_get_an_entry(tmp_path):
+    layout_cache = NetworkInfoLayoutCache(str(tmp_path))
+    assert layout_cache.get("key") is None
+    layout_cache.put("key", get_snapshot(10.0))
+    assert layout_cache.get("key") == get_snapshot(10.0)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    layout_cache = NetworkInfoLayoutCache(str(tmp_path), max_entries=2)
+    layout_cache.put("first", get_snapshot(1.0))
+    layout_cache.put("second", get_snapshot(2.0))
+    os.utime(layout_cache.get_file_name("first"), (1.0, 1.0))
+    os.utime(layout_cache.get_file_name("second"), (2.0, 2.0))
+    layout_cache.put("third", get_snapshot(3.0))
+    assert layout_cache.get("first") is None
+    assert layout_cache.get("second") and layout_cache.get("third")
+
+    layout_cache.clear()
+    assert layout_cache.get("second") is None and layout_cache.get("third") is None
+
+
+def test_info_is_restored_for_the_same_topology(tmp_path):
+    layout_cache = NetworkInfoLayoutCache(str(tmp_path))
+    is_cached, importer = look_up(layout_cache, create_sbml(["s0", "s1"]))
+    assert not is_cached
+    layout_cache.put(importer.layout_cache_key, get_snapshot(10.0))
+
+    is_cached, importer = look_up(layout_cache, create_sbml(["s0", "s1"]))
+    assert is_cached
+    assert importer.species == get_snapshot(10.0)['species']
+    assert importer.extents == get_snapshot(10.0)['extents']
+    assert importer.is_restored_from_cache and not importer.is_frozen
+
+
+def test_topology_key_depends_on_the_species(tmp_path):
+    layout_cache = NetworkInfoLayoutCache(str(tmp_path))
+    importer = look_up(layout_cache, create_sbml(["s0", "s1"]))[1]
+    layout_cache.put(importer.layout_cache_key, get_snapshot(10.0))
+    assert not look_up(layout_cache, create_sbml(["s0", "s2"]))[0]
+
+
+def create_named_sbml(species_names, background_color=""):
+    # a model without layout, with a reaction between its species
+    document = libsbml.SBMLDocument(libsbml.SBMLNamespaces(3, 1, "layout", 1))
+    document.enablePackage(libsbml.RenderExtension.getXmlnsL3V1V1(), "render", True)
+    model = document.createModel()
+    compartment = model.createCompartment()
+    compartment.setId("c")
+    compartment.setConstant(True)
+    for s_index, species_name in enumerate(species_names):
+        species = model.createSpecies()
+        species.setId("s" + str(s_index))
+        species.setName(species_name)
+        species.setCompartment("c")
+        species.setConstant(False)
+        species.setBoundaryCondition(False)
+        species.setHasOnlySubstanceUnits(False)
+    reaction = model.createReaction()
+    reaction.setId("r")
+    reaction.setReversible(False)
+    reaction.createReactant().setSpecies("s0")
+    reaction.createProduct().setSpecies("s1")
+    sbml = libsbml.writeSBMLToString(document)
+    if background_color:
+        # libsbml leaves out an empty list of layouts, so its global render information is added by hand
+        sbml = sbml.replace("</model>", '<layout:listOfLayouts><render:listOfGlobalRenderInformation>'
+                                        '<render:renderInformation render:id="global_render" '
+                                        'render:backgroundColor="' + background_color + '"/>'
+                                        '</render:listOfGlobalRenderInformation></layout:listOfLayouts></model>')
+
+    return sbml
+
+
+def store(layout_cache, sbml):
+    is_cached, importer = look_up(layout_cache, sbml)
+    assert not is_cached
+    layout_cache.put(importer.layout_cache_key, importer.get_info_snapshot())
+
+
+def test_cache_hit_for_the_same_model(tmp_path):
+    layout_cache = NetworkInfoLayoutCache(str(tmp_path))
+    store(layout_cache, create_named_sbml(["glucose", "pyruvate"]))
+    is_cached, importer = look_up(layout_cache, create_named_sbml(["glucose", "pyruvate"]))
+    assert is_cached and importer.is_restored_from_cache
+
+
+def test_cache_miss_for_changed_labels(tmp_path):
+    layout_cache = NetworkInfoLayoutCache(str(tmp_path))
+    store(layout_cache, create_named_sbml(["glucose", "pyruvate"]))
+    assert not look_up(layout_cache, create_named_sbml(["glucose", "lactate"]))[0]
+
+
+def test_cache_miss_for_changed_global_render(tmp_path):
+    layout_cache = NetworkInfoLayoutCache(str(tmp_path))
+    store(layout_cache, create_named_sbml(["glucose", "pyruvate"], "#ffffff"))
+    assert not look_up(layout_cache, create_named_sbml(["glucose", "pyruvate"], "#000000"))[0]
+
+
+class NetworkInfoCountingLayoutCache(NetworkInfoLayoutCache):
+    def __init__(self, cache_directory):
+        super().__init__(cache_directory)
+        self.number_of_puts = 0
+
+    def put(self, key, snapshot):
+        self.number_of_puts += 1
+        super().put(key, snapshot)
+
+
+def test_generated_layout_is_stored_once(tmp_path):
+    model = NetworkInfoSyntheticModel(3)
+    model.extract_info()
+    model.layout_cache = NetworkInfoCountingLayoutCache(str(tmp_path))
+    model.layout_cache_key = "synthetic"
+    model.extract_entity_features()
+    model.extract_entity_features()
+    assert model.layout_cache.number_of_puts == 1
+    assert model.layout_cache.get("synthetic")
@@ -0,0 +1,124 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+from networkinfotranslator.imports.import_base import NetworkInfoImportBase
+from networkinfotranslator.layouts.layout_force_directed import NetworkInfoForceDirectedLayout
+
+
+class NetworkInfoImportUnlaid(NetworkInfoImportBase):
+    def extract_compartment_features(self, compartment):
+        pass
+
+    def extract_species_features(self, species):
+        pass
+
+    def extract_reaction_features(self, reaction):
+        pass
+
+    def extract_species_reference_features(self, species_reference):
+        pass
+
+
+def get_go(glyph_id, reference_id, x):
+    return {'id': glyph_id, 'referenceId': reference_id,
+            'features': {'boundingBox': {'x': x, 'y': 0.0, 'width': 40.0, 'height': 20.0}}}
+
+
+def get_unlaid_graph_info():
+    graph_info = NetworkInfoImportUnlaid()
+    graph_info.reset_info()
+    compartment = get_go("C_glyph", "C", 0.0)
+    graph_info.compartments = [compartment]
+    for s_index in range(4):
+        species = get_go("S{}_glyph".format(s_index), "S{}".format(s_index), 0.0)
+        species['compartment'] = "C"
+        graph_info.species.append(species)
+    for r_index in range(2):
+        reaction = get_go("R{}_glyph".format(r_index), "R{}".format(r_index), 0.0)
+        reaction['compartment'] = "C"
+        reaction['speciesReferences'] = \
+            [{'id': "SR{}_{}".format(r_index, 0), 'species': "S{}".format(2 * r_index), 'features': {}},
+             {'id': "SR{}_{}".format(r_index, 1), 'species': "S{}".format(2 * r_index + 1), 'features': {}}]
+        graph_info.reactions.append(reaction)
+    return graph_info
+
+
+def get_centers(graph_info):
+    return [(go['features']['boundingBox']['x'] + 20.0, go['features']['boundingBox']['y'] + 10.0)
+            for go in graph_info.species + graph_info.reactions]
+
+
+def test_apply_spreads_the_nodes_and_connects_them():
+    graph_info = get_unlaid_graph_info()
+    NetworkInfoForceDirectedLayout().apply(graph_info)
+    centers = get_centers(graph_info)
+    assert len(set(centers)) == len(centers)
+    for reaction in graph_info.reactions:
+        center_x = reaction['features']['boundingBox']['x'] + 20.0
+        center_y = reaction['features']['boundingBox']['y'] + 10.0
+        for species_reference in reaction['speciesReferences']:
+            curve = species_reference['features']['curve']
+            assert len(curve) == 1
+            assert curve[0]['startX'] == pytest.approx(center_x)
+            assert curve[0]['startY'] == pytest.approx(center_y)
+
+
+def test_apply_fits_the_compartments_and_the_extents_around_the_nodes():
+    graph_info = get_unlaid_graph_info()
+    NetworkInfoForceDirectedLayout().apply(graph_info)
+    compartment_box = graph_info.compartments[0]['features']['boundingBox']
+    for go in graph_info.species + graph_info.reactions:
+        bounding_box = go['features']['boundingBox']
+        assert compartment_box['x'] <= bounding_box['x']
+        assert compartment_box['y'] <= bounding_box['y']
+        assert bounding_box['x'] + bounding_box['width'] <= compartment_box['x'] + compartment_box['width']
+        assert bounding_box['y'] + bounding_box['height'] <= compartment_box['y'] + compartment_box['height']
+        assert graph_info.extents['minX'] <= bounding_box['x']
+        assert bounding_box['x'] + bounding_box['width'] <= graph_info.extents['maxX']
+
+
+def test_apply_is_deterministic_for_a_fixed_seed():
+    first_graph_info = get_unlaid_graph_info()
+    second_graph_info = get_unlaid_graph_info()
+    NetworkInfoForceDirectedLayout().apply(first_graph_info)
+    NetworkInfoForceDirectedLayout().apply(second_graph_info)
+    assert get_centers(first_graph_info) == get_centers(second_graph_info)
+
+
+def test_auto_layout_runs_only_when_the_layout_is_modified():
+    graph_info = get_unlaid_graph_info()
+    graph_info.auto_layout = NetworkInfoForceDirectedLayout()
+    graph_info.extract_entity_features()
+    assert len(set(get_centers(graph_info))) == 1
+
+    graph_info.is_layout_modified = True
+    graph_info.extract_entity_features()
+    assert len(set(get_centers(graph_info))) == len(get_centers(graph_info))
+
+
+def get_graph_info(species_references):
+    graph_info = NetworkInfoImportBase()
+    graph_info.reset_info()
+    # the glyph id of the second species is the model id of the first one
+    graph_info.species = [get_go("S1_glyph", "S1", 0.0), get_go("S1", "S2", 100.0)]
+    reaction = get_go("R1_glyph", "R1", 50.0)
+    reaction['speciesReferences'] = species_references
+    graph_info.reactions = [reaction]
+    return graph_info
+
+
+def get_edges(graph_info):
+    nodes = NetworkInfoForceDirectedLayout.get_nodes(graph_info)
+    return NetworkInfoForceDirectedLayout.get_edges(graph_info, nodes).tolist()
+
+
+def test_species_references_are_matched_by_the_glyph_id_before_the_species_id():
+    graph_info = get_graph_info([{'id': "SR1", 'species': "S2", 'speciesGlyph': "S1"},
+                                 {'id': "SR2", 'species': "S1", 'species_glyph_id': "S1_glyph"}])
+    assert get_edges(graph_info) == [[2, 2], [1, 0]]
+
+
+def test_species_references_without_a_glyph_id_are_matched_by_the_species_id():
+    graph_info = get_graph_info([{'id': "SR1", 'species': "S1"}, {'id': "SR2", 'species': "S2"}])
+    assert get_edges(graph_info) == [[2, 2], [0, 1]]
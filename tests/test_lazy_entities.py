@@ -0,0 +1,122 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import copy
+import json
+import pickle
+import threading
+from networkinfotranslator import network_info_translator
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+class NetworkInfoLazySyntheticModel(NetworkInfoSyntheticModel):
+    # a synthetic model whose species are extracted lazily, counting the extracted ones
+    def __init__(self, number_of_reactions=5):
+        super().__init__(number_of_reactions)
+        self.lazy_features = True
+        self.number_of_extracted_species = 0
+
+    def supports_lazy_features(self):
+        return True
+
+    def extract_species_features(self, species):
+        self.number_of_extracted_species += 1
+        super().extract_species_features(species)
+
+
+def test_entities_are_extracted_on_first_access():
+    model = NetworkInfoLazySyntheticModel()
+    model.extract_info()
+    model.freeze()
+    assert model.number_of_extracted_species == 0
+    assert model.species[0]['features']['boundingBox']
+    assert model.species[0]['texts']
+    assert model.number_of_extracted_species == 1
+
+
+def test_lazy_entities_copy_and_pickle_as_plain_dicts():
+    model = NetworkInfoLazySyntheticModel()
+    model.extract_info()
+    model.freeze()
+    species = pickle.loads(pickle.dumps(model.species[1]))
+    assert type(species) is dict and species['features']
+    assert type(copy.deepcopy(model.species[2])) is dict
+    assert model.number_of_extracted_species == 2
+
+
+def test_lazy_extraction_exports_the_same_as_the_eager_one():
+    model = NetworkInfoLazySyntheticModel()
+    model.extract_info()
+    eager_model = NetworkInfoSyntheticModel(5)
+    eager_model.extract_info()
+    assert network_info_translator.export_info(model, "network_editor") == \
+        network_info_translator.export_info(eager_model, "network_editor")
+
+
+def test_close_does_not_extract_the_lazy_entities():
+    model = NetworkInfoLazySyntheticModel()
+    model.extract_info()
+    with model:
+        model.freeze()
+        assert model.species[0]['features']
+    assert model.number_of_extracted_species == 1
+    assert model.is_closed
+
+
+def test_lazy_entities_cannot_be_extracted_once_closed():
+    model = NetworkInfoLazySyntheticModel()
+    model.extract_info()
+    model.freeze()
+    model.close()
+    with pytest.raises(ValueError, match="closed"):
+        model.species[1]['features']
+
+
+def test_detach_extracts_the_lazy_entities():
+    model = NetworkInfoLazySyntheticModel()
+    model.extract_info()
+    model.detach()
+    assert model.number_of_extracted_species == len(model.species)
+    assert all(species['features'] for species in model.species)
+
+
+@pytest.mark.parametrize("target_format", ["network_editor", "cytoscapejs", "sbml", "png"])
+def test_a_viewport_extracts_only_the_entities_in_its_region(target_format):
+    model = NetworkInfoLazySyntheticModel(100)
+    model.extract_info()
+    viewport = model.get_viewport(-50.0, -50.0, 300.0, 150.0)
+    assert network_info_translator.export_info(viewport, target_format)
+    assert 0 < len(viewport.species) == model.number_of_extracted_species < len(model.species)
+    species_ids = set(species['id'] for species in viewport.species)
+    for reaction in viewport.reactions:
+        for species_reference in reaction['speciesReferences']:
+            assert species_reference['speciesGlyph'] in species_ids
+
+
+def test_a_viewport_exports_the_entities_in_its_region():
+    model = NetworkInfoLazySyntheticModel(100)
+    model.extract_info()
+    graph = json.loads(network_info_translator.export_info(model.get_viewport(-50.0, -50.0, 300.0, 150.0),
+                                                           "network_editor"))
+    node_ids = set(node['id'] for node in graph['nodes'])
+    assert "species_0_glyph" in node_ids and "reaction_0_glyph" in node_ids
+    assert "species_50_glyph" not in node_ids and "reaction_50_glyph" not in node_ids
+    assert all(edge['source']['node'] in node_ids and edge['target']['node'] in node_ids for edge in graph['edges'])
+
+
+def test_importers_do_not_hold_each_other_up():
+    model = NetworkInfoLazySyntheticModel()
+    model.extract_info()
+    other_model = NetworkInfoLazySyntheticModel()
+    other_model.extract_info()
+    assert model.lock is not other_model.lock
+    model.freeze()
+    assert model.species[0].lock is model.lock
+
+    # the entities of one importer are extracted while another importer is held by a different thread
+    holding_thread = threading.Thread(target=other_model.lock.acquire)
+    holding_thread.start()
+    holding_thread.join()
+    assert model.species[0]['features']['boundingBox']
+    assert not other_model.lock.acquire(blocking=False)
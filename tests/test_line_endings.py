@@ -0,0 +1,66 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import skia
+from networkinfotranslator.imports.import_base import NetworkInfoImportBase
+from networkinfotranslator.exports.export_figure_base import NetworkInfoExportToFigureBase
+from networkinfotranslator.exports.export_figure_skia import NetworkInfoExportToSkia
+
+
+def get_line_ending(line_ending_id, enable_rotation=True):
+    return {'id': line_ending_id,
+            'features': {'boundingBox': {'x': -10.0, 'y': -5.0, 'width': 10.0, 'height': 10.0},
+                         'enableRotation': enable_rotation,
+                         'graphicalShape': {'geometricShapes': [{'shape': 'rectangle'}]}}}
+
+
+def get_graph_info():
+    graph_info = NetworkInfoImportBase()
+    graph_info.reset_info()
+    graph_info.extents = {'minX': 0.0, 'maxX': 200.0, 'minY': 0.0, 'maxY': 100.0}
+    return graph_info
+
+
+class NetworkInfoExportCountingLineEndings(NetworkInfoExportToFigureBase):
+    def reset(self):
+        super().reset()
+        self.compiled_ids = []
+        self.drawn_line_endings = []
+
+    def compile_line_ending(self, line_ending):
+        self.compiled_ids.append(line_ending['id'])
+        return line_ending['id']
+
+    def draw_line_ending(self, compiled_line_ending, position_x, position_y, slope, z_order):
+        self.drawn_line_endings.append((compiled_line_ending, position_x, position_y, slope))
+
+
+def test_each_line_ending_is_compiled_once():
+    exporter = NetworkInfoExportCountingLineEndings()
+    exporter.graph_info = get_graph_info()
+    arrow = get_line_ending("arrow")
+    bar = get_line_ending("bar", enable_rotation=False)
+    exporter.add_line_ending_to_scene(arrow, 10.0, 20.0, 0.5)
+    exporter.add_line_ending_to_scene(arrow, 30.0, 40.0, 1.0)
+    exporter.add_line_ending_to_scene(bar, 50.0, 60.0, 1.5)
+    assert exporter.compiled_ids == ["arrow", "bar"]
+    # the rotation of the line endings which do not allow it is dropped
+    assert exporter.drawn_line_endings == [("arrow", 10.0, 20.0, 0.5), ("arrow", 30.0, 40.0, 1.0),
+                                           ("bar", 50.0, 60.0, 0.0)]
+
+
+def test_skia_line_endings_are_recorded_once_and_stamped_per_instance():
+    exporter = NetworkInfoExportToSkia()
+    exporter.graph_info = get_graph_info()
+    arrow = get_line_ending("arrow")
+    exporter.add_line_ending_to_scene(arrow, 10.0, 20.0, 0.0)
+    exporter.add_line_ending_to_scene(arrow, 30.0, 40.0, 0.0)
+    assert isinstance(exporter.compiled_line_endings["arrow"], skia.Picture)
+    line_endings = exporter._get_layer(3).line_endings
+    assert len(line_endings) == 2
+    assert line_endings[0]['picture'] is line_endings[1]['picture']
+    assert line_endings[0]['translate'] == {'x': exporter.padding + 10.0, 'y': exporter.padding + 20.0}
+    assert line_endings[1]['translate'] == {'x': exporter.padding + 30.0, 'y': exporter.padding + 40.0}
+    # the shapes of the compiled line ending are not drawn into the scene itself
+    assert not exporter._get_layer(0).rounded_rectangles
@@ -0,0 +1,81 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+from matplotlib.collections import PathCollection, LineCollection
+from networkinfotranslator.imports.import_base import NetworkInfoImportBase
+from networkinfotranslator.exports.export_figure_matplotlib import NetworkInfoExportToMatPlotLib
+
+
+def get_exporter():
+    graph_info = NetworkInfoImportBase()
+    graph_info.reset_info()
+    graph_info.extents = {'minX': 0.0, 'maxX': 200.0, 'minY': 0.0, 'maxY': 100.0}
+    exporter = NetworkInfoExportToMatPlotLib()
+    exporter.graph_info = graph_info
+    return exporter
+
+
+def draw_rectangle(exporter, x, fill_color, z_order=5):
+    exporter.draw_simple_rectangle(x, 10.0, 20.0, 10.0, "#000000", 1.0, tuple(), fill_color, 0.0, 0.0, 0.0, z_order)
+
+
+def test_shapes_with_the_same_style_share_a_batch():
+    exporter = get_exporter()
+    draw_rectangle(exporter, 10.0, "#ffffff")
+    draw_rectangle(exporter, 40.0, "#ffffff")
+    draw_rectangle(exporter, 70.0, "#ff0000")
+    draw_rectangle(exporter, 100.0, "#ffffff", z_order=0)
+    assert sorted(len(items) for items in exporter.batches.values()) == [1, 1, 2]
+
+
+def test_straight_and_curved_segments_go_to_separate_collections(tmp_path):
+    exporter = get_exporter()
+    exporter.draw_curve([{'startX': 0.0, 'startY': 0.0, 'endX': 50.0, 'endY': 50.0},
+                         {'startX': 50.0, 'startY': 50.0, 'endX': 100.0, 'endY': 0.0}], "#000000", 1.0, tuple(), 2)
+    exporter.draw_curve([{'startX': 0.0, 'startY': 0.0, 'endX': 100.0, 'endY': 0.0,
+                          'basePoint1X': 30.0, 'basePoint1Y': 50.0, 'basePoint2X': 70.0, 'basePoint2Y': 50.0}],
+                        "#000000", 1.0, tuple(), 2)
+    draw_rectangle(exporter, 10.0, "#ffffff")
+    exporter.recycle_figure = True
+    exporter.export(str(tmp_path / "network.png"))
+    sbml_axes = exporter.sbml_axes
+    assert (tmp_path / "network.png").stat().st_size
+    assert not sbml_axes.patches
+    assert sorted([type(collection).__name__, len(collection.get_paths())]
+                  for collection in sbml_axes.collections) == [["LineCollection", 2], ["PathCollection", 1],
+                                                               ["PathCollection", 1]]
+    assert all(isinstance(collection, (PathCollection, LineCollection)) for collection in sbml_axes.collections)
+
+
+def test_dashed_shapes_are_drawn_with_their_dashes(tmp_path):
+    exporter = get_exporter()
+    draw_rectangle(exporter, 10.0, "#ffffff")
+    exporter.draw_simple_rectangle(40.0, 10.0, 20.0, 10.0, "#000000", 1.0, [4.0, 2.0], "#ffffff",
+                                   0.0, 0.0, 0.0, 5)
+    exporter.draw_curve([{'startX': 0.0, 'startY': 0.0, 'endX': 50.0, 'endY': 50.0}], "#000000", 1.0,
+                        [4.0, 2.0], 2)
+    assert sorted(len(items) for items in exporter.batches.values()) == [1, 1, 1]
+    exporter.recycle_figure = True
+    exporter.export(str(tmp_path / "network.png"))
+    dashes = sorted((type(collection).__name__, collection.get_linestyle()[0][1] is not None)
+                    for collection in exporter.sbml_axes.collections)
+    assert dashes == [("LineCollection", True), ("PathCollection", False), ("PathCollection", True)]
+
+
+class NetworkInfoExportRecordingImages(NetworkInfoExportToMatPlotLib):
+    def __init__(self):
+        super().__init__()
+        self.images = []
+
+    def draw_image(self, href, x, y, width, height, offset_x, offset_y, slope, z_order):
+        self.images.append((href, x, y, width, height))
+
+
+def test_images_are_drawn_from_their_href():
+    exporter = NetworkInfoExportRecordingImages()
+    exporter.graph_info = get_exporter().graph_info
+    exporter.add_graphical_shape_to_scene({'boundingBox': {'x': 10.0, 'y': 20.0, 'width': 30.0, 'height': 40.0},
+                                           'graphicalShape': {'geometricShapes': [{'shape': 'image',
+                                                                                   'href': "logo.png"}]}})
+    assert exporter.images == [("logo.png", 10.0, 20.0, 30.0, 40.0)]
@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+import matplotlib.pyplot as plt
+from networkinfotranslator.imports.import_base import NetworkInfoImportBase
+from networkinfotranslator.exports.export_figure_matplotlib import NetworkInfoExportToMatPlotLib
+
+
+def draw_and_export(exporter, file_name):
+    graph_info = NetworkInfoImportBase()
+    graph_info.reset_info()
+    graph_info.extents = {'minX': 0.0, 'maxX': 200.0, 'minY': 0.0, 'maxY': 100.0}
+    exporter.reset()
+    exporter.graph_info = graph_info
+    exporter.draw_simple_rectangle(10.0, 10.0, 20.0, 10.0, "#000000", 1.0, tuple(), "#ffffff",
+                                   0.0, 0.0, 0.0, 5)
+    exporter.export(file_name)
+
+
+def test_figure_is_created_lazily_and_not_registered_with_pyplot(tmp_path):
+    num_figures = len(plt.get_fignums())
+    exporter = NetworkInfoExportToMatPlotLib()
+    assert exporter.sbml_figure is None
+    draw_and_export(exporter, str(tmp_path / "network.png"))
+    assert (tmp_path / "network.png").stat().st_size
+    assert exporter.sbml_figure is None
+    assert len(plt.get_fignums()) == num_figures
+
+
+def test_recycled_figure_is_kept_across_models(tmp_path):
+    with NetworkInfoExportToMatPlotLib() as exporter:
+        exporter.recycle_figure = True
+        draw_and_export(exporter, str(tmp_path / "first.png"))
+        sbml_figure = exporter.sbml_figure
+        draw_and_export(exporter, str(tmp_path / "second.png"))
+        assert exporter.sbml_figure is sbml_figure
+        assert len(sbml_figure.axes) == 1
+    assert exporter.sbml_figure is None
@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+from networkinfotranslator.exports.export_figure_skia import NetworkInfoExportToSkia
+from networkinfotranslator.profiling.instrumentation import NetworkInfoInstrumentation
+from networkinfotranslator.profiling.memory_budget import NetworkInfoMemoryBudget, \
+    NetworkInfoMemoryBudgetExceeded
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+def get_skia_exporter(memory_budget):
+    model = NetworkInfoSyntheticModel(10)
+    model.extract_info()
+    exporter = NetworkInfoExportToSkia()
+    exporter.memory_budget = memory_budget
+    exporter.extract_graph_info(model)
+    return exporter
+
+
+def get_surface_size(exporter):
+    return (int(exporter.graph_info.extents['maxX'] - exporter.graph_info.extents['minX'] + 2 * exporter.padding),
+            int(exporter.graph_info.extents['maxY'] - exporter.graph_info.extents['minY'] + 2 * exporter.padding))
+
+
+def test_allocations_are_scaled_down_to_fit():
+    memory_budget = NetworkInfoMemoryBudget(1000)
+    assert memory_budget.get_scale(1000, "a surface") == 1.0
+    assert memory_budget.get_scale(4000, "a surface") == pytest.approx(0.5)
+    with pytest.raises(NetworkInfoMemoryBudgetExceeded):
+        memory_budget.get_scale(1000000, "a surface")
+    with pytest.raises(MemoryError):
+        NetworkInfoMemoryBudget(1000, degrade=False).get_scale(4000, "a surface")
+
+
+def test_skia_surface_is_scaled_down_to_the_budget():
+    exporter = get_skia_exporter(None)
+    width, height = get_surface_size(exporter)
+    exporter.memory_budget = NetworkInfoMemoryBudget(NetworkInfoMemoryBudget.get_surface_bytes(width, height) // 4)
+    image = exporter._get_image()
+    assert image.width() == pytest.approx(width / 2, abs=1)
+    assert image.height() == pytest.approx(height / 2, abs=1)
+
+
+def test_skia_surface_over_a_strict_budget_is_not_allocated():
+    exporter = get_skia_exporter(NetworkInfoMemoryBudget(1000, degrade=False))
+    with pytest.raises(NetworkInfoMemoryBudgetExceeded):
+        exporter._get_image()
+
+
+def test_peak_memory_of_nested_stages_is_kept_by_the_enclosing_stage():
+    instrumentation = NetworkInfoInstrumentation(track_memory=True)
+    with instrumentation.stage("outer"):
+        with instrumentation.stage("inner"):
+            buffer = bytearray(1 << 20)
+        del buffer
+    stages = instrumentation.as_dict()
+    assert stages["outer/inner"]['peakMemory'] >= 1 << 20
+    assert stages["outer"]['peakMemory'] >= stages["outer/inner"]['peakMemory']
+
+
+def test_stages_over_the_memory_budget_are_reported_once_they_end():
+    instrumentation = NetworkInfoInstrumentation(track_memory=True, memory_budget=NetworkInfoMemoryBudget(1 << 16))
+    with instrumentation.stage("small"):
+        buffer = bytearray(1 << 10)
+    with instrumentation.stage("large"):
+        buffer = bytearray(1 << 20)
+    del buffer
+    stages = instrumentation.as_dict()
+    assert not stages["small"]['overMemoryBudget']
+    assert stages["large"]['overMemoryBudget']
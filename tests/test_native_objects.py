@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+from networkinfotranslator.native_objects import get_native_object_key
+from networkinfotranslator.profiling.backend_profiler import NetworkInfoBackendProfiler
+
+
+class NativeObject:
+    def __init__(self, address):
+        self.this = address
+
+
+def test_native_objects_are_keyed_on_their_address():
+    assert get_native_object_key(NativeObject(7)) == get_native_object_key(NativeObject(7))
+    assert get_native_object_key(NativeObject(7)) != get_native_object_key(NativeObject(8))
+    assert get_native_object_key("style") == "style"
+    assert get_native_object_key(["style"]) == repr(["style"])
+    assert NetworkInfoBackendProfiler.get_argument_key(NativeObject(7)) == get_native_object_key(NativeObject(7))
@@ -0,0 +1,69 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+from networkinfotranslator import network_info_translator
+from networkinfotranslator.exports.export_cytoscapejs import NetworkInfoExportToCytoscapeJs
+from networkinfotranslator.exports.export_network_editor import NetworkInfoExportToNetworkEditor
+from networkinfotranslator.layouts.layout_cache import NetworkInfoLayoutCache
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+def get_model(required_features=None):
+    model = NetworkInfoSyntheticModel(5)
+    model.extract_info()
+    model.required_features = required_features
+    return model
+
+
+def test_required_features_are_widened():
+    model = get_model({"texts"})
+    model.require_features({"geometricShapes"})
+    assert model.required_features == {"texts", "geometricShapes"}
+    model.require_features(None)
+    assert model.required_features is None
+    model.require_features({"texts"})
+    assert model.required_features is None
+
+
+def test_unrequired_groups_are_not_extracted():
+    model = get_model({"texts"})
+    model.freeze()
+    assert model.extracted_features == {"texts"}
+    assert all(line_ending['features'] == {} for line_ending in model.line_endings)
+    assert all(gradient['features'] == {} for gradient in model.gradients)
+    assert model.has_features({"texts"})
+    assert not model.has_features({"texts", "gradients"})
+    assert not model.has_features(None)
+
+
+def test_exporters_widen_the_features_of_unfrozen_infos():
+    model = get_model(set())
+    NetworkInfoExportToCytoscapeJs().build(model)
+    assert model.extracted_features == {"texts", "geometricShapes"}
+
+
+def test_exporters_refuse_frozen_infos_without_their_features():
+    model = get_model(set())
+    NetworkInfoExportToCytoscapeJs().build(model)
+    with pytest.raises(ValueError):
+        NetworkInfoExportToNetworkEditor().build(model)
+
+
+def test_the_features_of_the_target_formats_are_joined():
+    assert network_info_translator.get_required_features(["cytoscapejs"]) == {"texts", "geometricShapes"}
+    assert network_info_translator.get_required_features(["cytoscapejs", "sbml"]) is None
+
+
+def test_projected_extractions_are_not_cached(tmp_path):
+    model = get_model({"texts"})
+    model.layout_cache = NetworkInfoLayoutCache(str(tmp_path))
+    model.layout_cache_key = "key"
+    model.freeze()
+    assert model.layout_cache.get("key") is None
+
+    model = get_model()
+    model.layout_cache = NetworkInfoLayoutCache(str(tmp_path))
+    model.layout_cache_key = "key"
+    model.freeze()
+    assert model.layout_cache.get("key") is not None
@@ -0,0 +1,85 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+from networkinfotranslator import network_info_translator
+from networkinfotranslator.imports.import_base import NetworkInfoImportBase
+from networkinfotranslator.imports.import_network_editor import NetworkInfoImportFromNetworkEditor
+from networkinfotranslator.exports.export_network_editor import NetworkInfoExportToNetworkEditor
+from synthetic_model import NetworkInfoSyntheticModel
+
+
+class NetworkInfoImportLabelled(NetworkInfoImportBase):
+    # species which look alike but for their labels
+    def __init__(self, labels):
+        super().__init__()
+        self.reset_info()
+        self.extents = {'minX': 0.0, 'maxX': 100.0 * len(labels), 'minY': 0.0, 'maxY': 100.0}
+        for s_index, label in enumerate(labels):
+            bounding_box = {'x': 100.0 * s_index, 'y': 0.0, 'width': 60.0, 'height': 36.0}
+            self.species.append({'id': "S{}_glyph".format(s_index), 'referenceId': "S{}".format(s_index),
+                                 'features': {'boundingBox': dict(bounding_box),
+                                              'graphicalShape': {'geometricShapes': [{'shape': 'ellipse'}]}},
+                                 'texts': [{'id': "S{}_text".format(s_index),
+                                            'features': {'plainText': label, 'boundingBox': dict(bounding_box),
+                                                         'graphicalText': {'fontSize': {'abs': 12.0, 'rel': 0.0}}}}]})
+
+    def extract_entity_features(self):
+        pass
+
+
+def export_graph(graph_info, use_style_catalog, tmp_path):
+    exporter = NetworkInfoExportToNetworkEditor()
+    exporter.use_style_catalog = use_style_catalog
+    exporter.extract_graph_info(graph_info)
+    return exporter.export(str(tmp_path / "network"))
+
+
+def get_species_labels(graph):
+    graph_info = NetworkInfoImportFromNetworkEditor()
+    graph_info.extract_info(graph)
+    graph_info.extract_entity_features()
+    return [[text['features']['plainText'] for text in species['texts']] for species in graph_info.species]
+
+
+def test_labelled_nodes_share_one_style(tmp_path):
+    graph = export_graph(NetworkInfoImportLabelled(["A", "B", "C"]), True, tmp_path)
+    assert len(graph['styles']) == 1
+    assert [node['style'] for node in graph['nodes']] == [next(iter(graph['styles']))] * 3
+    assert [node['texts'][0]['plain-text'] for node in graph['nodes']] == ["A", "B", "C"]
+
+
+def test_catalog_styles_are_resolved_on_import(tmp_path):
+    graph = export_graph(NetworkInfoImportLabelled(["A", "B", "C"]), True, tmp_path)
+    assert get_species_labels(graph) == [["A"], ["B"], ["C"]]
+    assert get_species_labels(graph) == \
+        get_species_labels(export_graph(NetworkInfoImportLabelled(["A", "B", "C"]), False, tmp_path))
+
+
+def get_graph(use_style_catalog):
+    model = NetworkInfoSyntheticModel(10)
+    model.extract_info()
+    exporter = NetworkInfoExportToNetworkEditor()
+    exporter.use_style_catalog = use_style_catalog
+    exporter.extract_graph_info(model)
+    return exporter.get_graph("network_graph")
+
+
+def get_style_names(graph):
+    graph_info = network_info_translator.import_info(graph)
+    graph_info.extract_entity_features()
+    style_names = {}
+    for go in graph_info.species + graph_info.reactions:
+        style_names[go['id']] = go['features'].get('styleName')
+        for species_reference in go.get('speciesReferences', []):
+            style_names[species_reference['id']] = species_reference['features'].get('styleName')
+
+    return style_names
+
+
+def test_style_names_survive_a_catalog_round_trip():
+    graph = get_graph(True)
+    assert len(graph['styles']) < len(graph['nodes']) + len(graph['edges'])
+    style_names = get_style_names(graph)
+    assert style_names == get_style_names(get_graph(False))
+    assert all(style_name and not style_name.startswith("style_") for style_name in style_names.values())
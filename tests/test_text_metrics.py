@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("libsbmlnetworkeditor")
+
+from networkinfotranslator.text_metrics import NetworkInfoTextMetrics, NetworkInfoTextBlobCache, default_text_metrics
+
+
+def test_widths_scale_with_the_font_size():
+    text_metrics = NetworkInfoTextMetrics()
+    width = text_metrics.measure_text("glucose", "Arial", 10.0)
+    assert width > 0
+    assert text_metrics.measure_text("glucose", "Arial", 20.0) == pytest.approx(2 * width)
+    assert text_metrics.measure_text("glucose glucose", "Arial", 10.0) > 2 * width
+
+
+def test_each_character_is_measured_once():
+    text_metrics = NetworkInfoTextMetrics()
+    text_metrics.measure_text("glucose", "Arial", 10.0)
+    advance_widths = text_metrics.advance_widths[text_metrics.get_font_key("Arial")]
+    assert sorted(advance_widths.keys()) == sorted(set("glucose"))
+    text_metrics.measure_text("close", "Arial", 12.0)
+    assert len(advance_widths) == len(set("glucose"))
+    text_metrics.measure_text("glucose", "Arial", 10.0, "bold")
+    assert len(text_metrics.advance_widths) == 2
+
+
+def test_texts_are_truncated_to_fit():
+    text_metrics = NetworkInfoTextMetrics()
+    assert text_metrics.truncate_text("ATP", 100.0, "Arial", 10.0) == "ATP"
+    max_width = text_metrics.measure_text("glucose", "Arial", 10.0)
+    truncated_text = text_metrics.truncate_text("glucose-6-phosphate", max_width, "Arial", 10.0)
+    assert truncated_text.endswith(".") and "glucose-6-phosphate".startswith(truncated_text[:-1])
+    assert text_metrics.measure_text(truncated_text, "Arial", 10.0) <= max_width
+    assert text_metrics.measure_text("glucose-6-phosphate"[:len(truncated_text)] + ".", "Arial", 10.0) > max_width
+
+
+def test_blobs_are_cached():
+    text_blob_cache = NetworkInfoTextBlobCache()
+    entry, is_cached = text_blob_cache.get("glucose", "Arial", 10.0)
+    assert not is_cached and entry['width'] > 0
+    assert text_blob_cache.get("glucose", "Arial", 10.0) == (entry, True)
+    assert not text_blob_cache.get("glucose", "Arial", 12.0)[1]
+    assert not text_blob_cache.get("glucose", "Arial", 10.0, "bold")[1]
+    assert text_blob_cache.get_statistics() == {'size': 3, 'maxSize': 4096, 'hits': 1, 'misses': 3, 'evictions': 0}
+
+
+def test_the_least_recently_used_blobs_are_evicted():
+    text_blob_cache = NetworkInfoTextBlobCache(max_size=2)
+    text_blob_cache.get("S1", "Arial", 10.0)
+    text_blob_cache.get("S2", "Arial", 10.0)
+    text_blob_cache.get("S1", "Arial", 10.0)
+    text_blob_cache.get("S3", "Arial", 10.0)
+    assert text_blob_cache.get_statistics()['evictions'] == 1
+    assert text_blob_cache.get("S1", "Arial", 10.0)[1]
+    assert not text_blob_cache.get("S2", "Arial", 10.0)[1]
+
+
+@pytest.mark.parametrize("font_size", [7, 11, 12.5, 24])
+def test_blobs_are_as_wide_as_measured(font_size):
+    text_blob_cache = NetworkInfoTextBlobCache()
+    for plain_text in ["S1", "glucose 6-phosphate", "ATP + H2O"]:
+        entry, is_cached = text_blob_cache.get(plain_text, "sans-serif", font_size)
+        assert not is_cached
+        assert entry['width'] == pytest.approx(
+            default_text_metrics.measure_text(plain_text, "sans-serif", font_size), rel=1e-4)